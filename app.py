@@ -1,7 +1,8 @@
 from server import create_app
 from config import FLASK_HOST, FLASK_PORT, DEBUG
 
-app = create_app()
+# 일괄 탐색 프로세스 풀(spawn)의 자식 프로세스가 이 파일을 __mp_main__으로 다시 실행할 때는 앱을 만들지 않음
+app = create_app() if __name__ != '__mp_main__' else None
 
 if __name__ == '__main__':
     app.run(host=FLASK_HOST, port=FLASK_PORT, debug=DEBUG)
\ No newline at end of file
@@ -0,0 +1,204 @@
+# benchmarks/known_differences.py
+# 배열 엔진과 기존 pandas 구현(benchmarks/baseline_router.py)의 의도적인 동작 차이 목록과 분류
+#
+# 정확성 검사는 원본 구현의 결과를 기준으로 하고, 기준과 다른 질의는 아래 변경을 원본 로직에 하나씩 적용하는
+# AdjustedRaptor로 설명함:
+# - 변경을 모두 적용한 결과가 배열 엔진과 같으면 "설명된 차이"이고, 각 변경을 하나씩 뺀 결과가 달라지는 변경을
+#   그 질의의 원인으로 보고
+# - 변경을 모두 적용해도 배열 엔진과 다르면 설명되지 않은 불일치 (벤치마크 실패)
+import math
+from collections import defaultdict
+import numpy as np
+
+# 변경 이름 -> 설명
+KNOWN_DIFFERENCES = {
+    'walk_rounding': "도보 소요시간을 초 단위로 올림 (원본은 거리/보행속도 실수). 도보를 거친 도착 시각이 1초 미만 늦을 수 있음",
+    'ordered_single_walks': "라운드 시작 시점의 라벨에서 도보를 한 번만 확장하고 정류장 인덱스 순으로 처리 "
+                            "(원본은 집합 순서로 순회하며 같은 라운드에 앞당겨진 정류장에서 도보를 다시 이어가, "
+                            "PYTHONHASHSEED에 따라 도보가 여러 번 연결되기도 함)",
+    'boarding_stop_arrival': "trip의 탑승 정류장 자체는 도착으로 기록하지 않음 (원본은 탑승 정류장의 trip 도착 시각을 기록해 "
+                             "승객이 정류장에 닿기 전 시각이 라벨이 되기도 함)",
+    'transfer_rule': "환승 시간: 도보로 닿은 정류장은 도보 출발 시각 + max(보행시간, 환승 대기), trip으로 닿은 정류장은 "
+                     "환승 대기만 (원본은 trip으로 닿아도 탑승 정류장과의 거리를 보행시간으로 보고, 도보로 닿으면 "
+                     "보행시간을 한 번 더 더함)",
+}
+# AdjustedRaptor로 켜고 끌 수 있는 변경 (walk_rounding은 비교 시 허용 오차로 처리)
+ADJUSTMENTS = ('ordered_single_walks', 'boarding_stop_arrival', 'transfer_rule')
+
+
+class AdjustedRaptor:
+    """
+    원본 pandas RAPTOR 탐색 로직에 ADJUSTMENTS 중 지정한 변경만 적용 (아무것도 지정하지 않으면 원본과 같은 결과)
+    baseline: benchmarks.baseline_router.CachedBaselineRaptor (stop_times 그룹/도보 그래프 공유)
+    """
+
+    def __init__(self, baseline, adjustments=ADJUSTMENTS):
+        unknown = set(adjustments) - set(ADJUSTMENTS)
+        if unknown:
+            raise ValueError(f"알 수 없는 변경: {sorted(unknown)}")
+        self.baseline = baseline
+        self.adjustments = frozenset(adjustments)
+
+    def arrivals(self, from_stop_id, departure_secs, max_transfers):
+        """
+        Returns: 라운드별 {정류장: 도착 시각} 딕셔너리 리스트 (원본처럼 라운드 사이에 라벨을 이어받지 않음)
+        """
+        base = self.baseline
+        ordered = 'ordered_single_walks' in self.adjustments
+        stop_groups, trip_groups = base._build_stop_groups(), base._build_trip_groups()
+        radius = 320.0
+        foot_paths = base._build_foot_paths(radius=radius)
+        all_stops = base.feed_data.stops['stop_id'].unique()
+        trip_cache = {}
+        arrivals = [dict.fromkeys(all_stops, base.INF) for _ in range(max_transfers + 1)]
+        parents = [dict.fromkeys(all_stops, None) for _ in range(max_transfers + 1)]
+        updated_stops = [set() for _ in range(max_transfers + 1)]
+        arrivals[0][from_stop_id] = departure_secs
+        updated_stops[0].add(from_stop_id)
+
+        for round_idx in range(max_transfers + 1):
+            newly_updated = set()
+            if ordered:
+                base_times = {stop_id: arrivals[round_idx][stop_id] for stop_id in updated_stops[round_idx]}
+                walk_sources = [(stop_id, base_times[stop_id]) for stop_id in sorted(base_times)]
+            else:
+                walk_sources = ((stop_id, None) for stop_id in updated_stops[round_idx])
+            for stop_id, base_time in walk_sources:
+                if base_time is None:
+                    base_time = arrivals[round_idx][stop_id]
+                for nbr_id, foot_time in foot_paths.get(stop_id, []):
+                    new_arrival = base_time + foot_time
+                    if new_arrival < arrivals[round_idx][nbr_id]:
+                        arrivals[round_idx][nbr_id] = new_arrival
+                        parents[round_idx][nbr_id] = (stop_id, round_idx, 'foot', base_time, new_arrival, foot_time)
+                        newly_updated.add(nbr_id)
+            updated_stops[round_idx].update(newly_updated)
+
+            if round_idx < max_transfers:
+                newly_updated_next = set()
+                stations = sorted(updated_stops[round_idx]) if ordered else updated_stops[round_idx]
+                for station_id in stations:
+                    t_base = arrivals[round_idx][station_id]
+                    if t_base == base.INF or station_id not in stop_groups:
+                        continue
+                    effective_time = self._effective_time(station_id, t_base, parents[round_idx].get(station_id),
+                                                          round_idx, radius)
+                    candidates = stop_groups[station_id]
+                    filtered = candidates[
+                        (candidates['departure_time'] >= effective_time) &
+                        (candidates['departure_time'] <= effective_time + base.time_limit)
+                    ]
+                    if filtered.empty:
+                        continue
+                    sorted_candidates = filtered.sort_values('departure_time').reset_index(drop=True)
+                    departure_times = sorted_candidates['departure_time'].values
+                    start_index = np.searchsorted(departure_times, effective_time)
+                    best_rows = sorted_candidates.iloc[start_index:].groupby('trip_id', as_index=False).first()
+
+                    for _, best_row in best_rows.iterrows():
+                        trip_id = best_row['trip_id']
+                        origin_dep = best_row['departure_time']
+                        origin_seq = best_row['stop_sequence']
+                        wait_time = origin_dep - t_base
+                        if wait_time < 0:
+                            continue
+                        if trip_id not in trip_cache:
+                            trip_df = trip_groups[trip_id]
+                            trip_cache[trip_id] = (trip_df['stop_sequence'].to_numpy(),
+                                                   trip_df['arrival_time'].to_numpy(), trip_df['stop_id'].to_numpy())
+                        seq_arr, arr_arr, stopid_arr = trip_cache[trip_id]
+                        side = 'right' if 'boarding_stop_arrival' in self.adjustments else 'left'
+                        for i in range(np.searchsorted(seq_arr, origin_seq, side=side), len(seq_arr)):
+                            dest_id = stopid_arr[i]
+                            if arr_arr[i] < arrivals[round_idx + 1][dest_id]:
+                                arrivals[round_idx + 1][dest_id] = arr_arr[i]
+                                parents[round_idx + 1][dest_id] = (
+                                    station_id, round_idx, f"trip:{trip_id}", origin_dep, arr_arr[i], wait_time)
+                                newly_updated_next.add(dest_id)
+                updated_stops[round_idx + 1] = newly_updated_next
+
+            if round_idx < max_transfers and len(updated_stops[round_idx + 1]) == 0:
+                break
+        return arrivals
+
+    def _effective_time(self, station_id, t_base, parent, round_idx, radius):
+        # 정류장에서 열차에 탈 수 있는 가장 이른 시각
+        base = self.baseline
+        if round_idx == 0 or parent is None:
+            return t_base + base.transfer_wait
+        if 'transfer_rule' in self.adjustments:
+            if parent[2] == 'foot':
+                return parent[3] + max(parent[5], base.transfer_wait)
+            return t_base + base.transfer_wait
+        # 원본: 부모 정류장(trip이면 탑승 정류장)과의 거리가 반경 미만이면 max(보행시간, 환승 대기)
+        try:
+            dist = base.geo_data.loc[station_id].geometry.distance(base.geo_data.loc[parent[0]].geometry)
+        except Exception:
+            dist = None
+        if dist is not None and dist < radius:
+            return t_base + max(dist / base.walking_speed, base.transfer_wait)
+        return t_base + base.transfer_wait
+
+
+def cumulative_target_arrivals(rounds, destination):
+    # 라운드별 라벨을 라운드 k까지의 최솟값(trip k개 이하 최단 도착)으로 변환 (도달 불가는 None)
+    best, target = math.inf, []
+    for labels in rounds:
+        best = min(best, float(labels[destination]))
+        target.append(round(best, 6) if best < math.inf else None)
+    return target
+
+
+def matches(expected, actual, walk_rounding=False):
+    # 라운드별 도착 시각 비교 (walk_rounding이면 기준 시각의 올림과 같아도 일치)
+    def same(e, a):
+        if e is None or a is None:
+            return e is None and a is None
+        return a == e or walk_rounding and a == math.ceil(e - 1e-6)
+    return len(expected) == len(actual) and all(same(e, a) for e, a in zip(expected, actual))
+
+
+def classify(baseline, query, expected, actual, max_transfers):
+    """
+    기준(원본 결과)과 다른 질의의 차이를 KNOWN_DIFFERENCES로 분류
+    baseline: CachedBaselineRaptor
+    query: (출발역, 도착역, 출발 시각), expected: 기준 파일의 라운드별 도착 시각, actual: 배열 엔진 결과
+    Returns: 원인 변경 이름 리스트 (설명되지 않으면 None)
+    """
+    origin, destination, departure = query
+    if matches(expected, actual, walk_rounding=True):
+        return ['walk_rounding']
+
+    def adjusted(adjustments):
+        rounds = AdjustedRaptor(baseline, adjustments).arrivals(origin, departure, max_transfers)
+        return cumulative_target_arrivals(rounds, destination)
+
+    full = adjusted(ADJUSTMENTS)
+    if not matches(full, actual, walk_rounding=True):
+        return None
+    # 하나만 빼면 결과가 달라지는 변경이 원인. 없으면(여러 변경이 각각 같은 차이를 만들면) 하나만 적용해도 달라지는 변경
+    causes = [name for name in ADJUSTMENTS
+              if not matches(adjusted([other for other in ADJUSTMENTS if other != name]), full)]
+    if not causes:
+        causes = [name for name in ADJUSTMENTS if not matches(adjusted([name]), expected)]
+    if not matches(full, actual):
+        causes.append('walk_rounding')
+    return causes
+
+
+def summarize(classified):
+    # 분류 결과 {질의: 원인 리스트 또는 None} -> 원인별 질의 수와 설명되지 않은 질의 목록
+    by_cause = defaultdict(int)
+    unexplained = []
+    for query, causes in classified.items():
+        if causes is None:
+            unexplained.append(list(query))
+            continue
+        for cause in causes:
+            by_cause[cause] += 1
+    return {
+        'explained': sum(1 for causes in classified.values() if causes is not None),
+        'by_cause': {name: {'queries': by_cause[name], 'description': KNOWN_DIFFERENCES[name]}
+                     for name in KNOWN_DIFFERENCES if by_cause[name]},
+        'unexplained': unexplained,
+    }
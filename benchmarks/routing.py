@@ -0,0 +1,241 @@
+# benchmarks/routing.py
+# 적재/전처리/경로 탐색 벤치마크
+# - 전처리: GTFSLoader.load_feed, create_gdf, build_station_data, 도보 그래프, RAPTOR 시간표 생성 시간과 최대 RSS,
+#   피드 테이블별 메모리 사용량
+# - 탐색: 시드 고정 출발역/도착역/출발 시각 질의 N개를 point-to-point raptor_search로 실행하여
+#   p50/p95/p99 지연 시간, 라운드별 통계, 단계별 소요 시간 보고
+# - 정확성: 기준 파일(--reference)의 질의별·라운드별 목적지 도착 시각(trip k개 이하 최단)과 비교.
+#   기준 파일은 --write-reference로 배열 엔진 이전의 pandas 구현(benchmarks/baseline_router.py, 원본 그대로)을
+#   실행해 생성. 기준과 다른 질의는 의도적인 동작 변경(benchmarks/known_differences.py) 중 어느 것 때문인지 분류하고,
+#   어느 변경으로도 설명되지 않는 불일치가 있으면 실패
+#   원본은 집합 순회 순서에 따라 결과가 달라지므로 기준 파일 생성/검사는 PYTHONHASHSEED=0으로 실행
+#
+# 사용법: PYTHONHASHSEED=0 python -m benchmarks.routing [gtfs_path] [--queries N] [--seed S] [--output result.json]
+#                                      [--reference benchmarks/reference_arrivals.json] [--write-reference PATH]
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import time
+import numpy as np
+from config import GTFS_DATA_PATH, MAX_TRANSFERS, FOOT_PATH_RADIUS, WALKING_SPEED
+from services.gtfs.gtfs_loader import GTFSLoader, create_gdf, build_station_data, memory_report
+from services.gtfs.feed_cache import feed_hash
+from services.geo.geo_utils import build_foot_paths
+from services.raptor.timetable import RaptorTimetable
+from services.raptor.router import Raptor, INF_TIME
+from services.raptor.instrumentation import SearchMetrics
+from benchmarks.baseline_router import CachedBaselineRaptor, load_baseline_feed
+from benchmarks.known_differences import classify, cumulative_target_arrivals, matches, summarize
+
+# 질의 출발 시각 범위 (05:00 ~ 23:00, 분 단위)
+QUERY_START_SECS = 5 * 3600
+QUERY_END_SECS = 23 * 3600
+
+
+def peak_rss_mb():
+    # 프로세스 최대 RSS (Linux는 KB, macOS는 바이트 단위)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def timed(results, name, func):
+    start = time.perf_counter()
+    value = func()
+    results[name] = {'secs': time.perf_counter() - start, 'peak_rss_mb': peak_rss_mb()}
+    print(f"{name}: {results[name]['secs'] * 1000:.1f}ms (최대 RSS {results[name]['peak_rss_mb']:.1f}MB)")
+    return value
+
+
+def make_queries(stop_ids, count, seed):
+    # 시드 고정 (출발역, 도착역, 출발 시각) 질의 목록 (정류장 ID 정렬 후 추출하여 피드 행 순서와 무관)
+    rng = random.Random(seed)
+    stops = sorted(stop_ids)
+    queries = []
+    for _ in range(count):
+        origin, destination = rng.sample(stops, 2)
+        departure = rng.randrange(QUERY_START_SECS, QUERY_END_SECS, 60)
+        queries.append((origin, destination, departure))
+    return queries
+
+
+def run_queries(timetable, queries, max_transfers):
+    """
+    질의별 point-to-point 탐색 실행
+    Returns: (질의별 지연 시간 배열(초), 질의별 라운드별 목적지 도착 시각 리스트, 라운드별 통계 리스트, 단계별 소요 시간)
+    """
+    round_records = []
+    metrics = SearchMetrics(enabled=True, hooks=[lambda stats: round_records.extend(stats.rounds)])
+    router = Raptor(timetable, metrics=metrics)
+    latencies = []
+    arrivals = []
+    for origin, destination, departure in queries:
+        start = time.perf_counter()
+        _, labels, _, _, _, _ = router.raptor_search(origin, departure, max_transfers, destination)
+        latencies.append(time.perf_counter() - start)
+        target = labels[:, timetable.stop_index[destination]]
+        arrivals.append([int(t) if t < INF_TIME else None for t in target.tolist()])
+    return np.array(latencies), arrivals, round_records, metrics.snapshot()['phases']
+
+
+def load_baseline_router(gtfs_path):
+    feed = load_baseline_feed(gtfs_path)
+    return CachedBaselineRaptor(feed, create_gdf(feed), WALKING_SPEED)
+
+
+def baseline_arrivals(gtfs_path, queries, max_transfers):
+    """
+    기존 pandas 구현으로 질의별 라운드별 목적지 도착 시각 계산 (질의당 수 초, 기준 파일 생성용)
+    원본은 라운드 사이에 라벨을 이어받지 않으므로 라운드 k까지의 최솟값(trip k개 이하 최단 도착)으로 변환
+    Returns: 질의별 라운드별 도착 시각 리스트 (도보를 거치면 실수, 도달 불가는 None)
+    """
+    router = load_baseline_router(gtfs_path)
+    arrivals = []
+    for i, (origin, destination, departure) in enumerate(queries, 1):
+        arrivals.append(cumulative_target_arrivals(router.arrivals(origin, departure, max_transfers), destination))
+        if i % 50 == 0:
+            print(f"기준 탐색 {i}/{len(queries)}건")
+    return arrivals
+
+
+def summarize_rounds(round_records):
+    # 라운드 번호별 평균 (표시 정류장, 노선, trip, 소요 시간)
+    by_round = {}
+    for record in round_records:
+        by_round.setdefault(record['round'], []).append(record)
+    summary = []
+    for round_idx, records in sorted(by_round.items()):
+        summary.append({
+            'round': round_idx,
+            'searches': len(records),
+            'mean_marked_stops': float(np.mean([r['marked_stops'] for r in records])),
+            'mean_routes': float(np.mean([r['routes'] for r in records])),
+            'mean_trips_scanned': float(np.mean([r['trips_scanned'] for r in records])),
+            'mean_elapsed_ms': float(np.mean([r['elapsed_time'] for r in records]) * 1000),
+        })
+    return summary
+
+
+def check_reference(path, gtfs_path, gtfs_hash, queries, max_transfers, arrivals):
+    """
+    기준 파일과 같은 피드/질의인지 확인 후 질의별·라운드별 도착 시각 비교
+    기준과 다른 질의는 의도적인 동작 변경으로 분류 (원본 구현을 다시 불러와 변경별로 탐색하므로 수 분 소요)
+    """
+    with open(path, encoding='utf-8') as f:
+        reference = json.load(f)
+    if reference['feed_hash'] != gtfs_hash or reference['max_transfers'] != max_transfers:
+        raise SystemExit(f"기준 파일의 피드/최대 환승 설정이 다릅니다: {path}")
+    if reference.get('pythonhashseed') != os.environ.get('PYTHONHASHSEED'):
+        print(f"경고: 기준 파일과 PYTHONHASHSEED가 다릅니다 (기준 {reference.get('pythonhashseed')}), "
+              "집합 순서에 따른 차이의 원인 분류가 달라질 수 있음")
+    expected = {tuple(q): a for q, a in zip(reference['queries'], reference['arrivals'])}
+    different = {}
+    compared = 0
+    for query, actual in zip(queries, arrivals):
+        if query not in expected:
+            continue
+        compared += 1
+        if not matches(expected[query], actual):
+            different[query] = actual
+    if not compared:
+        raise SystemExit(f"기준 파일과 겹치는 질의가 없습니다 (--seed/--queries 확인): {path}")
+
+    classified = {}
+    if different:
+        baseline = load_baseline_router(gtfs_path)
+        for query, actual in different.items():
+            classified[query] = classify(baseline, query, expected[query], actual, max_transfers)
+    summary = summarize(classified)
+    examples = [{'query': list(query), 'expected': expected[query], 'actual': different[query],
+                 'causes': classified[query]} for query in list(different)[:10]]
+    return {'reference': path, 'compared': compared, 'identical': compared - len(different),
+            'known_differences': summary['explained'], 'by_cause': summary['by_cause'],
+            'unexplained': len(summary['unexplained']), 'unexplained_queries': summary['unexplained'],
+            'examples': examples}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="GTFS 적재/전처리/경로 탐색 벤치마크")
+    parser.add_argument('gtfs_path', nargs='?', default=GTFS_DATA_PATH)
+    parser.add_argument('--queries', type=int, default=500, help="탐색 질의 수")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--max-transfers', type=int, default=MAX_TRANSFERS)
+    parser.add_argument('--output', help="결과 JSON 저장 경로 (생략 시 표준 출력)")
+    parser.add_argument('--reference', help="정확성 검사 기준 파일 (질의별 목적지 도착 시각)")
+    parser.add_argument('--write-reference', help="기존 pandas 구현의 질의별 도착 시각을 기준 파일로 저장")
+    args = parser.parse_args(argv)
+
+    preprocessing = {}
+    loader = GTFSLoader(args.gtfs_path)
+    timed(preprocessing, 'load_feed', loader.load_feed)
+    feed = loader.get_feed_data()
+    table_memory_mb = {name: size / 1e6 for name, size in memory_report(feed).items()}
+    stations_gdf = timed(preprocessing, 'create_gdf', lambda: create_gdf(feed))
+    timed(preprocessing, 'build_station_data', lambda: build_station_data(feed))
+    foot_paths = timed(preprocessing, 'foot_paths',
+                       lambda: build_foot_paths(stations_gdf, FOOT_PATH_RADIUS, WALKING_SPEED))
+    timetable = timed(preprocessing, 'timetable', lambda: RaptorTimetable.from_feed(
+        feed, stations_gdf, FOOT_PATH_RADIUS, WALKING_SPEED, foot_paths=foot_paths))
+
+    queries = make_queries(timetable.stop_ids.tolist(), args.queries, args.seed)
+    latencies, arrivals, round_records, phases = run_queries(timetable, queries, args.max_transfers)
+    gtfs_hash = feed_hash(args.gtfs_path)
+    p50, p95, p99 = (float(v) * 1000 for v in np.percentile(latencies, [50, 95, 99]))
+    print(f"탐색 {len(queries)}건: p50 {p50:.1f}ms, p95 {p95:.1f}ms, p99 {p99:.1f}ms")
+
+    result = {
+        'feed': args.gtfs_path,
+        'feed_hash': gtfs_hash,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'preprocessing': preprocessing,
+        'table_memory_mb': table_memory_mb,
+        'routing': {
+            'queries': len(queries),
+            'seed': args.seed,
+            'max_transfers': args.max_transfers,
+            'reached': sum(1 for a in arrivals if any(t is not None for t in a)),
+            'mean_ms': float(latencies.mean() * 1000),
+            'p50_ms': p50,
+            'p95_ms': p95,
+            'p99_ms': p99,
+            'max_ms': float(latencies.max() * 1000),
+            'phases_secs': phases,
+            'rounds': summarize_rounds(round_records),
+        },
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+    if args.write_reference:
+        if os.environ.get('PYTHONHASHSEED') is None:
+            raise SystemExit("기준 파일은 PYTHONHASHSEED를 고정하고 생성하세요 (예: PYTHONHASHSEED=0)")
+        reference = baseline_arrivals(args.gtfs_path, queries, args.max_transfers)
+        with open(args.write_reference, 'w', encoding='utf-8') as f:
+            json.dump({'feed_hash': gtfs_hash, 'max_transfers': args.max_transfers, 'engine': 'baseline_pandas',
+                       'pythonhashseed': os.environ['PYTHONHASHSEED'], 'queries': [list(q) for q in queries],
+                       'arrivals': reference}, f)
+        print(f"기준 파일 저장: {args.write_reference}")
+    if args.reference:
+        result['check'] = check_reference(args.reference, args.gtfs_path, gtfs_hash, queries, args.max_transfers,
+                                          arrivals)
+        check = result['check']
+        print(f"정확성 검사: {check['compared']}건 비교, 동일 {check['identical']}건, "
+              f"설명된 차이 {check['known_differences']}건, 설명되지 않은 불일치 {check['unexplained']}건")
+        for name, cause in check['by_cause'].items():
+            print(f"  {name}: {cause['queries']}건 - {cause['description']}")
+
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+    if args.reference and result['check']['unexplained']:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
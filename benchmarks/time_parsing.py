@@ -0,0 +1,51 @@
+# benchmarks/time_parsing.py
+# stop_times 시각 변환 벤치마크: 행 단위 Series.apply(time_to_seconds) vs 일괄 변환 parse_gtfs_times
+#
+# 사용법: python -m benchmarks.time_parsing [gtfs_path] [--repeat N]
+import argparse
+import time
+import zipfile
+import numpy as np
+import pandas as pd
+from config import GTFS_DATA_PATH
+from services.gtfs.gtfs_loader import time_to_seconds, parse_gtfs_times, TIME_COLUMNS
+
+
+def read_raw_stop_times(gtfs_path):
+    # zip 안의 stop_times.txt를 문자열 그대로 읽음 (하위 폴더에 있어도 찾음)
+    with zipfile.ZipFile(gtfs_path) as zf:
+        name = next(n for n in zf.namelist()
+                    if n.endswith('stop_times.txt') and not n.startswith('__MACOSX'))
+        with zf.open(name) as f:
+            return pd.read_csv(f, dtype=str, usecols=list(TIME_COLUMNS), encoding='utf-8-sig')
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="GTFS 시각 변환 벤치마크")
+    parser.add_argument('gtfs_path', nargs='?', default=GTFS_DATA_PATH)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    stop_times = read_raw_stop_times(args.gtfs_path)
+    print(f"stop_times {len(stop_times)}행")
+    for col in TIME_COLUMNS:
+        # 기존 방식은 빈 값을 처리하지 못하므로 값이 있는 행만 비교
+        values = stop_times[col].dropna()
+        apply_secs, expected = best_of(lambda: values.apply(time_to_seconds), args.repeat)
+        vector_secs, parsed = best_of(lambda: parse_gtfs_times(values), args.repeat)
+        assert np.array_equal(parsed, expected.to_numpy()), f"{col} 변환 결과 불일치"
+        print(f"{col}: apply {apply_secs * 1000:.1f}ms, 일괄 변환 {vector_secs * 1000:.1f}ms "
+              f"({apply_secs / vector_secs:.1f}배)")
+
+
+if __name__ == '__main__':
+    main()
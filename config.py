@@ -1,7 +1,63 @@
 # config.py
 GTFS_DATA_PATH = 'kr_subway_gtfs.zip'
+FEED_CACHE_DIR = '.feed_cache'  # 컴파일된 피드 캐시 디렉터리
+
+# 피드 레지스트리: 한 서버에서 여러 지역 피드 제공 (요청의 feed 파라미터로 선택, 생략 시 DEFAULT_FEED)
+# 예) FEEDS = {'kr_subway': GTFS_DATA_PATH, 'daejeon': 'dj_gtfs.zip'}
+FEEDS = {'kr_subway': GTFS_DATA_PATH}
+DEFAULT_FEED = 'kr_subway'  # 서버 시작 시 미리 불러옴, 나머지 피드는 처음 요청될 때 불러옴
+FEED_MEMORY_BUDGET_MB = 1024  # 불러온 피드 추정 메모리 합 한도 (넘으면 가장 오래 사용되지 않은 피드 해제)
+FEED_CHECK_INTERVAL = 60  # GTFS 파일 변경 확인 간격 (초, 바뀌면 새 버전을 불러와 교체)
 MAX_TRANSFERS = 3
 
+# 도보 환승 설정
+FOOT_PATH_RADIUS = 320.0  # 도보 환승 허용 반경 (m)
+WALKING_SPEED = 1.4  # 보행 속도 (m/s)
+
+# 좌표 출발/도착 시 탐색할 가까운 역 (AEQD 직선거리 기준)
+NEAREST_STOPS_K = 3  # 최대 역 수
+NEAREST_STOPS_RADIUS = 1000.0  # 검색 반경 (m)
+
+# 일괄 경로 탐색 프로세스 풀 크기이자 요청별 최대 동시 탐색 출발지 수 (2 미만이면 프로세스 풀 없이 탐색 작업 풀에서 순차 처리)
+BATCH_MAX_PROCESSES = 4
+
+# 경로 탐색 결과 캐시 (출발지별 탐색 라벨 보관)
+ROUTE_CACHE_SIZE = 256  # 최대 보관 출발지 탐색 수 (0이면 캐시 사용 안 함)
+ROUTE_CACHE_TTL = 600  # 캐시 유효 시간 (초)
+ROUTE_CACHE_BUCKET = 60  # 출발 시각 구간 (초, 구간 끝 시각으로 올림하여 탐색)
+
+# 경로 탐색 작업 풀 (워커 프로세스별 스레드 풀, 수용 한도를 넘으면 503, 마감 시각을 넘으면 504)
+SEARCH_POOL_WORKERS = 4  # 동시에 실행할 탐색 수
+SEARCH_POOL_QUEUE = 16  # 실행 대기 탐색 수 한도
+SEARCH_TIMEOUT = 5.0  # 요청별 탐색 마감 시간 (초, 라운드 사이에서 확인)
+
+# 서버 측 지도 HTML 생성 (경로 GeoJSON 내용 기반 주소로 요청 시 생성, 모든 워커가 공유하는 디렉터리에 저장)
+ROUTE_MAP_RENDER = True  # False이면 map_url 없이 GeoJSON만 반환
+ROUTE_MAP_DIR = f'{FEED_CACHE_DIR}/route_maps'  # 지도 저장 디렉터리
+ROUTE_MAP_CACHE_SIZE = 128  # 최대 보관 지도 수 (넘으면 오래된 지도부터 삭제)
+
+# 역 목록/검색 (/api/stations 응답 캐시 유효 시간 (초, 이후 ETag로 재검증), 역 이름 검색 최대 결과 수)
+STATIONS_MAX_AGE = 300
+STATION_SEARCH_LIMIT = 10
+
+# 도달 가능 범위(isochrone) 설정
+ISOCHRONE_BUDGETS = (15, 30, 45, 60)  # 기본 시간 예산 (분)
+ISOCHRONE_MAX_WALK = 600  # 정류장에서 걷는 최대 시간 (초, 도보 반경 = 남은 시간(최대 이 값) x 보행 속도)
+ISOCHRONE_CACHE_SIZE = 128  # 최대 보관 폴리곤 수 (출발역, 출발 시각 구간, 예산별)
+
+# 운행 시간대 (날짜를 지정하지 않은 요청의 운행일, 실시간 절대 시각 변환에 사용)
+SERVICE_TIMEZONE = 'Asia/Seoul'
+
+# GTFS-Realtime TripUpdates 지연 반영 (기본 피드에 적용, 로컬 protobuf 파일 또는 디렉터리, None이면 사용 안 함)
+REALTIME_PATH = None
+REALTIME_POLL_INTERVAL = 30  # 파일 변경 확인 간격 (초, 피드별 백그라운드 스레드에서 확인)
+
+# 탐색 계측 (단계별 소요 시간/건수를 /api/metrics와 로거로 제공, False이면 수집 안 함)
+SEARCH_METRICS_ENABLED = True
+
+# gunicorn 워커 수 (0이면 CPU 코어 수, gunicorn.conf.py에서 사용)
+GUNICORN_WORKERS = 0
+
 # Flask 서버 설정
 FLASK_HOST = '0.0.0.0'
 FLASK_PORT = 5001
@@ -0,0 +1,26 @@
+# gunicorn.conf.py
+# gunicorn 설정: 마스터가 앱을 한 번 로드(preload)한 뒤 워커를 fork
+# 컴파일된 피드 캐시(시간표/도보 그래프/색인 배열)는 읽기 전용 memory-map이므로 모든 워커가 같은 페이지를 공유하고,
+# 캐시가 없으면 마스터에서 한 번만 컴파일됨.
+#
+# 사용법: gunicorn -c gunicorn.conf.py
+import gc
+import multiprocessing
+from config import FLASK_HOST, FLASK_PORT, GUNICORN_WORKERS
+
+wsgi_app = 'app:app'
+bind = f"{FLASK_HOST}:{FLASK_PORT}"
+workers = GUNICORN_WORKERS or multiprocessing.cpu_count()
+preload_app = True
+
+
+def when_ready(server):
+    # 마스터가 로드한 객체를 GC 추적에서 제외하여 워커에서 GC가 돌 때 copy-on-write 복사가 일어나지 않게 함
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # 요청 스레드가 생기기 전에 워커의 일괄 탐색 프로세스 풀 생성 (자식 프로세스는 spawn 방식으로 시작)
+    batch_workers = worker.app.wsgi().config.get('BATCH_WORKERS')
+    if batch_workers is not None:
+        batch_workers.start()
@@ -1,29 +1,40 @@
 # server/__init__.py
 from flask import Flask
-from config import GTFS_DATA_PATH
-from services.gtfs.gtfs_loader import GTFSLoader, create_gdf, build_station_data
+from services.gtfs.feed_registry import FeedRegistry
+from services.raptor.query_cache import QueryCache
+from services.raptor.search_pool import SearchPool
+from services.raptor.batch_workers import BatchWorkers
+from config import (ROUTE_CACHE_SIZE, ROUTE_CACHE_TTL, ROUTE_MAP_DIR, ROUTE_MAP_CACHE_SIZE, ISOCHRONE_CACHE_SIZE,
+                    REALTIME_PATH, SEARCH_POOL_WORKERS, SEARCH_POOL_QUEUE, FEEDS, DEFAULT_FEED,
+                    FEED_MEMORY_BUDGET_MB, FEED_CHECK_INTERVAL, BATCH_MAX_PROCESSES)
 from utils.logging import setup_logging
 from .index import index_bp
 from .route_api import api_bp
+from .route_map_store import RouteMapStore
 
 logger = setup_logging()
 
 def create_app():
     app = Flask(__name__, static_folder='../static', static_url_path='/static')
     logger.info("GTFS 데이터 로드 시작...")
-    gtfs_loader = GTFSLoader()
-    gtfs_loader.load_feed()
-    gtfs_feed = gtfs_loader.get_feed_data()
-    stations_gdf = create_gdf(gtfs_feed)
-    station_metadata = build_station_data(gtfs_feed)
+    # 피드 레지스트리: 요청별 피드를 처음 사용할 때 컴파일된 피드 캐시를 memory-map으로 로드 (없으면 최초 1회 컴파일)
+    # 실시간 지연 반영은 기본 피드에 적용 (피드를 꺼낼 때 파일 변경을 확인하여 시간표/피드 버전 교체)
+    feeds = FeedRegistry(FEEDS, DEFAULT_FEED, FEED_MEMORY_BUDGET_MB, FEED_CHECK_INTERVAL,
+                         realtime_paths={DEFAULT_FEED: REALTIME_PATH} if REALTIME_PATH else None)
+    # 기본 피드는 미리 로드 (gunicorn preload 시 마스터에서 한 번만 컴파일)
+    feeds.get(DEFAULT_FEED)
 
     # 앱 설정에 데이터 저장
-    app.config['GTFS_FEED'] = gtfs_feed
-    app.config['STATIONS_GDF'] = stations_gdf
-    app.config['STATION_METADATA'] = station_metadata
+    app.config['FEEDS'] = feeds
+    app.config['ROUTE_CACHE'] = QueryCache(ROUTE_CACHE_SIZE, ROUTE_CACHE_TTL)
+    app.config['ROUTE_MAPS'] = RouteMapStore(ROUTE_MAP_DIR, ROUTE_MAP_CACHE_SIZE)
+    app.config['ISOCHRONE_CACHE'] = QueryCache(ISOCHRONE_CACHE_SIZE, ROUTE_CACHE_TTL)
+    app.config['SEARCH_POOL'] = SearchPool(SEARCH_POOL_WORKERS, SEARCH_POOL_QUEUE)
+    # 일괄 탐색 프로세스 풀 (gunicorn은 워커 fork 직후 생성, 그 외에는 처음 사용할 때 생성)
+    app.config['BATCH_WORKERS'] = BatchWorkers(BATCH_MAX_PROCESSES) if BATCH_MAX_PROCESSES >= 2 else None
 
     # Blueprint 등록
     app.register_blueprint(index_bp)
     app.register_blueprint(api_bp)
     logger.info("앱 초기화 완료.")
-    return app
\ No newline at end of file
+    return app
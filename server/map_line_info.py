@@ -2,63 +2,98 @@
 import folium
 from assets.color import getLineColor  # 노선 색상 함수
 
-def draw_route_on_map(feed, route, route_info):
+def split_route_segments(route, route_info):
     """
-    feed: GTFS 피드 (stops 정보를 포함)
-    route: 최종 경로에 포함된 stop_id 리스트 (예: ['RS_ACC1_S-1-4928', 'RS_ACC1_S-1-4929', ...])
-    route_info: 각 정류장의 추가 정보 리스트 (각 정류장의 operator, line 등)
-
-    각 인접 구간에서 operator 또는 line 정보가 바뀌면 새로운 구간(segment)으로 분리,
-    각 구간마다 getLineColor()로 색상을 지정한 후 Folium 지도에 표시.
+    각 인접 구간에서 operator 또는 line 정보가 바뀌면 새로운 구간(segment)으로 분리
+    Returns: [(구간 내 경로 인덱스 리스트, operator, line)]
     """
-    # 첫 정류장을 기준으로 지도를 생성
-    first_stop = feed.stops[feed.stops['stop_id'] == route[0]].iloc[0]
-    m = folium.Map(location=[first_stop.stop_lat, first_stop.stop_lon], zoom_start=11)
-
-    # 구간 분할: 현재 operator, line이 바뀌면 새로운 구간으로 분리
     segments = []
-    current_segment = [route[0]]
+    current_segment = [0]
     current_operator = route_info[0]['operator']
     current_line = route_info[0]['line']
-    current_color = getLineColor(current_operator, current_line)
 
     for i in range(1, len(route)):
         info = route_info[i]
         op = info['operator']
         ln = info['line']
         if op != current_operator or ln != current_line:
-            segments.append((current_segment, current_color))
-            current_segment = [route[i]]
+            segments.append((current_segment, current_operator, current_line))
+            current_segment = [i]
             current_operator = op
             current_line = ln
-            current_color = getLineColor(current_operator, current_line)
         else:
-            current_segment.append(route[i])
-    segments.append((current_segment, current_color))
+            current_segment.append(i)
+    segments.append((current_segment, current_operator, current_line))
+    return segments
 
-    all_coords = []
-    # 각 구간을 지도에 추가
-    for seg, seg_color in segments:
-        seg_coords = []
-        for stop_id in seg:
-            stop_row = feed.stops[feed.stops['stop_id'] == stop_id].iloc[0]
-            coord = [stop_row.stop_lat, stop_row.stop_lon]
-            seg_coords.append(coord)
-            all_coords.append(coord)
-            folium.CircleMarker(
-                location=coord,
-                radius=5,
-                color=seg_color,
-                fill=True,
-                fill_opacity=1.0
-            ).add_to(m)
-        if len(seg_coords) > 1:
+def route_geojson(route, route_info, stop_index, stop_coords):
+    """
+    경로를 GeoJSON FeatureCollection으로 변환 (클라이언트 지도 표시용)
+
+    route: 최종 경로에 포함된 stop_id 리스트
+    route_info: 각 정류장의 추가 정보 리스트 (역명, 도착/출발 시각, operator, line 등)
+    stop_index: stop_id -> 시간표 정류장 인덱스
+    stop_coords: 시간표 정류장 순서의 (위도, 경도) 배열
+
+    구간마다 LineString(노선 색상 포함), 정류장마다 Point feature 생성. 좌표는 GeoJSON 규약대로 [경도, 위도].
+    """
+    coords = [[float(stop_coords[stop_index[stop_id], 1]), float(stop_coords[stop_index[stop_id], 0])]
+              for stop_id in route]
+    features = []
+    for seg, operator, line in split_route_segments(route, route_info):
+        color = getLineColor(operator, line)
+        if len(seg) > 1:
+            features.append({
+                'type': 'Feature',
+                'geometry': {'type': 'LineString', 'coordinates': [coords[i] for i in seg]},
+                'properties': {'kind': 'segment', 'operator': operator, 'line': line, 'color': color},
+            })
+        for i in seg:
+            info = route_info[i]
+            features.append({
+                'type': 'Feature',
+                'geometry': {'type': 'Point', 'coordinates': coords[i]},
+                'properties': {
+                    'kind': 'stop',
+                    'stop_id': str(route[i]),
+                    'station': info['station'],
+                    'arrival': info['arrival'],
+                    'departure': info['departure'],
+                    'color': color,
+                },
+            })
+    return {'type': 'FeatureCollection', 'features': features}
+
+def draw_route_on_map(geometry):
+    """
+    geometry: route_geojson()으로 만든 GeoJSON FeatureCollection
+
+    구간(LineString)은 노선 색상 선으로, 정류장(Point)은 원형 마커로 Folium 지도에 표시.
+    """
+    all_coords = [feature['geometry']['coordinates'][::-1] for feature in geometry['features']
+                  if feature['geometry']['type'] == 'Point']
+    # 첫 정류장을 기준으로 지도를 생성
+    m = folium.Map(location=all_coords[0], zoom_start=11)
+
+    for feature in geometry['features']:
+        properties = feature['properties']
+        if feature['geometry']['type'] == 'LineString':
             folium.PolyLine(
-                seg_coords,
+                [[lat, lon] for lon, lat in feature['geometry']['coordinates']],
                 weight=5,
-                color=seg_color,
+                color=properties['color'],
                 opacity=0.8
             ).add_to(m)
+        else:
+            lon, lat = feature['geometry']['coordinates']
+            folium.CircleMarker(
+                location=[lat, lon],
+                radius=5,
+                color=properties['color'],
+                fill=True,
+                fill_opacity=1.0,
+                tooltip=properties['station']
+            ).add_to(m)
     if all_coords:
         m.fit_bounds(all_coords)
-    return m
\ No newline at end of file
+    return m
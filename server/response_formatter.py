@@ -1,29 +1,21 @@
 # server/response_formatter.py
-import os
+import hashlib
+import json
 from services.gtfs.gtfs_loader import secs_to_hhmm
-from server.map_line_info import draw_route_on_map  # 지도 생성 함수
+from server.map_line_info import draw_route_on_map, route_geojson  # 지도/경로 GeoJSON 생성 함수
 
-def format_route_response(route_result, station_metadata, gtfs_feed, static_directory,
-                          output_filename="route_result.html"):
+def build_route_details(station_route, schedule_info, station_metadata):
     """
-    경로 탐색 결과를 가공하고 지도를 생성합
+    경로의 정류장별 상세 정보(역명, 도착/출발 시각, 운영사, 노선) 생성
 
     Parameters:
-        route_result: (total_time_seconds, station_route, schedule_info)
+        station_route: 경로상의 정류장 ID 리스트
+        schedule_info: 정류장별 (stop_id, arrival_seconds, departure_seconds, wait_time, mode)
         station_metadata: 전체 역 정보 리스트
-        gtfs_feed: GTFS 데이터 (정류장, 트립, 노선, 시간표 등)
-        static_directory: 생성된 지도 파일을 저장할 정적 파일 디렉토리
-        output_filename: 생성할 지도 파일명 (기본: "route_result.html")
 
     Returns:
-        total_time_minutes: 총 소요 시간 (분 단위)
-        station_route: 경로상의 정류장 ID 리스트
         route_details: 정류장별 상세 정보 리스트
-        map_output_file: 생성된 지도 파일의 전체 경로
     """
-    total_time_seconds, station_route, schedule_info = route_result
-    total_time_minutes = int(total_time_seconds / 60)
-
     # 역 정보 매핑: stop_id -> 역 메타정보
     station_info_mapping = {station['stop_id']: station for station in station_metadata}
 
@@ -58,10 +50,35 @@ def format_route_response(route_result, station_metadata, gtfs_feed, static_dire
             'line': station_info.get('line', 'Unknown'),
             'line_info': station_info.get('line_info', '')
         })
+    return route_details
+
+def format_route_response(route_result, station_metadata, stop_index, stop_coords):
+    """
+    경로 탐색 결과를 가공하고 경로 GeoJSON을 생성 (지도는 클라이언트에서 표시)
+
+    Parameters:
+        route_result: (total_time_seconds, station_route, schedule_info)
+        station_metadata: 전체 역 정보 리스트
+        stop_index: stop_id -> 시간표 정류장 인덱스
+        stop_coords: 시간표 정류장 순서의 (위도, 경도) 배열
+
+    Returns:
+        total_time_minutes: 총 소요 시간 (분 단위)
+        station_route: 경로상의 정류장 ID 리스트
+        route_details: 정류장별 상세 정보 리스트
+        geometry: 경로 GeoJSON FeatureCollection
+    """
+    total_time_seconds, station_route, schedule_info = route_result
+    total_time_minutes = int(total_time_seconds / 60)
+    route_details = build_route_details(station_route, schedule_info, station_metadata)
+    geometry = route_geojson(station_route, route_details, stop_index, stop_coords)
+    return total_time_minutes, station_route, route_details, geometry
 
-    # 지도 생성
-    map_object = draw_route_on_map(gtfs_feed, station_route, route_details)
-    map_output_file = os.path.join(static_directory, output_filename)
-    map_object.save(map_output_file)
+def route_map_digest(geometry):
+    # 경로 GeoJSON 내용 기반 지도 식별자 (같은 경로는 같은 지도 HTML 재사용)
+    encoded = json.dumps(geometry, ensure_ascii=False, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()[:16]
 
-    return total_time_minutes, station_route, route_details, map_output_file
+def render_route_map(geometry):
+    # 경로 GeoJSON을 Folium 지도 HTML 문자열로 생성 (파일 저장 없음)
+    return draw_route_on_map(geometry).get_root().render()
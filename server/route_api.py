@@ -1,57 +1,500 @@
 # server/route_api.py
-from flask import Blueprint, request, jsonify, current_app
-from services.gtfs.gtfs_loader import time_to_seconds
-from services.raptor.router import Raptor
+import datetime
+import json
+import time
+import zoneinfo
+import numpy as np
+from flask import Blueprint, Response, request, jsonify, current_app
+from services.gtfs.gtfs_loader import time_to_seconds, secs_to_hhmm
+from services.gtfs.service_calendar import parse_service_date
+from services.gtfs.feed_registry import UnknownFeed
+from services.raptor.router import Raptor, SearchTimeout, group_batch_queries
+from services.raptor.search_pool import PoolOverloaded
+from services.raptor.query_cache import cached_search_state, cached_journeys
+from services.raptor.instrumentation import METRICS
+from services.geo.isochrone import reachable_stops, isochrone_polygons
 from server.response_formatter import format_route_response
-from config import MAX_TRANSFERS
+from config import (MAX_TRANSFERS, BATCH_MAX_PROCESSES, ROUTE_CACHE_BUCKET, FOOT_PATH_RADIUS, WALKING_SPEED,
+                    ROUTE_MAP_RENDER, ISOCHRONE_BUDGETS, ISOCHRONE_MAX_WALK, SERVICE_TIMEZONE, NEAREST_STOPS_K,
+                    NEAREST_STOPS_RADIUS, STATIONS_MAX_AGE, STATION_SEARCH_LIMIT, SEARCH_TIMEOUT)
 from utils.logging import setup_logging
 
 logger = setup_logging()
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 
+@api_bp.errorhandler(UnknownFeed)
+def unknown_feed(error):
+    return jsonify({'error': f'알 수 없는 피드: {error.args[0]}'}), 404
+
+def _feed(name=None):
+    # 요청 피드 (feed 파라미터, 생략 시 기본 피드, 처음 사용하면 로드). 설정에 없으면 UnknownFeed (404)
+    return current_app.config.get('FEEDS').get(name or request.values.get('feed'))
+
+def _service_date(value):
+    # 요청 운행일 (YYYY-MM-DD 또는 YYYYMMDD, 생략 시 운행 시간대 기준 오늘). 형식이 틀리면 ValueError
+    if value:
+        return parse_service_date(value)
+    return datetime.datetime.now(zoneinfo.ZoneInfo(SERVICE_TIMEZONE)).date()
+
+def _nearby_stops(feed, prefix):
+    """
+    {prefix}_lat/{prefix}_lon 좌표가 있으면 반경 내 가까운 정류장 후보 [(정류장 인덱스, 도보 시간(초))]
+    좌표가 없으면 None (숫자가 아니면 ValueError)
+    """
+    lat, lon = request.form.get(f'{prefix}_lat'), request.form.get(f'{prefix}_lon')
+    if not lat or not lon:
+        return None
+    nearest = feed.stop_locator.nearest(float(lat), float(lon), NEAREST_STOPS_K, NEAREST_STOPS_RADIUS)
+    return [(stop_idx, walk_secs) for stop_idx, _, walk_secs in nearest]
+
+def _journey_response(feed, timetable, journey):
+    # 탐색 경로 딕셔너리를 응답 형식으로 변환 (시각 문자열, 분 단위 소요 시간, 정류장별 상세 정보, 경로 GeoJSON)
+    response = {key: value for key, value in journey.items() if key != 'schedule'}
+    response['departure_time'] = secs_to_hhmm(journey['departure_secs'])
+    response['arrival_time'] = secs_to_hhmm(journey['arrival_secs'])
+    response['total_time'], _, response['route_info'], response['geometry'] = format_route_response(
+        (journey['total_secs'], journey['route'], journey['schedule']),
+        feed.station_metadata,
+        timetable.stop_index,
+        feed.stop_coords,
+    )
+    return response
+
+def _route_map_url(geometry):
+    # 서버 지도 생성이 켜져 있으면 경로 GeoJSON을 공유 디렉터리에 내용 주소로 저장하고 지도 URL 반환
+    if not ROUTE_MAP_RENDER:
+        return None
+    return f"/api/route_map/{current_app.config.get('ROUTE_MAPS').put(geometry)}"
+
+def _search_router(raptor_timetable, service_date):
+    # 요청별 라우터 (SEARCH_TIMEOUT 후 마감, 대기열에서 기다린 시간도 포함)
+    return Raptor(raptor_timetable, service_date=service_date, deadline=time.monotonic() + SEARCH_TIMEOUT)
+
+def _pool_search(router, fn, *args):
+    # 탐색 작업 풀에서 실행 (수용 한도 초과 시 PoolOverloaded, 마감 초과 시 SearchTimeout)
+    return current_app.config.get('SEARCH_POOL').run(fn, *args, deadline=router.deadline)
+
+def _overload_message(error):
+    # 탐색 풀 과부하 / 탐색 시간 초과 오류 메시지
+    if isinstance(error, PoolOverloaded):
+        return '요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.'
+    return '탐색 시간이 초과되었습니다.'
+
+def _overload_response(error):
+    # 탐색 풀 과부하(503) / 탐색 시간 초과(504) 응답
+    if isinstance(error, PoolOverloaded):
+        response = jsonify({'error': _overload_message(error)})
+        response.status_code = 503
+        response.headers['Retry-After'] = '1'
+        return response
+    return jsonify({'error': _overload_message(error)}), 504
+
+def _cached_state(router, version, origin_station, departure_secs):
+    """
+    출발지 탐색 라벨 (목적지 미지정, 경로 캐시에서 재사용, 같은 출발지/시각 구간의 동시 요청은 한 번만 계산)
+    version: 라우터 시간표의 피드 버전 (캐시 키에 포함되므로 여러 피드/버전이 한 캐시를 함께 사용)
+    """
+    return cached_search_state(
+        router, current_app.config.get('ROUTE_CACHE'), origin_station, departure_secs, MAX_TRANSFERS,
+        (version, FOOT_PATH_RADIUS, WALKING_SPEED), ROUTE_CACHE_BUCKET,
+        pool=current_app.config.get('SEARCH_POOL')
+    )
+
+def _cached_journeys(router, version, origin_station, destination_station, departure_secs):
+    # 출발역-도착역 파레토 경로 (목적지 기준 가지치기 탐색, 경로 캐시에서 재사용, 같은 요청의 동시 탐색은 한 번만 계산)
+    return cached_journeys(
+        router, current_app.config.get('ROUTE_CACHE'), origin_station, destination_station, departure_secs,
+        MAX_TRANSFERS, (version, FOOT_PATH_RADIUS, WALKING_SPEED), pool=current_app.config.get('SEARCH_POOL')
+    )
+
+def _route_response(feed, timetable, journeys, arrive_by=False):
+    # 가장 빠른 경로(trip 수가 가장 많은 파레토 경로)를 대표 경로로 응답
+    response_journeys = [_journey_response(feed, timetable, journey) for journey in journeys]
+    fastest = response_journeys[-1]
+    return {
+        'total_time': fastest['total_time'],
+        'route_info': fastest['route_info'],
+        'route': fastest['route'],
+        'geometry': fastest['geometry'],
+        'journeys': response_journeys,
+        'arrive_by': arrive_by,
+        'map_url': _route_map_url(fastest['geometry'])
+    }
+
 @api_bp.route('/find_route', methods=['POST'])
 def find_route():
+    """
+    경로 탐색
+    arrive_by가 참(1/true/on)이면 도착 시각 기준 탐색: arrival_time(생략 시 departure_time 값)까지 도착하는
+    가장 늦은 출발 경로 반환
+    date: 운행일 (생략 시 오늘, 자정을 넘기는 경로는 다음날 운행 trip으로 이어짐)
+    from_lat/from_lon, to_lat/to_lon: 역 대신 좌표로 출발/도착 지정 (반경 내 가까운 역 여러 곳을 한 번에 탐색)
+    feed: 피드 이름 (생략 시 기본 피드, 다른 API도 같음)
+    """
+    feed = _feed()
     try:
         # 요청 파라미터 추출
         origin_station = request.form.get('from_station')
         destination_station = request.form.get('to_station')
+        arrive_by = request.form.get('arrive_by', '').lower() in ('1', 'true', 'on')
         departure_time_str = request.form.get('departure_time')
-        if not all([origin_station, destination_station, departure_time_str]):
+        if arrive_by:
+            departure_time_str = request.form.get('arrival_time') or departure_time_str
+        try:
+            sources, targets = _nearby_stops(feed, 'from'), _nearby_stops(feed, 'to')
+        except ValueError:
+            return jsonify({'error': '좌표는 숫자여야 합니다.'}), 400
+        if not all([origin_station or sources is not None, destination_station or targets is not None,
+                    departure_time_str]):
             return jsonify({'error': '필수 파라미터 누락'}), 400
+        try:
+            service_date = _service_date(request.form.get('date'))
+        except ValueError:
+            return jsonify({'error': '날짜는 YYYY-MM-DD 형식이어야 합니다.'}), 400
+        # 실시간 반영으로 피드의 시간표/버전이 바뀌어도 이 요청은 같은 시간표와 버전을 사용
+        raptor_timetable, feed_version = feed.snapshot_for(service_date)
 
-        # 출발 시간을 초 단위로 변환
+        # 출발(도착 기준이면 도착) 시간을 초 단위로 변환
         departure_time_secs = time_to_seconds(departure_time_str)
-        gtfs_feed = current_app.config.get('GTFS_FEED')
-        stations_gdf = current_app.config.get('STATIONS_GDF')
-        station_metadata = current_app.config.get('STATION_METADATA')
-
-        # RAPTOR 알고리즘 실행 (클래스 인스턴스 생성 후 메서드 호출)
-        router = Raptor(gtfs_feed, stations_gdf)
-        result, arrivals, parents, rounds_stats, all_stops, INF = router.raptor_search(
-            origin_station, departure_time_secs, MAX_TRANSFERS
-        )
-        if destination_station not in result:
+
+        if ((sources is None and origin_station not in raptor_timetable.stop_index)
+                or (targets is None and destination_station not in raptor_timetable.stop_index)):
+            return jsonify({'error': '알 수 없는 역'}), 400
+
+        # RAPTOR 알고리즘 실행 (사전 계산된 시간표 공유, 작업 풀에서 실행)
+        router = _search_router(raptor_timetable, service_date)
+        if sources is not None or targets is not None:
+            # 좌표 출발/도착: 가까운 역들을 출발점/목적지로 한 번에 탐색
+            if arrive_by:
+                return jsonify({'error': '좌표 출발/도착은 출발 시각 기준 탐색만 지원합니다.'}), 400
+            if sources == [] or targets == []:
+                return jsonify({'error': '좌표 근처에 역이 없습니다.'}), 404
+            sources = sources or [(raptor_timetable.stop_index[origin_station], 0)]
+            targets = targets or [(raptor_timetable.stop_index[destination_station], 0)]
+            journeys = _pool_search(router, router.location_search, sources, targets, departure_time_secs,
+                                    MAX_TRANSFERS)
+            if not journeys:
+                return jsonify({'error': '경로를 찾지 못했습니다.'}), 404
+            return jsonify(_route_response(feed, raptor_timetable, journeys))
+
+        if arrive_by:
+            journeys = _pool_search(router, router.arrive_by_search, origin_station, destination_station,
+                                    departure_time_secs, MAX_TRANSFERS)
+            if not journeys:
+                return jsonify({'error': '경로를 찾지 못했습니다.'}), 404
+            return jsonify(_route_response(feed, raptor_timetable, journeys, arrive_by=True))
+
+        # 도착 시각/환승 횟수 파레토 경로 (목적지 기준 가지치기, 결과는 경로 캐시에서 재사용)
+        journeys = _cached_journeys(router, feed_version, origin_station, destination_station, departure_time_secs)
+        if not journeys:
             return jsonify({'error': '경로를 찾지 못했습니다.'}), 404
 
-        # Flask 앱의 정적 폴더 사용
-        static_dir = current_app.static_folder
-        total_time, station_route, route_details, map_file = format_route_response(
-            result[destination_station], station_metadata, gtfs_feed, static_dir
-        )
-
-        response_data = {
-            'total_time': total_time,
-            'route_info': route_details,
-            'route': station_route,
-            'rounds_stats': rounds_stats,
-            'map_url': '/static/route_result.html'
-        }
-        return jsonify(response_data)
+        return jsonify(_route_response(feed, raptor_timetable, journeys))
+    except (PoolOverloaded, SearchTimeout) as e:
+        logger.warning(f"find_route 탐색 거부/중단: {e}")
+        return _overload_response(e)
     except Exception as e:
         logger.exception("find_route 실행 중 오류")
         return jsonify({'error': str(e)}), 500
 
+@api_bp.route('/range_route', methods=['POST'])
+def range_route():
+    """
+    출발 시간대 경로 탐색 (rRAPTOR)
+    start_time ~ end_time 사이에 출발하는 경로 중 출발 시각/도착 시각/환승 횟수 기준 파레토 최적 경로 목록 반환
+    date: 운행일 (생략 시 오늘)
+    """
+    feed = _feed()
+    try:
+        origin_station = request.form.get('from_station')
+        destination_station = request.form.get('to_station')
+        start_time_str = request.form.get('start_time')
+        end_time_str = request.form.get('end_time')
+        if not all([origin_station, destination_station, start_time_str, end_time_str]):
+            return jsonify({'error': '필수 파라미터 누락'}), 400
+        try:
+            service_date = _service_date(request.form.get('date'))
+        except ValueError:
+            return jsonify({'error': '날짜는 YYYY-MM-DD 형식이어야 합니다.'}), 400
+        raptor_timetable, _ = feed.snapshot_for(service_date)
+
+        start_secs = time_to_seconds(start_time_str)
+        end_secs = time_to_seconds(end_time_str)
+        if end_secs < start_secs:
+            return jsonify({'error': '종료 시각이 시작 시각보다 빠릅니다.'}), 400
+        if origin_station not in raptor_timetable.stop_index or destination_station not in raptor_timetable.stop_index:
+            return jsonify({'error': '알 수 없는 역'}), 400
+
+        router = _search_router(raptor_timetable, service_date)
+        journeys = _pool_search(router, router.range_search, origin_station, destination_station, start_secs,
+                                end_secs, MAX_TRANSFERS)
+        if not journeys:
+            return jsonify({'error': '경로를 찾지 못했습니다.'}), 404
+
+        return jsonify({'journeys': [_journey_response(feed, raptor_timetable, journey) for journey in journeys]})
+    except (PoolOverloaded, SearchTimeout) as e:
+        logger.warning(f"range_route 탐색 거부/중단: {e}")
+        return _overload_response(e)
+    except Exception as e:
+        logger.exception("range_route 실행 중 오류")
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/isochrone', methods=['POST'])
+def isochrone():
+    """
+    도달 가능 범위 (출발지 1회 탐색으로 모든 정류장 소요 시간 계산)
+    budgets: 시간 예산 (분, 쉼표 구분, 생략 시 ISOCHRONE_BUDGETS)
+    polygons가 참(1/true/on)이면 예산별 도보 반경 폴리곤(GeoJSON)도 반환 (출발역, 출발 시각 구간, 예산별 캐시)
+    date: 운행일 (생략 시 오늘)
+    """
+    feed = _feed()
+    try:
+        origin_station = request.form.get('from_station')
+        departure_time_str = request.form.get('departure_time')
+        if not all([origin_station, departure_time_str]):
+            return jsonify({'error': '필수 파라미터 누락'}), 400
+        try:
+            service_date = _service_date(request.form.get('date'))
+        except ValueError:
+            return jsonify({'error': '날짜는 YYYY-MM-DD 형식이어야 합니다.'}), 400
+        raptor_timetable, feed_version = feed.snapshot_for(service_date)
+        with_polygons = request.form.get('polygons', '').lower() in ('1', 'true', 'on')
+        try:
+            budgets = sorted({int(b) for b in request.form.get('budgets', '').split(',') if b.strip()}
+                             or ISOCHRONE_BUDGETS)
+        except ValueError:
+            return jsonify({'error': '시간 예산은 분 단위 정수여야 합니다.'}), 400
+
+        if origin_station not in raptor_timetable.stop_index:
+            return jsonify({'error': '알 수 없는 역'}), 400
+        router = _search_router(raptor_timetable, service_date)
+        if budgets[0] <= 0 or budgets[-1] * 60 > router.time_limit:
+            return jsonify({'error': f'시간 예산은 1~{router.time_limit // 60}분이어야 합니다.'}), 400
+
+        state, _, search_secs = _cached_state(router, feed_version, origin_station,
+                                              time_to_seconds(departure_time_str))
+        budgets_secs = [budget * 60 for budget in budgets]
+        travel_secs, reachable = reachable_stops(state.best_arrivals, search_secs, budgets_secs)
+
+        station_names = {station['stop_id']: station['stop_name']
+                         for station in feed.station_metadata}
+        stop_ids = raptor_timetable.stop_ids
+        reached = reachable[budgets_secs[-1]]
+        stops = [{
+            'stop_id': str(stop_ids[idx]),
+            'station': station_names.get(str(stop_ids[idx]), str(stop_ids[idx])),
+            'travel_time': int(travel_secs[idx] / 60),
+            'arrival_time': secs_to_hhmm(search_secs + int(travel_secs[idx])),
+        } for idx in reached[np.argsort(travel_secs[reached], kind='stable')]]
+        response = {'departure_time': secs_to_hhmm(search_secs), 'budgets': budgets, 'stops': stops}
+
+        if with_polygons:
+            isochrone_cache = current_app.config.get('ISOCHRONE_CACHE')
+            key = (feed_version, origin_station, search_secs, service_date, tuple(budgets), MAX_TRANSFERS,
+                   WALKING_SPEED, ISOCHRONE_MAX_WALK)
+            polygons = isochrone_cache.get(key)
+            if polygons is None:
+                polygons = isochrone_polygons(feed.stations_gdf, travel_secs, reachable, WALKING_SPEED,
+                                              ISOCHRONE_MAX_WALK)
+                isochrone_cache.put(key, polygons)
+            response['isochrones'] = polygons
+        return jsonify(response)
+    except (PoolOverloaded, SearchTimeout) as e:
+        logger.warning(f"isochrone 탐색 거부/중단: {e}")
+        return _overload_response(e)
+    except Exception as e:
+        logger.exception("isochrone 실행 중 오류")
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/batch_route', methods=['POST'])
+def batch_route():
+    """
+    일괄 경로 탐색 (JSON 요청, JSON Lines 스트리밍 응답)
+
+    요청 형식 (둘 중 하나):
+        {"from_station": ..., "to_stations": [...], "departure_time": "HH:MM"}
+        {"pairs": [{"from_station": ..., "to_station": ..., "departure_time": "HH:MM"(생략 시 공통값)}, ...],
+         "departure_time": "HH:MM"}
+    선택: "processes": 동시에 탐색할 출발지 수 (BATCH_MAX_PROCESSES 이하, 2 이상이면 일괄 탐색 프로세스 풀 사용),
+          "date": 운행일 (생략 시 오늘), "feed": 피드 이름 (생략 시 기본 피드)
+    출발지별 탐색은 탐색 작업 풀에서 실행 (처음부터 수용 한도 초과면 503, 출발지별 SEARCH_TIMEOUT 초과 시 해당 쌍은 오류 줄)
+    """
+    body = request.get_json(silent=True) or {}
+    feed = _feed(body.get('feed') if isinstance(body, dict) else None)
+    try:
+        default_departure = body.get('departure_time')
+        if 'pairs' in body:
+            raw_pairs = [(p.get('from_station'), p.get('to_station'), p.get('departure_time', default_departure))
+                         for p in body['pairs']]
+        else:
+            raw_pairs = [(body.get('from_station'), to_station, default_departure)
+                         for to_station in body.get('to_stations', [])]
+        if not raw_pairs or not all(all(pair) for pair in raw_pairs):
+            return jsonify({'error': '필수 파라미터 누락'}), 400
+        queries = [(origin, destination, time_to_seconds(departure))
+                   for origin, destination, departure in raw_pairs]
+        processes = min(int(body.get('processes', 0)), BATCH_MAX_PROCESSES)
+        service_date = _service_date(body.get('date'))
+    except (TypeError, ValueError, AttributeError) as e:
+        return jsonify({'error': str(e)}), 400
+
+    raptor_timetable, version = feed.snapshot_for(service_date)
+    batch_workers = current_app.config.get('BATCH_WORKERS')
+    # 프로세스 풀의 자식 프로세스는 피드 캐시를 직접 불러오므로 실시간 지연이 반영된 시간표는 요청 프로세스에서 탐색
+    use_processes = processes >= 2 and batch_workers is not None and version == feed.static_version
+
+    def search_origin(from_stop_id, departure_secs, destinations, deadline):
+        router = Raptor(raptor_timetable, service_date=service_date, deadline=deadline)
+        if use_processes:
+            return batch_workers.search_destinations(router, feed.path, version, from_stop_id, departure_secs,
+                                                     destinations, MAX_TRANSFERS)
+        return list(router.search_destinations(from_stop_id, departure_secs, destinations, MAX_TRANSFERS))
+
+    origins = [(from_stop_id, departure_secs, destinations)
+               for (from_stop_id, departure_secs), destinations in group_batch_queries(queries).items()]
+    try:
+        results = current_app.config.get('SEARCH_POOL').map_unordered(
+            search_origin, origins, max(processes, 1), SEARCH_TIMEOUT)
+    except PoolOverloaded as e:
+        return _overload_response(e)
+
+    def generate():
+        try:
+            for (from_stop_id, departure_secs, destinations), origin_results in results:
+                if isinstance(origin_results, (PoolOverloaded, SearchTimeout)):
+                    origin_results = [{'from_station': from_stop_id, 'departure_secs': departure_secs,
+                                       'to_station': destination, 'error': _overload_message(origin_results)}
+                                      for destination in destinations]
+                elif isinstance(origin_results, Exception):
+                    raise origin_results
+                for result in origin_results:
+                    result['departure_time'] = secs_to_hhmm(result['departure_secs'])
+                    if 'arrival_secs' in result:
+                        result['arrival_time'] = secs_to_hhmm(result['arrival_secs'])
+                        result['total_time'] = int(result['total_secs'] / 60)
+                    yield json.dumps(result, ensure_ascii=False) + '\n'
+        except Exception as e:
+            logger.exception("batch_route 실행 중 오류")
+            yield json.dumps({'error': str(e)}, ensure_ascii=False) + '\n'
+
+    return Response(generate(), mimetype='application/x-ndjson')
+
+@api_bp.route('/route_map/<digest>', methods=['GET'])
+def route_map(digest):
+    # 경로 지도 HTML (처음 요청 시 생성하여 공유 디렉터리에 저장, 내용 주소이므로 ETag로 재검증)
+    html = current_app.config.get('ROUTE_MAPS').html(digest)
+    if html is None:
+        return jsonify({'error': '지도를 찾을 수 없습니다.'}), 404
+    response = Response(html, mimetype='text/html')
+    response.set_etag(digest)
+    response.cache_control.public = True
+    response.cache_control.max_age = 3600
+    return response.make_conditional(request)
+
+@api_bp.route('/metrics', methods=['GET'])
+def metrics():
+    # 탐색 계측값과 캐시 통계 (Prometheus 텍스트 형식, 워커 프로세스별 값)
+    # 누적 값(적중/미적중/해제 수, 처리/거절/시간 초과 건수 등)은 counter, 현재 값(크기, 대기열 길이)은 gauge
+    gauges, counters = {}, {}
+
+    def export(prefix, stats, counter_keys):
+        for key, value in stats.items():
+            (counters if key in counter_keys else gauges)[f'{prefix}_{key}'] = value
+
+    for prefix, cache_name in (('raptor_route_cache', 'ROUTE_CACHE'), ('raptor_isochrone_cache', 'ISOCHRONE_CACHE')):
+        stats = current_app.config.get(cache_name).stats()
+        export(prefix, {key: stats[key] for key in ('entries', 'hits', 'misses', 'evictions')},
+               ('hits', 'misses', 'evictions'))
+    export('raptor_route_maps', current_app.config.get('ROUTE_MAPS').stats(),
+           ('writes', 'renders', 'hits', 'misses', 'evictions'))
+    export('raptor_search_pool', current_app.config.get('SEARCH_POOL').stats(),
+           ('submitted', 'completed', 'coalesced', 'rejected', 'timeouts'))
+    feeds = current_app.config.get('FEEDS')
+    export('raptor_feed_registry', feeds.stats(), ('loads', 'swaps', 'evictions'))
+    # 실시간 반영 통계 (불러온 피드 중 실시간 반영이 켜진 피드, 기본 피드만 지원)
+    for feed in feeds.loaded():
+        if feed.realtime is not None:
+            export('raptor_realtime', feed.realtime.stats, ('updates',))
+    return Response(METRICS.render_prometheus(gauges, counters), mimetype='text/plain; version=0.0.4')
+
+@api_bp.route('/feeds', methods=['GET'])
+def list_feeds():
+    # 설정된 피드 목록과 로드 상태 (불러온 피드는 현재 버전과 추정 메모리)
+    feeds = current_app.config.get('FEEDS')
+    loaded = {feed.name: feed for feed in feeds.loaded()}
+    return jsonify({
+        'default': feeds.default,
+        'feeds': [{
+            'name': name,
+            'loaded': name in loaded,
+            'version': loaded[name].version if name in loaded else None,
+            'memory_mb': round(loaded[name].nbytes / 1e6, 1) if name in loaded else None,
+        } for name in feeds.feeds],
+        'stats': feeds.stats(),
+    })
+
+@api_bp.route('/cache_stats', methods=['GET'])
+def cache_stats():
+    # 경로 탐색 캐시 적중/미적중 통계
+    return jsonify(current_app.config.get('ROUTE_CACHE').stats())
+
+@api_bp.route('/nearest_stations', methods=['GET'])
+def nearest_stations():
+    # 좌표(lat, lon) 근처 역과 도보 시간 (가까운 순, 최대 NEAREST_STOPS_K개)
+    try:
+        lat, lon = float(request.args['lat']), float(request.args['lon'])
+    except (KeyError, ValueError):
+        return jsonify({'error': '좌표는 숫자여야 합니다.'}), 400
+    feed = _feed()
+    stop_ids = feed.timetable.stop_ids
+    try:
+        # 경로 탐색과 같은 작업 풀/마감 시각 적용
+        nearest = current_app.config.get('SEARCH_POOL').run(
+            feed.stop_locator.nearest, lat, lon, NEAREST_STOPS_K, NEAREST_STOPS_RADIUS,
+            deadline=time.monotonic() + SEARCH_TIMEOUT)
+    except (PoolOverloaded, SearchTimeout) as e:
+        logger.warning(f"nearest_stations 거부/중단: {e}")
+        return _overload_response(e)
+    return jsonify([{'stop_id': str(stop_ids[stop_idx]), 'distance': round(distance, 1), 'walk_secs': walk_secs}
+                    for stop_idx, distance, walk_secs in nearest])
+
 @api_bp.route('/stations', methods=['GET'])
 def get_stations():
-    station_metadata = current_app.config.get('STATION_METADATA')
-    return jsonify(station_metadata)
\ No newline at end of file
+    # 역 목록 (시작 시 직렬화/압축해 둔 본문, gzip을 받는 클라이언트에는 압축본, ETag로 재검증)
+    station_index = _feed().station_index
+    if 'gzip' in request.accept_encodings:
+        response = Response(station_index.payload_gzip, mimetype='application/json')
+        response.content_encoding = 'gzip'
+        response.set_etag(f'{station_index.etag}-gz')
+    else:
+        response = Response(station_index.payload, mimetype='application/json')
+        response.set_etag(station_index.etag)
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.max_age = STATIONS_MAX_AGE
+    return response.make_conditional(request)
+
+@api_bp.route('/stations/lines', methods=['GET'])
+def get_station_lines():
+    # 호선 목록 (호선 선택 목록과 호선 색상용, 역 목록 전체를 받지 않음)
+    response = jsonify(_feed().station_index.lines)
+    response.cache_control.public = True
+    response.cache_control.max_age = STATIONS_MAX_AGE
+    return response
+
+@api_bp.route('/stations/search', methods=['GET'])
+def search_stations():
+    # 역 이름 접두어/초성/부분 문자열 검색 (q, limit, line)
+    # line만 지정하고 검색어가 없으면 그 호선의 역 전체 (역 이름순)
+    query = request.args.get('q', '')
+    line = request.args.get('line') or None
+    try:
+        limit = min(int(request.args.get('limit', STATION_SEARCH_LIMIT)), STATION_SEARCH_LIMIT)
+    except ValueError:
+        return jsonify({'error': 'limit은 숫자여야 합니다.'}), 400
+    station_index = _feed().station_index
+    if not query.strip():
+        if line is None:
+            return jsonify({'error': '검색어를 입력해주세요.'}), 400
+        return jsonify(station_index.line_stations(line))
+    return jsonify(station_index.search(query, max(limit, 1), line=line))
@@ -0,0 +1,114 @@
+# server/route_map_store.py
+# 경로 지도 저장소 (모든 워커 프로세스가 함께 쓰는 디렉터리에 내용 주소로 저장)
+# - 경로 탐색 응답 시 경로 GeoJSON을 {digest}.json으로 저장하고, 지도 요청 시 {digest}.html을 생성하여 함께 보관
+# - 파일은 임시 파일에 쓴 뒤 이름을 바꿔 저장하므로 다른 워커가 쓰다 만 파일을 읽지 않음
+# - 보관 지도 수가 max_maps를 넘으면 오래된 지도부터 삭제
+import json
+import os
+import re
+import tempfile
+import threading
+from server.response_formatter import route_map_digest, render_route_map
+
+_DIGEST = re.compile(r'[0-9a-f]{16}')
+
+
+class RouteMapStore:
+    """
+    directory: 지도 저장 디렉터리 (워커 프로세스 사이에서 공유)
+    max_maps: 최대 보관 지도 수
+    """
+
+    def __init__(self, directory, max_maps):
+        self.directory = directory
+        self.max_maps = max_maps
+        self._lock = threading.Lock()
+        self.writes = 0
+        self.renders = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, digest, suffix):
+        return os.path.join(self.directory, f'{digest}{suffix}')
+
+    def put(self, geometry):
+        # 경로 GeoJSON 저장 후 지도 식별자 반환 (같은 경로는 이미 저장된 파일 재사용)
+        digest = route_map_digest(geometry)
+        path = self._path(digest, '.json')
+        if not os.path.exists(path):
+            self._write(path, json.dumps(geometry, ensure_ascii=False))
+            with self._lock:
+                self.writes += 1
+            self._prune()
+        return digest
+
+    def html(self, digest):
+        # 지도 HTML (처음 요청 시 생성하여 저장, 저장된 경로가 없으면 None)
+        if not _DIGEST.fullmatch(digest):
+            return None
+        html_path = self._path(digest, '.html')
+        try:
+            with open(html_path, encoding='utf-8') as f:
+                html = f.read()
+            with self._lock:
+                self.hits += 1
+            return html
+        except FileNotFoundError:
+            pass
+        try:
+            with open(self._path(digest, '.json'), encoding='utf-8') as f:
+                geometry = json.load(f)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        html = render_route_map(geometry)
+        self._write(html_path, html)
+        with self._lock:
+            self.renders += 1
+        return html
+
+    def _write(self, path, text):
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _prune(self):
+        # 보관 지도 수가 한도를 넘으면 오래된 경로부터 GeoJSON/HTML 삭제 (다른 워커가 이미 지웠으면 무시)
+        maps = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.json'):
+                    continue
+                try:
+                    maps.append((entry.stat().st_mtime_ns, entry.name[:-len('.json')]))
+                except FileNotFoundError:
+                    pass
+        if len(maps) <= self.max_maps:
+            return
+        maps.sort()
+        for _, digest in maps[:len(maps) - self.max_maps]:
+            for suffix in ('.json', '.html'):
+                try:
+                    os.unlink(self._path(digest, suffix))
+                except FileNotFoundError:
+                    pass
+            with self._lock:
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'writes': self.writes,
+                'renders': self.renders,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
@@ -1,6 +1,8 @@
 #services/geo/geo_utils.py
+import numpy as np
 import geopandas as gpd
 import pyproj
+import shapely
 from shapely.geometry import Point
 
 class GeoData:
@@ -34,4 +36,45 @@ class GeoData:
             lon_0=centroid.x
         )
         self.gdf = self.gdf.to_crs(crs=aeqd_crs)
-        return self.gdf
\ No newline at end of file
+        return self.gdf
+
+def build_foot_paths(gdf, radius=320.0, walking_speed=1.4):
+    """
+    도보 환승 그래프를 CSR 형태로 생성 (STRtree 일괄 이웃 질의)
+
+    gdf: GeoDataFrame (AEQD 좌표계, 행 순서 = 정류장 인덱스)
+    radius: 도보 환승 허용 반경 (m)
+    walking_speed: 보행 속도 (m/s)
+
+    Returns:
+        offsets: 정류장 i의 이웃은 neighbors[offsets[i]:offsets[i + 1]] (int32, 길이 정류장 수 + 1)
+        neighbors: 이웃 정류장 인덱스 (int32)
+        walk_secs: 도보 소요시간 (초, 올림, int32)
+    """
+    geoms = gdf.geometry.values
+    tree = shapely.STRtree(geoms)
+    src, dst = tree.query(geoms, predicate="dwithin", distance=radius)
+    keep = src != dst  # 자기 자신 제외
+    src, dst = src[keep], dst[keep]
+
+    x = gdf.geometry.x.to_numpy()
+    y = gdf.geometry.y.to_numpy()
+    dist = np.hypot(x[src] - x[dst], y[src] - y[dst])
+    keep = dist <= radius
+    src, dst, dist = src[keep], dst[keep], dist[keep]
+
+    order = np.lexsort((dst, src))
+    offsets = np.zeros(len(gdf) + 1, dtype=np.int32)
+    np.cumsum(np.bincount(src, minlength=len(gdf)), out=offsets[1:])
+    neighbors = dst[order].astype(np.int32)
+    walk_secs = np.ceil(dist[order] / walking_speed).astype(np.int32)
+    return offsets, neighbors, walk_secs
+
+
+def stop_coordinates(stops, stop_ids):
+    """
+    stop_ids 순서의 (위도, 경도) 배열 (정류장 수 x 2, float64)
+    stops: 'stop_id', 'stop_lat', 'stop_lon' 컬럼을 가진 DataFrame
+    """
+    coords = stops.drop_duplicates('stop_id').set_index('stop_id')[['stop_lat', 'stop_lon']]
+    return coords.reindex(np.asarray(stop_ids, dtype=str)).to_numpy(dtype=np.float64)
@@ -0,0 +1,54 @@
+# services/geo/isochrone.py
+# 도달 가능 범위(isochrone) 계산
+# 출발지 1회 탐색(목적지 미지정)의 정류장별 도착 시각으로 시간 예산별 도달 가능 정류장을 구하고,
+# 남은 시간만큼 걸을 수 있는 반경의 원(AEQD 좌표계, m 단위)을 합쳐 예산별 폴리곤을 생성.
+import numpy as np
+import geopandas as gpd
+import shapely
+
+# 폴리곤 단순화 허용 오차 (m, 응답 크기 축소)
+SIMPLIFY_TOLERANCE = 20.0
+
+
+def reachable_stops(arrivals, departure_secs, budgets_secs):
+    """
+    시간 예산별 도달 가능 정류장
+
+    arrivals: 정류장별 가장 빠른 도착 시각 배열 (SearchState.best_arrivals)
+    departure_secs: 탐색 출발 시각 (초)
+    budgets_secs: 시간 예산 목록 (초, 오름차순)
+
+    Returns: (travel_secs, {예산: 정류장 인덱스 배열}) - travel_secs는 정류장별 소요 시간 (도달 불가는 -1)
+    """
+    arrivals = np.asarray(arrivals, dtype=np.int64)
+    travel_secs = arrivals - departure_secs
+    travel_secs[travel_secs > max(budgets_secs)] = -1
+    reachable = {budget: np.flatnonzero((travel_secs >= 0) & (travel_secs <= budget)) for budget in budgets_secs}
+    return travel_secs, reachable
+
+
+def isochrone_polygons(stations_gdf, travel_secs, reachable, walking_speed, max_walk_secs):
+    """
+    시간 예산별 도보 반경 폴리곤 (GeoJSON FeatureCollection, WGS84)
+
+    stations_gdf: AEQD 정류장 GeoDataFrame (행 순서 = 시간표 정류장 인덱스)
+    travel_secs, reachable: reachable_stops() 결과
+    walking_speed: 보행 속도 (m/s)
+    max_walk_secs: 정류장에서 걷는 최대 시간 (초, 예산이 많이 남아도 이 시간까지만 반경에 포함)
+    """
+    geoms = stations_gdf.geometry.values
+    budgets, polygons = [], []
+    for budget, stops in sorted(reachable.items()):
+        walk_secs = np.minimum(budget - travel_secs[stops], max_walk_secs)
+        circles = shapely.buffer(np.asarray(geoms[stops]), walk_secs * walking_speed)
+        polygon = shapely.union_all(circles) if len(stops) else shapely.Polygon()
+        budgets.append(budget)
+        polygons.append(shapely.simplify(polygon, SIMPLIFY_TOLERANCE))
+
+    wgs84 = gpd.GeoSeries(polygons, crs=stations_gdf.crs).to_crs('epsg:4326')
+    features = [{
+        'type': 'Feature',
+        'geometry': shapely.geometry.mapping(polygon),
+        'properties': {'budget_minutes': budget // 60, 'stops': int(len(reachable[budget]))},
+    } for budget, polygon in zip(budgets, wgs84.values)]
+    return {'type': 'FeatureCollection', 'features': features}
@@ -0,0 +1,36 @@
+# services/geo/nearest.py
+# 좌표 -> 가까운 정류장 검색 (좌표 출발/도착 경로 탐색용)
+# create_gdf의 AEQD 정류장 좌표로 STRtree를 한 번 만들어 두고, 요청 좌표(위도/경도)를 같은 좌표계로 변환해
+# 반경 이내 가장 가까운 정류장 k개와 도보 시간을 반환.
+import math
+import numpy as np
+import pyproj
+import shapely
+
+
+class StopLocator:
+    """
+    stations_gdf: AEQD 정류장 GeoDataFrame (행 순서 = 시간표 정류장 인덱스)
+    walking_speed: 보행 속도 (m/s)
+    """
+
+    def __init__(self, stations_gdf, walking_speed=1.4):
+        self.walking_speed = walking_speed
+        self._geoms = stations_gdf.geometry.values
+        self._tree = shapely.STRtree(self._geoms)
+        self._to_aeqd = pyproj.Transformer.from_crs('epsg:4326', stations_gdf.crs, always_xy=True)
+
+    def nearest(self, lat, lon, k=3, radius=1000.0):
+        """
+        좌표에서 반경(m) 이내 가장 가까운 정류장 k개
+        Returns: [(정류장 인덱스, 거리(m), 도보 시간(초, 올림))] 가까운 순 (반경 안에 없으면 빈 리스트)
+        """
+        x, y = self._to_aeqd.transform(lon, lat)
+        point = shapely.Point(x, y)
+        candidates = self._tree.query(point, predicate='dwithin', distance=radius)
+        if not len(candidates):
+            return []
+        distances = shapely.distance(self._geoms[candidates], point)
+        order = np.argsort(distances, kind='stable')[:k]
+        return [(int(candidates[i]), float(distances[i]), math.ceil(distances[i] / self.walking_speed))
+                for i in order]
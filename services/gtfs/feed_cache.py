@@ -0,0 +1,267 @@
+# services/gtfs/feed_cache.py
+# GTFS 피드 사전 컴파일 캐시
+# GTFS zip을 한 번 파싱하여 변환된 테이블, 정류장 메타데이터, RAPTOR 시간표 배열, 도보 환승 그래프를
+# 바이너리 캐시로 저장하고, 이후 시작 시에는 zip 파싱 없이 memory-map으로 불러옴.
+# 캐시 디렉터리는 zip 파일 해시와 캐시 포맷 버전으로 구분됨.
+# 피드 테이블과 정류장 좌표도 컬럼별 .npy로 저장 (숫자 컬럼은 memory-map, 범주/문자열 컬럼은 코드 + 값 목록)
+#
+# 사용법: python -m services.gtfs.feed_cache [gtfs_path] [--cache-dir DIR] [--force]
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from config import GTFS_DATA_PATH, FEED_CACHE_DIR, FOOT_PATH_RADIUS, WALKING_SPEED
+from services.gtfs.gtfs_loader import GTFSLoader, create_gdf, build_station_data
+from services.geo.geo_utils import build_foot_paths, stop_coordinates
+from services.raptor.timetable import RaptorTimetable, FOOT_PATH_ARRAYS
+from utils.logging import setup_logging
+
+logger = setup_logging()
+
+# 캐시 포맷이 바뀌면 증가시켜 기존 캐시를 무효화
+CACHE_FORMAT_VERSION = 9
+FEED_TABLES = ('stops', 'trips', 'routes', 'stop_times')
+# 컬럼 저장 방식: 숫자 배열 그대로 / Categorical(범주 코드 + 범주) / 문자열(코드 + 고유값, 결측은 코드 -1)
+COLUMN_NUMERIC, COLUMN_CATEGORY, COLUMN_STRING = 'numeric', 'category', 'string'
+
+
+def feed_hash(gtfs_path):
+    # GTFS zip 파일 내용의 SHA-256 해시 (앞 16자리)
+    digest = hashlib.sha256()
+    with open(gtfs_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def cache_dir_for(gtfs_path, cache_root=FEED_CACHE_DIR):
+    stem = os.path.splitext(os.path.basename(gtfs_path))[0]
+    return os.path.join(cache_root, f"{stem}-{feed_hash(gtfs_path)}-v{CACHE_FORMAT_VERSION}")
+
+
+def _foot_path_dir(cache_dir, radius, walking_speed):
+    return os.path.join(cache_dir, f"foot_paths_r{radius:g}_w{walking_speed:g}")
+
+
+def save_table(table, directory):
+    """
+    DataFrame을 컬럼별 .npy 파일로 저장 (컬럼 순서와 저장 방식은 columns.json)
+    인덱스는 저장하지 않음 (불러오면 RangeIndex)
+    """
+    os.makedirs(directory, exist_ok=True)
+    columns = []
+    for position, column in enumerate(table.columns):
+        values = table[column]
+        prefix = os.path.join(directory, str(position))
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            kind = COLUMN_CATEGORY
+            codes, labels = values.cat.codes.to_numpy(), values.cat.categories
+        elif pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+            kind = COLUMN_NUMERIC
+            np.save(f"{prefix}.npy", values.to_numpy())
+            columns.append({'name': column, 'kind': kind})
+            continue
+        else:
+            kind = COLUMN_STRING
+            codes, labels = pd.factorize(values)
+        np.save(f"{prefix}.codes.npy", codes)
+        np.save(f"{prefix}.labels.npy", np.asarray(labels, dtype=str))
+        columns.append({'name': column, 'kind': kind})
+    with open(os.path.join(directory, 'columns.json'), 'w', encoding='utf-8') as f:
+        json.dump(columns, f, ensure_ascii=False)
+
+
+def load_table(directory, mmap_mode='r'):
+    # save_table()로 저장한 DataFrame (숫자 컬럼은 memory-map 배열의 ndarray 뷰를 복사 없이 사용)
+    with open(os.path.join(directory, 'columns.json'), encoding='utf-8') as f:
+        columns = json.load(f)
+    data = {}
+    for position, column in enumerate(columns):
+        prefix = os.path.join(directory, str(position))
+        if column['kind'] == COLUMN_NUMERIC:
+            data[column['name']] = np.asarray(np.load(f"{prefix}.npy", mmap_mode=mmap_mode))
+            continue
+        codes = np.load(f"{prefix}.codes.npy", mmap_mode=mmap_mode)
+        labels = pd.Index(np.load(f"{prefix}.labels.npy").astype(object), dtype=str)
+        values = pd.Categorical.from_codes(codes, categories=labels)
+        data[column['name']] = values if column['kind'] == COLUMN_CATEGORY else pd.Series(values).astype(str)
+    return pd.DataFrame(data, copy=False)
+
+
+def save_stations_gdf(stations_gdf, directory):
+    # 정류장 GeoDataFrame을 (stop_id, x, y) 배열과 좌표계(WKT)로 저장
+    os.makedirs(directory, exist_ok=True)
+    np.save(os.path.join(directory, 'stop_ids.npy'), np.asarray(stations_gdf.index, dtype=str))
+    np.save(os.path.join(directory, 'x.npy'), stations_gdf.geometry.x.to_numpy())
+    np.save(os.path.join(directory, 'y.npy'), stations_gdf.geometry.y.to_numpy())
+    with open(os.path.join(directory, 'crs.wkt'), 'w', encoding='utf-8') as f:
+        f.write(stations_gdf.crs.to_wkt())
+
+
+def load_stations_gdf(directory):
+    import geopandas as gpd
+
+    with open(os.path.join(directory, 'crs.wkt'), encoding='utf-8') as f:
+        crs = f.read()
+    stop_ids = pd.Index(np.load(os.path.join(directory, 'stop_ids.npy')).astype(object), name='stop_id')
+    geometry = gpd.points_from_xy(np.load(os.path.join(directory, 'x.npy')),
+                                  np.load(os.path.join(directory, 'y.npy')), crs=crs)
+    return gpd.GeoDataFrame(index=stop_ids, geometry=geometry)
+
+
+class CachedFeed:
+    """
+    캐시에서 불러온 GTFS 테이블 (partridge feed처럼 stops, trips, routes, stop_times 속성 제공)
+    테이블은 처음 접근할 때 읽어옴
+    """
+
+    def __init__(self, directory):
+        self._directory = directory
+
+    def __getattr__(self, name):
+        if name not in FEED_TABLES:
+            raise AttributeError(name)
+        table = load_table(os.path.join(self._directory, 'tables', name))
+        setattr(self, name, table)
+        return table
+
+
+class CompiledFeed:
+    """
+    컴파일된 피드 묶음
+    feed: GTFS 테이블, stations_gdf: AEQD 정류장 GeoDataFrame,
+    station_metadata: 역 메타데이터 리스트, timetable: RaptorTimetable, version: 피드 버전(캐시 디렉터리 이름)
+    stop_coords: 시간표 정류장 순서의 (위도, 경도) 배열
+    """
+
+    def __init__(self, feed, stations_gdf, station_metadata, timetable, version, stop_coords):
+        self.feed = feed
+        self.stations_gdf = stations_gdf
+        self.station_metadata = station_metadata
+        self.timetable = timetable
+        self.version = version
+        self.stop_coords = stop_coords
+
+
+def compile_feed(gtfs_path=GTFS_DATA_PATH, cache_root=FEED_CACHE_DIR,
+                 radius=FOOT_PATH_RADIUS, walking_speed=WALKING_SPEED, force=False):
+    """
+    GTFS zip을 파싱하여 캐시 디렉터리 생성 (임시 디렉터리에 쓴 뒤 이름을 바꿔 원자적으로 교체)
+    force: 기존 캐시가 있어도 다시 생성
+    Returns: 캐시 디렉터리 경로
+    """
+    cache_dir = cache_dir_for(gtfs_path, cache_root)
+    logger.info(f"피드 캐시 컴파일 시작: {gtfs_path} -> {cache_dir}")
+    gtfs_loader = GTFSLoader(gtfs_path)
+    gtfs_feed = gtfs_loader.get_feed_data()
+    stations_gdf = create_gdf(gtfs_feed)
+    station_metadata = build_station_data(gtfs_feed)
+
+    os.makedirs(cache_root, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix='.compile-', dir=cache_root)
+    try:
+        for name in FEED_TABLES:
+            save_table(getattr(gtfs_feed, name), os.path.join(tmp_dir, 'tables', name))
+        save_stations_gdf(stations_gdf, os.path.join(tmp_dir, 'stations_gdf'))
+        with open(os.path.join(tmp_dir, 'station_metadata.json'), 'w', encoding='utf-8') as f:
+            json.dump(station_metadata, f, ensure_ascii=False)
+
+        foot_paths = build_foot_paths(stations_gdf, radius, walking_speed)
+        _save_foot_paths(foot_paths, _foot_path_dir(tmp_dir, radius, walking_speed))
+        timetable = RaptorTimetable.from_feed(gtfs_feed, stations_gdf, radius, walking_speed,
+                                              foot_paths=foot_paths)
+        timetable.save(os.path.join(tmp_dir, 'timetable'))
+        np.save(os.path.join(tmp_dir, 'stop_coords.npy'), stop_coordinates(gtfs_feed.stops, timetable.stop_ids))
+
+        with open(os.path.join(tmp_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump({
+                'format_version': CACHE_FORMAT_VERSION,
+                'gtfs_path': os.path.abspath(gtfs_path),
+                'feed_hash': feed_hash(gtfs_path),
+                'stops': timetable.n_stops,
+                'routes': timetable.n_routes,
+                'trips': len(timetable.trip_ids),
+            }, f, ensure_ascii=False, indent=2)
+
+        if force and os.path.exists(cache_dir):
+            shutil.rmtree(cache_dir)
+        _publish(tmp_dir, cache_dir)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    logger.info("피드 캐시 컴파일 완료.")
+    return cache_dir
+
+
+def _publish(tmp_dir, target_dir):
+    # 임시 디렉터리를 최종 위치로 이동 (다른 프로세스가 먼저 만들었으면 임시 디렉터리 폐기)
+    try:
+        os.rename(tmp_dir, target_dir)
+    except OSError:
+        if not os.path.exists(target_dir):
+            raise
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _save_foot_paths(foot_paths, directory):
+    tmp_dir = f"{directory}.tmp-{os.getpid()}"
+    os.makedirs(tmp_dir, exist_ok=True)
+    for name, array in zip(FOOT_PATH_ARRAYS, foot_paths):
+        np.save(os.path.join(tmp_dir, f"{name}.npy"), array)
+    _publish(tmp_dir, directory)
+
+
+def _load_foot_paths(cache_dir, stations_gdf, radius, walking_speed, mmap_mode):
+    # 반경/보행속도별 도보 그래프 (캐시에 없으면 생성 후 추가)
+    directory = _foot_path_dir(cache_dir, radius, walking_speed)
+    if not os.path.exists(directory):
+        _save_foot_paths(build_foot_paths(stations_gdf, radius, walking_speed), directory)
+    return tuple(np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode)
+                 for name in FOOT_PATH_ARRAYS)
+
+
+def load_compiled_feed(gtfs_path=GTFS_DATA_PATH, cache_root=FEED_CACHE_DIR,
+                       radius=FOOT_PATH_RADIUS, walking_speed=WALKING_SPEED, mmap_mode='r'):
+    """
+    캐시가 있으면 memory-map으로 불러오고, 없으면 먼저 컴파일
+    """
+    cache_dir = cache_dir_for(gtfs_path, cache_root)
+    if not os.path.exists(os.path.join(cache_dir, 'manifest.json')):
+        compile_feed(gtfs_path, cache_root, radius, walking_speed)
+
+    stations_gdf = load_stations_gdf(os.path.join(cache_dir, 'stations_gdf'))
+    with open(os.path.join(cache_dir, 'station_metadata.json'), encoding='utf-8') as f:
+        station_metadata = json.load(f)
+    foot_paths = _load_foot_paths(cache_dir, stations_gdf, radius, walking_speed, mmap_mode)
+    timetable = RaptorTimetable.load(os.path.join(cache_dir, 'timetable'), foot_paths, mmap_mode=mmap_mode)
+    stop_coords = np.load(os.path.join(cache_dir, 'stop_coords.npy'), mmap_mode=mmap_mode)
+    logger.info(f"피드 캐시 로드: {cache_dir}")
+    return CompiledFeed(CachedFeed(cache_dir), stations_gdf, station_metadata, timetable,
+                        os.path.basename(cache_dir), stop_coords)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="GTFS 피드를 바이너리 캐시로 컴파일")
+    parser.add_argument('gtfs_path', nargs='?', default=GTFS_DATA_PATH)
+    parser.add_argument('--cache-dir', default=FEED_CACHE_DIR)
+    parser.add_argument('--radius', type=float, default=FOOT_PATH_RADIUS)
+    parser.add_argument('--walking-speed', type=float, default=WALKING_SPEED)
+    parser.add_argument('--force', action='store_true', help="캐시가 있어도 다시 컴파일")
+    args = parser.parse_args(argv)
+
+    cache_dir = cache_dir_for(args.gtfs_path, args.cache_dir)
+    if args.force or not os.path.exists(os.path.join(cache_dir, 'manifest.json')):
+        cache_dir = compile_feed(args.gtfs_path, args.cache_dir, args.radius, args.walking_speed,
+                                 force=args.force)
+    else:
+        _load_foot_paths(cache_dir, load_stations_gdf(os.path.join(cache_dir, 'stations_gdf')),
+                         args.radius, args.walking_speed, None)
+    print(cache_dir)
+
+
+if __name__ == '__main__':
+    main()
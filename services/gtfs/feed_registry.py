@@ -0,0 +1,219 @@
+# services/gtfs/feed_registry.py
+# 여러 지역 피드를 한 프로세스에서 제공하는 피드 레지스트리
+# - 피드는 처음 요청될 때 컴파일 캐시를 불러옴 (load_compiled_feed, 캐시가 없으면 컴파일)
+# - 불러온 피드의 추정 메모리 합이 예산을 넘으면 가장 오래 사용되지 않은 피드부터 해제 (LRU)
+# - GTFS 파일이 바뀌면(크기/수정 시각) 새 버전을 불러와 통째로 교체 (처리 중인 요청은 이전 버전을 끝까지 사용)
+# - 실시간 지연은 피드별 백그라운드 스레드에서 갱신 (요청 처리 중에는 파일을 읽지 않음)
+import os
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from config import WALKING_SPEED
+from services.geo.nearest import StopLocator
+from services.gtfs.feed_cache import load_compiled_feed
+from services.gtfs.realtime import RealtimeOverlay, stop_sequence_positions
+from services.gtfs.station_index import StationIndex
+from utils.logging import setup_logging
+
+logger = setup_logging()
+
+
+class UnknownFeed(KeyError):
+    # 설정에 없는 피드 이름
+    pass
+
+
+def _file_stat(path):
+    # 피드 파일 변경 확인용 (크기, 수정 시각)
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+class FeedContext:
+    """
+    피드 1개의 서버 데이터 (컴파일된 피드, 역 목록/검색 색인, 좌표 색인, 실시간 반영)
+    한 번 만든 뒤에는 실시간 반영 외에는 바뀌지 않으며, 새 버전은 새 FeedContext로 교체
+
+    static_snapshot: (시간표, 피드 버전) - 실시간 지연이 반영되지 않은 피드 캐시 시간표
+    static_version: 피드 캐시 버전 (snapshot_for()의 버전이 이와 같으면 정적 시간표)
+    timetable / version: 정적 시간표와 버전 (정류장 색인 등 운행일과 무관한 조회용)
+    """
+
+    def __init__(self, name, path, compiled_feed, file_stat, realtime_path=None):
+        self.name = name
+        self.path = path
+        self.file_stat = file_stat
+        self.feed = compiled_feed.feed
+        self.stations_gdf = compiled_feed.stations_gdf
+        self.station_metadata = compiled_feed.station_metadata
+        self.stop_coords = compiled_feed.stop_coords
+        self.static_snapshot = (compiled_feed.timetable, compiled_feed.version)
+        self.static_version = compiled_feed.version
+        self.station_index = StationIndex(self.station_metadata)  # 압축된 역 목록 응답, 역 이름 검색 색인
+        self.stop_locator = StopLocator(self.stations_gdf, WALKING_SPEED)  # 좌표 -> 가까운 역 공간 색인
+        self.realtime = None
+        if realtime_path:
+            self.realtime = RealtimeOverlay(self.timetable, self.version, realtime_path,
+                                            stop_sequences=stop_sequence_positions(self.feed.stop_times))
+        self.nbytes = self._estimate_nbytes()
+
+    def _estimate_nbytes(self):
+        # 추정 메모리 (시간표/좌표 배열 + 정류장 GeoDataFrame + 역 목록 응답 본문)
+        arrays = [value for value in vars(self.timetable).values() if isinstance(value, np.ndarray)]
+        return (sum(array.nbytes for array in arrays) + self.stop_coords.nbytes
+                + int(self.stations_gdf.memory_usage(deep=True).sum())
+                + len(self.station_index.payload) + len(self.station_index.payload_gzip))
+
+    @property
+    def timetable(self):
+        return self.static_snapshot[0]
+
+    @property
+    def version(self):
+        return self.static_snapshot[1]
+
+    def snapshot_for(self, service_date):
+        """
+        운행일 요청에 쓸 (시간표, 피드 버전)
+        실시간 지연은 반영된 운행일(오늘)의 요청에만 쓰고, 다른 날짜는 정적 시간표 사용.
+        실시간 갱신은 시간표와 버전을 한 번에 교체하므로, 요청은 이 값을 한 번만 읽어
+        새 시간표와 이전 버전(캐시 키)이 섞이지 않게 함
+        """
+        if self.realtime is not None:
+            timetable, version, realtime_date = self.realtime.snapshot
+            if realtime_date == service_date:
+                return timetable, version
+        return self.static_snapshot
+
+    def start_realtime(self):
+        # 실시간 갱신 스레드 시작 (현재 프로세스에서 이미 실행 중이면 무시)
+        if self.realtime is not None:
+            self.realtime.start()
+
+    def close(self):
+        # 교체/해제된 피드의 실시간 갱신 중지 (처리 중인 요청은 마지막 시간표를 계속 사용)
+        if self.realtime is not None:
+            self.realtime.stop()
+
+
+class FeedRegistry:
+    """
+    feeds: {피드 이름: GTFS zip 경로}
+    default: 피드를 지정하지 않은 요청의 피드 이름
+    memory_budget_mb: 불러온 피드 추정 메모리 합 한도 (MB, 넘으면 LRU 해제, 방금 불러온 피드는 남김)
+    check_interval: GTFS 파일 변경 확인 간격 (초)
+    realtime_paths: {피드 이름: GTFS-Realtime 경로} (실시간 반영할 피드만)
+    """
+
+    def __init__(self, feeds, default, memory_budget_mb, check_interval, realtime_paths=None,
+                 loader=load_compiled_feed, clock=time.monotonic):
+        if default not in feeds:
+            raise ValueError(f"기본 피드 {default!r}가 피드 목록에 없습니다.")
+        self.feeds = dict(feeds)
+        self.default = default
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self.check_interval = check_interval
+        self._realtime_paths = dict(realtime_paths or {})
+        self._loader = loader
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._load_locks = {name: threading.Lock() for name in self.feeds}  # 피드별 로드/교체는 한 번에 하나
+        self._loaded = OrderedDict()  # 이름 -> FeedContext (오래 사용되지 않은 순)
+        self._checked = {}  # 이름 -> 마지막 파일 변경 확인 시각
+        self.loads = 0
+        self.swaps = 0
+        self.evictions = 0
+
+    def get(self, name=None):
+        """
+        피드 이름의 FeedContext (None이면 기본 피드)
+        처음 요청이면 불러오고, 파일이 바뀌었으면 새 버전으로 교체 (교체 중 다른 요청은 이전 버전 사용)
+        """
+        name = name or self.default
+        if name not in self.feeds:
+            raise UnknownFeed(name)
+        with self._lock:
+            context = self._loaded.get(name)
+            if context is not None:
+                self._loaded.move_to_end(name)
+
+        if context is None:
+            with self._load_locks[name]:
+                # 같은 피드를 기다리던 요청은 먼저 불러온 결과를 사용
+                with self._lock:
+                    context = self._loaded.get(name)
+                if context is None:
+                    context = self._load(name)
+        elif self._changed(name, context) and self._load_locks[name].acquire(blocking=False):
+            try:
+                context = self._load(name, previous=context)
+            finally:
+                self._load_locks[name].release()
+
+        context.start_realtime()
+        return context
+
+    def _changed(self, name, context):
+        # check_interval마다 피드 파일 크기/수정 시각 비교
+        now = self._clock()
+        with self._lock:
+            if now - self._checked.get(name, now - self.check_interval) < self.check_interval:
+                return False
+            self._checked[name] = now
+        try:
+            return _file_stat(self.feeds[name]) != context.file_stat
+        except OSError:
+            return False
+
+    def _load(self, name, previous=None):
+        path = self.feeds[name]
+        try:
+            file_stat = _file_stat(path)
+            context = FeedContext(name, path, self._loader(path), file_stat, self._realtime_paths.get(name))
+        except Exception:
+            if previous is None:
+                raise
+            # 새 버전을 불러오지 못하면 이전 버전을 계속 사용
+            logger.exception(f"피드 {name} 새 버전 로드 실패, 이전 버전 {previous.version} 유지")
+            return previous
+
+        closed = [previous] if previous is not None else []
+        with self._lock:
+            self._loaded[name] = context
+            self._loaded.move_to_end(name)
+            self._checked[name] = self._clock()
+            self.loads += 1
+            if previous is not None:
+                self.swaps += 1
+            total = sum(loaded.nbytes for loaded in self._loaded.values())
+            while total > self.memory_budget and len(self._loaded) > 1:
+                evicted_name, evicted = self._loaded.popitem(last=False)
+                total -= evicted.nbytes
+                self.evictions += 1
+                closed.append(evicted)
+                logger.info(f"피드 {evicted_name} 해제 (메모리 예산 초과)")
+        for closed_context in closed:
+            closed_context.close()
+        if previous is not None:
+            logger.info(f"피드 {name} 교체: {previous.version} -> {context.version}")
+        else:
+            logger.info(f"피드 {name} 로드: {context.version} ({context.nbytes / 1e6:.1f}MB)")
+        return context
+
+    def loaded(self):
+        # 불러온 피드 목록 (오래 사용되지 않은 순)
+        with self._lock:
+            return list(self._loaded.values())
+
+    def stats(self):
+        with self._lock:
+            return {
+                'feeds': len(self.feeds),
+                'loaded': len(self._loaded),
+                'loaded_bytes': sum(context.nbytes for context in self._loaded.values()),
+                'memory_budget_bytes': self.memory_budget,
+                'loads': self.loads,
+                'swaps': self.swaps,
+                'evictions': self.evictions,
+            }
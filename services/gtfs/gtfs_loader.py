@@ -1,8 +1,24 @@
 # services/gtfs/gtfs_loader.py
 import partridge as ptg
 import datetime
+import numpy as np
 import pandas as pd
+from partridge.config import default_config
 from config import GTFS_DATA_PATH
+from utils.logging import setup_logging
+
+logger = setup_logging()
+
+TIME_COLUMNS = ('arrival_time', 'departure_time')
+MISSING_TIME = -1  # 빈 시각 (보간 대상) 표시값
+# 정수 코드로 바꿀 ID 컬럼과 그 컬럼이 있는 테이블 (같은 ID는 테이블이 달라도 같은 코드)
+ID_COLUMNS = {
+    'stop_id': ('stops', 'stop_times'),
+    'trip_id': ('trips', 'stop_times'),
+    'route_id': ('routes', 'trips'),
+    'service_id': ('trips', 'calendar', 'calendar_dates'),
+}
+FEED_TABLE_NAMES = ('stops', 'routes', 'trips', 'stop_times', 'calendar', 'calendar_dates')
 
 # 시간 문자열을 초로 변환 (HH:MM 또는 HH:MM:SS)
 def time_to_seconds(time_str):
@@ -15,6 +31,39 @@ def time_to_seconds(time_str):
         return h * 3600 + m * 60 + s
     raise ValueError("Time must be in HH:MM or HH:MM:SS format")
 
+# GTFS 시각 문자열 배열을 int32 초 배열로 일괄 변환 (HH:MM 또는 HH:MM:SS, 24시 이후 허용)
+# 빈 값은 MISSING_TIME으로 표시. 시각 종류는 행 수보다 훨씬 적으므로 고유값만 분해한 뒤 펼침
+def parse_gtfs_times(values):
+    codes, uniques = pd.factorize(pd.Series(values, copy=False))
+    uniques = pd.Series(uniques, dtype=object).astype(str).str.strip()
+    blank = uniques == ''
+    invalid = ~blank & ~uniques.str.fullmatch(r'\d+:\d{1,2}(:\d{1,2})?')
+    if invalid.any():
+        raise ValueError(f"Time must be in HH:MM or HH:MM:SS format: {uniques[invalid].iloc[0]!r}")
+
+    # 마지막 칸은 결측값(NaN) 자리 (factorize는 결측값에 -1 코드를 부여)
+    unique_secs = np.full(len(uniques) + 1, MISSING_TIME, dtype=np.int32)
+    if (~blank).any():
+        parts = uniques[~blank].str.split(':', expand=True).reindex(columns=range(3)).fillna('0').astype(np.int32)
+        unique_secs[:-1][~blank.to_numpy()] = (parts[0] * 3600 + parts[1] * 60 + parts[2]).to_numpy()
+    return unique_secs[codes]
+
+# int 초 배열을 "HH:MM:SS" 문자열 Series로 일괄 변환 (MISSING_TIME은 빈 문자열)
+def format_gtfs_times(seconds):
+    seconds = pd.Series(seconds, copy=False)
+    missing = seconds == MISSING_TIME
+    hh = (seconds // 3600).astype(str).str.zfill(2)
+    mm = (seconds // 60 % 60).astype(str).str.zfill(2)
+    ss = (seconds % 60).astype(str).str.zfill(2)
+    return (hh + ':' + mm + ':' + ss).mask(missing, '')
+
+# stop_times 테이블의 시각 컬럼을 검증 후 "HH:MM:SS" 형식으로 정규화 (필터링 스크립트용)
+def normalize_gtfs_times(stop_times):
+    stop_times = stop_times.copy()
+    for col in TIME_COLUMNS:
+        stop_times[col] = format_gtfs_times(parse_gtfs_times(stop_times[col])).to_numpy()
+    return stop_times
+
 # 초를 "HH:MM" 형식의 문자열로 변환
 def secs_to_hhmm(seconds):
     return (datetime.datetime(2000, 1, 1) + datetime.timedelta(seconds=seconds)).strftime("%H:%M")
@@ -26,44 +75,155 @@ class GTFSLoader:
 
     def load_feed(self):
         # GTFS 데이터 로드 및 시간값(초) 변환
-        busiest_date, service_ids = ptg.read_busiest_date(self.gtfs_path)
-        view = {'trips.txt': {'service_id': service_ids}}
-        self.feed_data = ptg.load_feed(self.gtfs_path, view)
+        # 모든 service_id의 trip을 읽음 (날짜별 운행 여부는 RaptorTimetable의 운행 달력 비트열로 구분)
+        self.feed_data = ptg.load_feed(self.gtfs_path, config=self._raw_time_config())
         self._convert_times()
+        intern_ids(self.feed_data)
+        narrow_columns(self.feed_data)
+        logger.info("테이블 메모리: " + ", ".join(
+            f"{name} {size / 1e6:.1f}MB" for name, size in memory_report(self.feed_data).items()))
+
+    @staticmethod
+    def _raw_time_config():
+        # partridge의 행 단위 시각 변환을 끄고 문자열 그대로 읽음 (_convert_times에서 일괄 변환)
+        config = default_config()
+        converters = config.nodes['stop_times.txt']['converters']
+        for col in TIME_COLUMNS:
+            converters.pop(col, None)
+        return config
 
     def _convert_times(self):
-        # GTFS 테이블의 시간 데이터를 초 단위로 변환
-        for col in ['departure_time', 'arrival_time']:
-            if self.feed_data.stop_times[col].dtype == object:
-                self.feed_data.stop_times[col] = self.feed_data.stop_times[col].apply(time_to_seconds)
+        # GTFS 테이블의 시간 데이터를 int32 초 단위로 일괄 변환
+        stop_times = self.feed_data.stop_times
+        for col in TIME_COLUMNS:
+            if pd.api.types.is_numeric_dtype(stop_times[col]):
+                stop_times[col] = stop_times[col].fillna(MISSING_TIME).to_numpy(dtype=np.int32)
+            else:
+                stop_times[col] = parse_gtfs_times(stop_times[col])
+        self._interpolate_missing_times()
+
+    def _interpolate_missing_times(self):
+        """
+        빈 시각 처리
+        - 도착/출발 중 하나만 비어 있으면 다른 값으로 채움
+        - 둘 다 비어 있으면 같은 trip 안의 앞뒤 시각으로 정류장 순번 기준 선형 보간
+        - 보간할 수 없는 행(trip 첫/마지막 정류장 시각 누락)은 제외
+        """
+        stop_times = self.feed_data.stop_times
+        arr = stop_times['arrival_time'].to_numpy()
+        dep = stop_times['departure_time'].to_numpy()
+        if not ((arr == MISSING_TIME) | (dep == MISSING_TIME)).any():
+            return
+
+        stop_times = stop_times.sort_values(['trip_id', 'stop_sequence'], kind='stable').reset_index(drop=True)
+        arr = stop_times['arrival_time'].to_numpy().copy()
+        dep = stop_times['departure_time'].to_numpy().copy()
+        arr = np.where(arr == MISSING_TIME, dep, arr)
+        dep = np.where(dep == MISSING_TIME, arr, dep)
+
+        known = arr != MISSING_TIME
+        trip_codes = pd.factorize(stop_times['trip_id'])[0]
+        positions = np.arange(len(arr))
+        prev_known = np.maximum.accumulate(np.where(known, positions, -1))
+        next_known = np.minimum.accumulate(np.where(known, positions, len(arr))[::-1])[::-1]
+        missing = np.flatnonzero(~known)
+        prev_pos, next_pos = prev_known[missing], next_known[missing]
+        ok = (prev_pos >= 0) & (next_pos < len(arr))
+        ok[ok] &= (trip_codes[prev_pos[ok]] == trip_codes[missing[ok]]) & (trip_codes[next_pos[ok]] == trip_codes[missing[ok]])
+
+        rows, prev_pos, next_pos = missing[ok], prev_pos[ok], next_pos[ok]
+        ratio = (rows - prev_pos) / (next_pos - prev_pos)
+        interpolated = (dep[prev_pos] + ratio * (arr[next_pos] - dep[prev_pos])).astype(np.int32)
+        arr[rows] = interpolated
+        dep[rows] = interpolated
+        stop_times['arrival_time'] = arr
+        stop_times['departure_time'] = dep
+
+        dropped = missing[~ok]
+        if len(dropped):
+            logger.warning(f"보간할 수 없는 시각 {len(dropped)}건 제외")
+            stop_times = stop_times.drop(index=dropped).reset_index(drop=True)
+        logger.info(f"빈 시각 {len(rows)}건 보간")
+        self.feed_data.stop_times = stop_times
 
     def get_feed_data(self):
         if self.feed_data is None:
             self.load_feed()
         return self.feed_data
 
+def _feed_tables(feed_data):
+    # 피드에 있는 테이블 {이름: DataFrame}
+    return {name: getattr(feed_data, name) for name in FEED_TABLE_NAMES
+            if isinstance(getattr(feed_data, name, None), pd.DataFrame)}
+
+def intern_ids(feed_data):
+    """
+    ID 컬럼(ID_COLUMNS)을 정렬된 ID 목록을 범주로 하는 Categorical로 변환 (테이블 컬럼을 그 자리에서 교체)
+    행마다 문자열 대신 정수 코드(ID 수에 맞는 가장 작은 정수형)만 저장하고, 같은 ID는 모든 테이블에서 같은 코드.
+    코드 -> ID: column.cat.categories[code], ID -> 코드: column.cat.categories.get_indexer(ids)
+    범주가 정렬되어 있으므로 정렬/비교 결과는 문자열 컬럼과 같음
+    """
+    tables = _feed_tables(feed_data)
+    for column, table_names in ID_COLUMNS.items():
+        present = [name for name in table_names if name in tables and column in tables[name]]
+        if not present:
+            continue
+        ids = pd.unique(pd.concat([tables[name][column].dropna().astype(str) for name in present]))
+        dtype = pd.CategoricalDtype(np.sort(np.asarray(ids, dtype=object)))
+        for name in present:
+            tables[name][column] = tables[name][column].astype(str).astype(dtype)
+
+def narrow_columns(feed_data):
+    """
+    ID 외 컬럼을 작은 자료형으로 변환
+    - 정수 컬럼: 값 범위에 맞는 가장 작은 정수형 (시각 컬럼은 연산 중 넘침 방지를 위해 int32 유지)
+    - 고유값이 적은 문자열 컬럼 (pickup/drop_off_type 같은 코드값): Categorical
+    """
+    for name, table in _feed_tables(feed_data).items():
+        for column in table.columns:
+            values = table[column]
+            if column in TIME_COLUMNS or isinstance(values.dtype, pd.CategoricalDtype):
+                continue
+            if pd.api.types.is_integer_dtype(values):
+                table[column] = pd.to_numeric(values, downcast='integer')
+            elif pd.api.types.is_string_dtype(values) and values.nunique() * 2 < len(values):
+                table[column] = values.astype('category')
+
+def memory_report(feed_data):
+    # 테이블별 메모리 사용량 (바이트, 문자열 포함)
+    return {name: int(table.memory_usage(deep=True).sum()) for name, table in _feed_tables(feed_data).items()}
+
 def build_station_data(feed_data):
-    # GTFS 테이블을 병합하여 정류장 메타데이터 생성 (시각화용)
-    df_stops = feed_data.stops[['stop_id', 'stop_name']]
-    df_trips = feed_data.trips[['trip_id', 'route_id']]
-    df_routes = feed_data.routes[['route_id', 'route_short_name', 'agency_id']]
-    df_stop_times = feed_data.stop_times[['stop_id', 'trip_id']]
-
-    merged_df = pd.merge(df_stop_times, df_trips, on='trip_id', how='left')
-    merged_df = pd.merge(merged_df, df_routes, on='route_id', how='left')
-    merged_df = pd.merge(merged_df, df_stops, on='stop_id', how='left')
-
-    grouped = merged_df.groupby('stop_id', as_index=False).first()
-    station_data = []
-    for _, row in grouped.iterrows():
-        station_data.append({
-            'stop_id': row['stop_id'],
-            'stop_name': row['stop_name'] if pd.notna(row['stop_name']) else 'Unknown',
-            'operator': row['agency_id'] if pd.notna(row['agency_id']) else 'Unknown',
-            'line': row['route_short_name'] if pd.notna(row['route_short_name']) else 'Unknown',
-            'line_info': f"{row['route_short_name']}" if pd.notna(row['route_short_name']) else ''
-        })
-    return station_data
+    # GTFS 테이블로 정류장 메타데이터 생성 (시각화용)
+    # stop_times 전체를 병합하지 않고 trip -> route_id를 매핑한 뒤 (정류장, 노선) 쌍으로 줄여서 그룹화
+    # (정류장별 stop_times 순서상 첫 값, 기존 병합 + groupby.first()와 같은 결과)
+    stop_codes, stop_ids = pd.factorize(feed_data.stop_times['stop_id'])
+    route_codes, route_ids = pd.factorize(
+        feed_data.stop_times['trip_id'].map(feed_data.trips.set_index('trip_id')['route_id']))
+    pair_codes = stop_codes.astype(np.int64) * (len(route_ids) + 1) + route_codes + 1  # route 없음(-1) 포함
+    _, first_rows = np.unique(pair_codes, return_index=True)
+    first_rows.sort()
+    stop_routes = pd.DataFrame({
+        'stop_id': np.asarray(stop_ids)[stop_codes[first_rows]],
+        'route_id': pd.Series(np.asarray(route_ids, dtype=object)).reindex(route_codes[first_rows]).to_numpy(),
+    })
+
+    routes = feed_data.routes.set_index('route_id')
+    stop_routes['line'] = stop_routes['route_id'].map(routes['route_short_name'])
+    stop_routes['operator'] = stop_routes['route_id'].map(routes['agency_id'])
+    stop_routes['stop_name'] = stop_routes['stop_id'].map(feed_data.stops.set_index('stop_id')['stop_name'])
+
+    grouped = stop_routes.groupby('stop_id')[['stop_name', 'operator', 'line']].first()
+    line_info = grouped['line'].fillna('')
+    grouped = grouped.fillna('Unknown')
+    return [{
+        'stop_id': stop_id,
+        'stop_name': stop_name,
+        'operator': operator,
+        'line': line,
+        'line_info': info,
+    } for stop_id, stop_name, operator, line, info in zip(grouped.index, grouped['stop_name'], grouped['operator'],
+                                                           grouped['line'], line_info)]
 
 def create_gdf(feed_data):
     """
@@ -0,0 +1,351 @@
+# services/gtfs/realtime.py
+# GTFS-Realtime TripUpdates 지연 반영
+# 로컬 파일 또는 디렉터리의 TripUpdates protobuf를 백그라운드 스레드에서 주기적으로 읽어, 컴파일된 시간표의
+# 해당 trip 도착/출발 시각만 고친 새 시간표와 피드 버전을 만듦 (GTFS zip 재파싱/시간표 재생성 없음).
+# 바뀐 노선의 시각 행렬만 새로 만들고 나머지 배열은 정적 시간표와 공유 (RaptorTimetable.with_route_times).
+# 매 갱신은 정적 시간표 기준으로 다시 적용하므로(FULL_DATASET), 지연이 사라진 trip은 자동으로 원래 시각으로 돌아감.
+#
+# - 지연은 오늘(운행 시간대 기준) 운행일에만 반영: start_date가 다른 날인 TripUpdate는 제외하고(start_date가 없으면
+#   오늘 운행으로 봄), 다른 날짜의 요청은 정적 시간표를 사용 (FeedContext.snapshot_for)
+# - StopTimeUpdate는 stop_id(없으면 stop_sequence)로 정류장 위치를 찾고, 지연(delay) 또는 절대 시각(time)을 반영.
+#   갱신이 없는 다음 정류장에는 직전 지연을 그대로 전파 (GTFS-RT 규약)
+# - 운행 취소(CANCELED) trip은 탑승 불가 처리 (trip 순서는 그대로 두고 canceled_trips로 표시)
+# - 지연으로 같은 노선의 앞뒤 trip을 추월하게 된 trip도 탑승 불가 처리 (노선 내 trip 순서가 모든 정류장의 시각 순서와
+#   같아야 이진 탐색이 가능하므로, 시각을 임의로 맞추지 않고 제외한 뒤 통계/로그로 알림)
+# - SKIPPED 정류장, 추가(ADDED) trip은 노선 구조를 바꿔야 하므로 반영하지 않음
+#
+# 사용법: python -m services.gtfs.realtime PATH [gtfs_path]
+import argparse
+import datetime
+import hashlib
+import os
+import threading
+import time
+import zoneinfo
+import numpy as np
+from google.transit import gtfs_realtime_pb2
+from config import GTFS_DATA_PATH, REALTIME_POLL_INTERVAL, SERVICE_TIMEZONE
+from services.raptor.router import INF_TIME
+from utils.logging import setup_logging
+
+logger = setup_logging()
+
+REALTIME_FILE_SUFFIXES = ('.pb', '.pbf', '.bin')
+TripDescriptor = gtfs_realtime_pb2.TripDescriptor
+StopTimeUpdate = gtfs_realtime_pb2.TripUpdate.StopTimeUpdate
+
+
+def realtime_files(path):
+    # 파일이면 그대로, 디렉터리면 안의 protobuf 파일 목록 (이름순)
+    if os.path.isdir(path):
+        return sorted(os.path.join(path, name) for name in os.listdir(path)
+                      if name.endswith(REALTIME_FILE_SUFFIXES))
+    return [path] if os.path.exists(path) else []
+
+
+def source_signature(path):
+    # 파일 이름/수정 시각/크기 (바뀌었을 때만 다시 읽음, 같은 파일을 보는 워커끼리 같은 값)
+    signature = []
+    for file_path in realtime_files(path):
+        stat = os.stat(file_path)
+        signature.append((os.path.basename(file_path), stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def read_feed_messages(path):
+    # FeedMessage 목록 (헤더 timestamp순, 같은 trip은 나중 메시지가 우선)
+    messages = []
+    for file_path in realtime_files(path):
+        message = gtfs_realtime_pb2.FeedMessage()
+        with open(file_path, 'rb') as f:
+            message.ParseFromString(f.read())
+        messages.append(message)
+    return sorted(messages, key=lambda message: message.header.timestamp)
+
+
+def _service_day_start(day, tz):
+    # 운행일 기준 시각 (GTFS 규약: 운행일 정오 - 12시간, 현지 시간대)
+    noon = datetime.datetime(day.year, day.month, day.day, 12, tzinfo=tz)
+    return int(noon.timestamp()) - 12 * 3600
+
+
+def _overtaking_trips(arr_matrix, dep_matrix, updated, deviation, dropped):
+    """
+    노선의 탑승 가능한 trip을 순서대로 보아 어느 정류장에서든 앞 trip보다 먼저 도착/출발하는 쌍이 있으면,
+    그 쌍에서 실시간 갱신된 trip(둘 다 갱신되었으면 계획 대비 시각 변화가 더 큰 trip)을 제외 (추월이 없어질 때까지)
+    updated: trip별 실시간 갱신 여부, deviation: trip별 계획 대비 최대 시각 변화(초)
+    dropped: 제외할 trip (bool 배열, 제자리 갱신)
+    Returns: 새로 제외한 trip 순번 배열
+    """
+    overtaking = []
+    while True:
+        rows = np.flatnonzero(~dropped)
+        earlier, later = rows[:-1], rows[1:]
+        pairs = np.flatnonzero(((arr_matrix[later] < arr_matrix[earlier])
+                                | (dep_matrix[later] < dep_matrix[earlier])).any(axis=1)
+                               & (updated[earlier] | updated[later]))
+        if not len(pairs):
+            return np.array(sorted(overtaking), dtype=np.int64)
+        earlier, later = earlier[pairs], later[pairs]
+        drop_earlier = updated[earlier] & (~updated[later] | (deviation[earlier] >= deviation[later]))
+        culprits = np.unique(np.where(drop_earlier, earlier, later))
+        dropped[culprits] = True
+        overtaking.extend(culprits.tolist())
+
+
+def _fill_dropped(arr_matrix, dep_matrix, dropped):
+    # 탑승 불가 trip의 시각을 바로 앞(없으면 바로 뒤) 탑승 가능 trip 시각으로 채워 trip 순서대로 시각이 줄지 않게 함
+    kept = np.flatnonzero(~dropped)
+    if not len(kept) or not dropped.any():
+        return
+    source = np.maximum.accumulate(np.where(dropped, -1, np.arange(len(dropped))))
+    source[source < 0] = kept[0]
+    arr_matrix[:] = arr_matrix[source]
+    dep_matrix[:] = dep_matrix[source]
+
+
+def _event_secs(event, scheduled, day_start):
+    # StopTimeEvent를 운행일 기준 초로 변환 (절대 시각 우선, 없으면 계획 시각 + 지연)
+    if event.HasField('time'):
+        return int(event.time) - day_start
+    return int(scheduled) + int(event.delay)
+
+
+class RealtimeOverlay:
+    """
+    정적 시간표 위에 TripUpdates 지연을 덧씌운 시간표 관리
+
+    snapshot: (시간표, 피드 버전, 운행일) - 지연을 반영한 운행일과 그 시간표/버전 (실시간 정보가 없으면 정적 시간표/버전)
+    start(): poll_interval 초마다 refresh()를 호출하는 백그라운드 스레드 시작 (요청 처리와 무관하게 갱신)
+    refresh(): 원본 파일이나 운행일이 바뀌었으면 다시 읽어 시간표 교체
+    stop_sequences: {trip_id: {stop_sequence: 노선 내 위치}} (stop_id 없이 stop_sequence만 주는 피드용, 생략 가능)
+    today: 오늘 운행일을 돌려주는 함수 (생략하면 운행 시간대 기준 현재 날짜)
+    """
+
+    def __init__(self, base_timetable, base_version, path, timezone=SERVICE_TIMEZONE,
+                 poll_interval=REALTIME_POLL_INTERVAL, stop_sequences=None, today=None):
+        self.base_timetable = base_timetable
+        self.base_version = base_version
+        self.path = path
+        self.tz = zoneinfo.ZoneInfo(timezone)
+        self.poll_interval = poll_interval
+        self.stop_sequences = stop_sequences or {}
+        self._today = today or (lambda: datetime.datetime.now(self.tz).date())
+        self._lock = threading.Lock()
+        self._signature = ()
+        self._thread = None
+        self._thread_pid = None
+        self._stopped = threading.Event()
+        # (시간표, 피드 버전, 운행일) - 함께 바뀌어야 하므로 한 번에 교체하고 읽는 쪽도 한 번에 읽음
+        self.snapshot = (base_timetable, base_version, None)
+        self.stats = {'updates': 0, 'trips_patched': 0, 'trips_canceled': 0, 'trips_unmatched': 0,
+                      'trips_other_day': 0, 'trips_overtaking': 0, 'routes_patched': 0}
+
+        # trip_id -> (노선, 노선 내 trip 순서)
+        n_route_trips = np.diff(base_timetable.route_trip_offsets)
+        trip_routes = np.repeat(np.arange(base_timetable.n_routes), n_route_trips)
+        trip_rows = np.arange(len(base_timetable.trip_ids)) - base_timetable.route_trip_offsets[:-1][trip_routes]
+        self._trip_index = dict(zip(base_timetable.trip_ids.tolist(), zip(trip_routes.tolist(), trip_rows.tolist())))
+
+    def start(self):
+        # 백그라운드 갱신 스레드 시작 (이미 실행 중이면 무시, fork된 프로세스에서는 새로 시작)
+        with self._lock:
+            if self._thread is not None and self._thread_pid == os.getpid() and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._poll, name='realtime-overlay', daemon=True)
+            self._thread_pid = os.getpid()
+            self._thread.start()
+
+    def stop(self):
+        # 갱신 스레드 종료 요청 (피드 교체/해제 시, 마지막 snapshot은 그대로 유지)
+        self._stopped.set()
+
+    def _poll(self):
+        while not self._stopped.is_set():
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception(f"실시간 지연 반영 실패 ({self.path}), 이전 시간표 유지")
+            self._stopped.wait(self.poll_interval)
+
+    def refresh(self):
+        """
+        실시간 파일이나 오늘 운행일이 바뀌었으면 지연을 다시 반영
+        Returns: 시간표가 교체되었으면 True
+        """
+        with self._lock:
+            service_date = self._today()
+            signature = source_signature(self.path)
+            if signature == self._signature and service_date == self.snapshot[2]:
+                return False
+            start = time.perf_counter()
+            trip_times, stats = self.trip_times(read_feed_messages(self.path), service_date)
+            route_times, canceled_trips, stats['trips_overtaking'] = self._route_times(trip_times)
+            stats['routes_patched'] = len(route_times)
+            stats['updates'] = self.stats['updates'] + 1
+            timetable, version = self.base_timetable, self.base_version
+            if route_times:
+                timetable = self.base_timetable.with_route_times(route_times, canceled_trips)
+            if signature:
+                digest = hashlib.sha256(repr((signature, service_date)).encode()).hexdigest()[:8]
+                version = f"{self.base_version}-rt{digest}"
+            self.snapshot = (timetable, version, service_date)
+            self._signature = signature
+            self.stats = stats
+            logger.info(f"실시간 지연 반영 ({service_date}): trip {stats['trips_patched']}개"
+                        f"(취소 {stats['trips_canceled']}개, 추월 제외 {stats['trips_overtaking']}개), "
+                        f"노선 {stats['routes_patched']}개, 미일치 trip {stats['trips_unmatched']}개, "
+                        f"다른 운행일 trip {stats['trips_other_day']}개, 소요: {time.perf_counter() - start:.3f}초")
+            return True
+
+    def trip_times(self, messages, service_date):
+        """
+        service_date 운행일의 TripUpdates를 trip별 (도착 배열, 출발 배열)로 변환 (취소는 None)
+        Returns: ({trip_id: (arr, dep) 또는 None}, 통계)
+        """
+        tt = self.base_timetable
+        trip_times = {}
+        stats = {'trips_patched': 0, 'trips_canceled': 0, 'trips_unmatched': 0, 'trips_other_day': 0}
+        day_start = _service_day_start(service_date, self.tz)
+        for message in messages:
+            for entity in message.entity:
+                if entity.is_deleted or not entity.HasField('trip_update'):
+                    continue
+                update = entity.trip_update
+                trip_id = update.trip.trip_id
+                if trip_id not in self._trip_index:
+                    stats['trips_unmatched'] += 1
+                    continue
+                if update.trip.start_date and update.trip.start_date != service_date.strftime('%Y%m%d'):
+                    stats['trips_other_day'] += 1
+                    continue
+                if update.trip.schedule_relationship == TripDescriptor.CANCELED:
+                    trip_times[trip_id] = None
+                    continue
+                route, row = self._trip_index[trip_id]
+                arr_matrix, dep_matrix = tt.route_times(route)
+                trip_times[trip_id] = self._apply_stop_updates(
+                    trip_id, tt.route_stop_slice(route), arr_matrix[row], dep_matrix[row], update, day_start)
+        stats['trips_canceled'] = sum(1 for times in trip_times.values() if times is None)
+        stats['trips_patched'] = len(trip_times)
+        return trip_times, stats
+
+    def _apply_stop_updates(self, trip_id, stops, scheduled_arr, scheduled_dep, update, day_start):
+        # 정류장 위치별 갱신을 찾아 계획 시각에 반영하고, 갱신 없는 다음 정류장에는 직전 지연을 전파
+        updates = {}
+        for stop_update in update.stop_time_update:
+            if stop_update.schedule_relationship != StopTimeUpdate.SCHEDULED:
+                continue
+            position = self._stop_position(trip_id, stops, stop_update)
+            if position is not None:
+                updates[position] = stop_update
+        arr = scheduled_arr.astype(np.int64)
+        dep = scheduled_dep.astype(np.int64)
+        delay = None
+        for position in range(len(stops)):
+            stop_update = updates.get(position)
+            if stop_update is not None:
+                arrival = departure = None
+                if stop_update.HasField('arrival'):
+                    arrival = _event_secs(stop_update.arrival, arr[position], day_start)
+                if stop_update.HasField('departure'):
+                    departure = _event_secs(stop_update.departure, dep[position], day_start)
+                if arrival is None and departure is None:
+                    continue
+                if arrival is None:
+                    arrival = arr[position] + (departure - dep[position])
+                if departure is None:
+                    departure = dep[position] + (arrival - arr[position])
+                # 절대 시각이 운행일 기준 전날로 계산되면 (start_date 없는 24시 이후 운행) 하루를 더함
+                if departure < dep[position] - 12 * 3600:
+                    arrival, departure = arrival + 86400, departure + 86400
+                arr[position], dep[position] = arrival, max(departure, arrival)
+                delay = dep[position] - scheduled_dep[position]
+            elif delay is not None:
+                arr[position] += delay
+                dep[position] += delay
+        return arr, dep
+
+    def _stop_position(self, trip_id, stops, stop_update):
+        # StopTimeUpdate의 노선 내 정류장 위치 (stop_id 우선, 없으면 stop_sequence)
+        if stop_update.stop_id:
+            stop_idx = self.base_timetable.stop_index.get(stop_update.stop_id)
+            matches = np.flatnonzero(stops == stop_idx) if stop_idx is not None else ()
+            return int(matches[0]) if len(matches) else None
+        if stop_update.HasField('stop_sequence'):
+            return self.stop_sequences.get(trip_id, {}).get(stop_update.stop_sequence)
+        return None
+
+    def _route_times(self, trip_times):
+        """
+        영향받은 노선별 trip 시각 행렬 (trip 순서는 정적 시간표와 같음)
+        운행 취소 trip과 추월하게 된 trip은 탑승 불가로 표시하고 시각은 앞뒤 trip 시각으로 채움
+        Returns: ({노선: (도착 행렬, 출발 행렬)}, trip별 탑승 불가 여부, 추월로 제외한 trip 수)
+        """
+        tt = self.base_timetable
+        canceled_trips = np.zeros(len(tt.trip_ids), dtype=bool)
+        by_route = {}
+        for trip_id, times in trip_times.items():
+            route, row = self._trip_index[trip_id]
+            by_route.setdefault(route, []).append((row, times))
+
+        route_times = {}
+        overtaking = []
+        for route, updates in by_route.items():
+            static_arr, static_dep = tt.route_times(route)
+            arr_matrix, dep_matrix = static_arr.astype(np.int64), static_dep.astype(np.int64)
+            trip_start = tt.route_trip_offsets[route]
+            dropped = canceled_trips[trip_start:trip_start + len(dep_matrix)]  # 노선 구간 뷰
+            updated = np.zeros(len(dep_matrix), dtype=bool)
+            for row, times in updates:
+                if times is None:
+                    dropped[row] = True
+                else:
+                    arr_matrix[row], dep_matrix[row] = times
+                    updated[row] = True
+            deviation = np.maximum(np.abs(arr_matrix - static_arr), np.abs(dep_matrix - static_dep)).max(axis=1)
+            rows = _overtaking_trips(arr_matrix, dep_matrix, updated, deviation, dropped)
+            overtaking.extend(tt.trip_ids[trip_start + rows].tolist())
+            _fill_dropped(arr_matrix, dep_matrix, dropped)
+            route_times[route] = (np.minimum(arr_matrix, INF_TIME).astype(tt.arrival_times.dtype),
+                                  np.minimum(dep_matrix, INF_TIME).astype(tt.departure_times.dtype))
+        if overtaking:
+            logger.warning(f"실시간 지연으로 같은 노선의 trip을 추월하여 탑승 불가 처리: {overtaking[:10]}"
+                           + (f" 외 {len(overtaking) - 10}개" if len(overtaking) > 10 else ""))
+        return route_times, canceled_trips, len(overtaking)
+
+
+def stop_sequence_positions(stop_times):
+    """
+    stop_times 테이블로 {trip_id: {stop_sequence: 노선 내 위치}} 생성 (stop_id 없는 StopTimeUpdate 대응)
+    """
+    ordered = stop_times.sort_values(['trip_id', 'stop_sequence'])
+    positions = ordered.groupby('trip_id').cumcount().to_numpy()
+    lookup = {}
+    for trip_id, sequence, position in zip(ordered['trip_id'].tolist(), ordered['stop_sequence'].tolist(),
+                                           positions.tolist()):
+        lookup.setdefault(trip_id, {})[int(sequence)] = position
+    return lookup
+
+
+def main(argv=None):
+    # 실시간 파일을 컴파일된 피드에 적용해 보고 반영 결과 출력 (피드 점검용)
+    from services.gtfs.feed_cache import load_compiled_feed
+
+    parser = argparse.ArgumentParser(description="GTFS-Realtime TripUpdates 반영 결과 확인")
+    parser.add_argument('path', help="TripUpdates protobuf 파일 또는 디렉터리")
+    parser.add_argument('gtfs_path', nargs='?', default=GTFS_DATA_PATH)
+    args = parser.parse_args(argv)
+
+    compiled_feed = load_compiled_feed(args.gtfs_path)
+    overlay = RealtimeOverlay(compiled_feed.timetable, compiled_feed.version, args.path,
+                              stop_sequences=stop_sequence_positions(compiled_feed.feed.stop_times))
+    overlay.refresh()
+    print(overlay.snapshot[1], overlay.snapshot[2])
+    for name, value in overlay.stats.items():
+        print(f"{name}: {value}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+# services/gtfs/service_calendar.py
+# GTFS 운행 달력 (calendar.txt + calendar_dates.txt)
+# service_id별 운행일을 달력 시작일부터의 날짜 비트열(1일 1비트)로 압축 보관하여
+# 한 시간표로 모든 날짜의 질의를 처리 (날짜마다 피드를 다시 읽지 않음).
+import datetime
+import json
+import os
+import numpy as np
+import pandas as pd
+
+WEEKDAY_COLUMNS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+# calendar_dates.txt exception_type
+SERVICE_ADDED = 1
+SERVICE_REMOVED = 2
+
+
+def _as_date(value):
+    # partridge는 날짜를 datetime.date로 변환하지만, 문자열(YYYYMMDD)로 남은 경우도 처리
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.datetime.strptime(str(value), '%Y%m%d').date()
+
+
+def parse_service_date(value):
+    # "YYYY-MM-DD" 또는 "YYYYMMDD" 문자열을 날짜로 변환
+    value = value.strip()
+    return datetime.datetime.strptime(value, '%Y-%m-%d' if '-' in value else '%Y%m%d').date()
+
+
+class ServiceCalendar:
+    """
+    service_id별 운행일 비트열
+
+    start_date: 달력 첫날 (비트 0)
+    service_ids: service_id 배열 (trip의 service 번호 = 이 배열의 인덱스)
+    day_bits: (service 수 x ceil(일수 / 8)) uint8, 날짜 d의 운행 여부는 (d - start_date)일째 비트 (little-endian)
+    """
+
+    def __init__(self, start_date, service_ids, day_bits):
+        self.start_date = start_date
+        self.service_ids = np.asarray(service_ids)
+        self.service_index = {sid: i for i, sid in enumerate(self.service_ids.tolist())}
+        self.day_bits = np.asarray(day_bits)
+
+    @property
+    def n_days(self):
+        return self.day_bits.shape[1] * 8
+
+    def active_services(self, date):
+        # 날짜에 운행하는 service 여부 (bool 배열, 달력 범위 밖이면 모두 False)
+        day = (date - self.start_date).days
+        if not 0 <= day < self.n_days:
+            return np.zeros(len(self.service_ids), dtype=bool)
+        return ((self.day_bits[:, day >> 3] >> (day & 7)) & 1).astype(bool)
+
+    @classmethod
+    def from_feed(cls, feed_data):
+        """
+        feed_data: partridge feed (calendar, calendar_dates, trips 테이블)
+        trip에는 있지만 달력에 없는 service_id는 운행일 없음으로 포함
+        Returns: ServiceCalendar (calendar.txt/calendar_dates.txt 모두 없으면 None = 날짜 구분 없이 모든 trip 운행)
+        """
+        calendar = getattr(feed_data, 'calendar', pd.DataFrame())
+        calendar_dates = getattr(feed_data, 'calendar_dates', pd.DataFrame())
+        service_ids = pd.unique(pd.concat([
+            calendar.get('service_id', pd.Series(dtype=object)),
+            calendar_dates.get('service_id', pd.Series(dtype=object)),
+            feed_data.trips['service_id'],
+        ]).astype(str))
+        service_index = {sid: i for i, sid in enumerate(service_ids)}
+
+        starts = [_as_date(d) for d in calendar.get('start_date', [])]
+        ends = [_as_date(d) for d in calendar.get('end_date', [])]
+        exception_dates = [_as_date(d) for d in calendar_dates.get('date', [])]
+        if not starts and not exception_dates:
+            return None
+        start_date = min(starts + exception_dates)
+        n_days = (max(ends + exception_dates) - start_date).days + 1
+        days = np.zeros((len(service_ids), n_days), dtype=bool)
+
+        # calendar.txt: 기간 내 요일별 운행
+        day_weekdays = (np.arange(n_days) + start_date.weekday()) % 7
+        for row, start, end in zip(calendar.itertuples(index=False), starts, ends):
+            weekdays = np.array([int(getattr(row, column)) == 1 for column in WEEKDAY_COLUMNS])
+            first, last = (start - start_date).days, (end - start_date).days + 1
+            days[service_index[str(row.service_id)], first:last] = weekdays[day_weekdays[first:last]]
+
+        # calendar_dates.txt: 날짜별 추가/제외
+        for service_id, date, exception_type in zip(calendar_dates.get('service_id', []), exception_dates,
+                                                    calendar_dates.get('exception_type', [])):
+            days[service_index[str(service_id)], (date - start_date).days] = int(exception_type) == SERVICE_ADDED
+        return cls(start_date, service_ids, np.packbits(days, axis=1, bitorder='little'))
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, 'service_ids.npy'), self.service_ids.astype(str))
+        np.save(os.path.join(directory, 'day_bits.npy'), self.day_bits)
+        with open(os.path.join(directory, 'calendar.json'), 'w', encoding='utf-8') as f:
+            json.dump({'start_date': self.start_date.isoformat()}, f)
+
+    @classmethod
+    def load(cls, directory, mmap_mode='r'):
+        with open(os.path.join(directory, 'calendar.json'), encoding='utf-8') as f:
+            start_date = datetime.date.fromisoformat(json.load(f)['start_date'])
+        return cls(start_date, np.load(os.path.join(directory, 'service_ids.npy')),
+                   np.load(os.path.join(directory, 'day_bits.npy'), mmap_mode=mmap_mode))
@@ -0,0 +1,125 @@
+# services/gtfs/station_index.py
+# 역 목록 응답과 역 이름 검색 색인
+# 역 메타데이터 JSON을 시작 시 한 번 직렬화/gzip 압축해 두고 (내용 해시 ETag), 역 이름과 초성 문자열을
+# 정렬된 색인으로 만들어 이진 탐색으로 접두어 검색, 부족하면 부분 문자열 검색으로 보충.
+# 부분 문자열 검색은 글자/바이그램(연속 두 글자) 역색인으로 후보를 좁힌 뒤 확인 (전체 역을 훑지 않음).
+import bisect
+import gzip
+import hashlib
+import json
+from collections import defaultdict
+
+# 한글 음절 초성 (유니코드 음절 순서)
+CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+HANGUL_FIRST, HANGUL_LAST = 0xAC00, 0xD7A3
+SYLLABLES_PER_CHOSEONG = 588
+
+
+def normalize_name(name):
+    # 검색용 역 이름 (공백 제거, 소문자)
+    return ''.join(name.split()).lower()
+
+
+def choseong(name):
+    # 한글 음절을 초성으로 바꾼 문자열 (한글이 아닌 문자는 그대로)
+    return ''.join(
+        CHOSEONG[(ord(ch) - HANGUL_FIRST) // SYLLABLES_PER_CHOSEONG] if HANGUL_FIRST <= ord(ch) <= HANGUL_LAST else ch
+        for ch in name)
+
+
+def _grams(text):
+    # 부분 문자열 검색 키: 두 글자 이상이면 바이그램, 한 글자면 그 글자
+    if len(text) == 1:
+        return {text}
+    return {text[j:j + 2] for j in range(len(text) - 1)}
+
+
+class _KeyIndex:
+    """
+    검색 키 정렬 목록과 부분 문자열 역색인 (글자/바이그램 -> 정렬 목록 위치)
+    keys: 역 번호 순 검색 키 리스트
+    """
+
+    def __init__(self, keys):
+        self.entries = sorted((key, i) for i, key in enumerate(keys))
+        postings = defaultdict(list)
+        for position, (key, _) in enumerate(self.entries):
+            for gram in set(key) | _grams(key):
+                postings[gram].append(position)
+        self.postings = dict(postings)
+
+    def prefix_matches(self, query):
+        # 정렬된 색인에서 접두어가 같은 구간 (이진 탐색)
+        for key, i in self.entries[bisect.bisect_left(self.entries, (query,)):]:
+            if not key.startswith(query):
+                break
+            yield i
+
+    def substring_matches(self, query):
+        # 검색어의 글자/바이그램을 모두 가진 키만 확인 (정렬 순서 유지)
+        postings = sorted((self.postings.get(gram, ()) for gram in _grams(query)), key=len)
+        if not postings[0]:
+            return
+        for position in sorted(set(postings[0]).intersection(*postings[1:])):
+            key, i = self.entries[position]
+            if query in key:
+                yield i
+
+
+class StationIndex:
+    """
+    station_metadata: build_station_data() 결과 (역 메타데이터 리스트)
+
+    payload / payload_gzip: /api/stations 응답 본문 (UTF-8 JSON, gzip 압축본)
+    etag: 응답 본문 해시
+    lines: 호선 목록 [{'line', 'operator'}] (호선 이름순, /api/stations/lines)
+    """
+
+    def __init__(self, station_metadata):
+        self.stations = station_metadata
+        self.payload = json.dumps(station_metadata, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        self.payload_gzip = gzip.compress(self.payload, compresslevel=9, mtime=0)
+        self.etag = hashlib.sha256(self.payload).hexdigest()[:16]
+
+        # 검색 색인: 이름 / 초성
+        names = [normalize_name(station['stop_name']) for station in station_metadata]
+        self._names = _KeyIndex(names)
+        self._choseong = _KeyIndex([choseong(name) for name in names])
+
+        # 호선별 역 번호 (역 이름순)와 호선 목록
+        self._line_stations = defaultdict(list)
+        for name, i in self._names.entries:
+            self._line_stations[station_metadata[i]['line']].append(i)
+        operators = {station['line']: station['operator'] for station in station_metadata}
+        self.lines = [{'line': line, 'operator': operators[line]} for line in sorted(self._line_stations) if line]
+
+    def line_stations(self, line):
+        # 호선의 역 목록 (역 이름순, 없는 호선이면 빈 리스트)
+        return [self.stations[i] for i in self._line_stations.get(line, ())]
+
+    def search(self, query, limit=10, line=None):
+        """
+        역 이름 검색 (접두어 일치 우선, 부족하면 부분 문자열 일치)
+        query가 초성으로만 이루어지면 초성 문자열로 검색 (예: "ㄱㄴ" -> 강남)
+        끝에 "역"이 붙은 검색어는 그대로 찾은 뒤 "역"을 뺀 이름으로 보충
+        line: 지정하면 그 호선의 역만 검색
+        Returns: 역 메타데이터 리스트 (최대 limit개)
+        """
+        query = normalize_name(query)
+        if not query:
+            return []
+        queries = [query, query[:-1]] if len(query) > 1 and query.endswith('역') else [query]
+        index = self._choseong if all(ch in CHOSEONG for ch in query) else self._names
+
+        matches, found = [], set()
+        for key_matches in (index.prefix_matches, index.substring_matches):
+            for q in queries:
+                for i in key_matches(q):
+                    if line is not None and self.stations[i]['line'] != line:
+                        continue
+                    if len(matches) >= limit:
+                        return [self.stations[i] for i in matches]
+                    if i not in found:
+                        found.add(i)
+                        matches.append(i)
+        return [self.stations[i] for i in matches]
@@ -0,0 +1,222 @@
+# services/gtfs/subset.py
+# GTFS 부분 추출 (전국 피드 -> 지역/노선별 피드 zip)
+# 정류장 ID 접두어, route_id/노선명 정규식, 좌표 범위로 정류장/trip을 고르고, 가장 큰 stop_times.txt는
+# 청크 단위로 한 번만 읽으면서 바로 출력 zip에 씀 (전체를 메모리에 올리거나 중간 CSV를 만들지 않음).
+# stop_times에 남은 trip/정류장 기준으로 trips, stops, routes, 달력 등 나머지 테이블을 걸러 같은 zip에 기록.
+#
+# 사용법: python -m services.gtfs.subset SOURCE OUTPUT.zip [--stop-prefix P] [--route-pattern REGEX]
+#                                        [--bbox MIN_LON,MIN_LAT,MAX_LON,MAX_LAT] [--chunksize N]
+#   SOURCE: GTFS 디렉터리 또는 zip
+#   예) 수도권 도시철도: python -m services.gtfs.subset ktdb_gtfs kr_subway_gtfs.zip --stop-prefix RS_ACC1_S-1
+#       대전: python -m services.gtfs.subset GTFS_DataSet dj_gtfs.zip --route-pattern "(?i)DJB|대전1호선"
+import argparse
+import io
+import os
+import tempfile
+import zipfile
+import pandas as pd
+from services.gtfs.gtfs_loader import normalize_gtfs_times
+from utils.logging import setup_logging
+
+logger = setup_logging()
+
+# stop_times.txt 청크 크기 (행)
+SUBSET_CHUNK_ROWS = 500_000
+# 원본/출력 파일 인코딩 (BOM이 있어도 없어도 읽고, 기존 피드처럼 BOM을 붙여 씀)
+GTFS_ENCODING = 'utf-8-sig'
+
+
+class GTFSSource:
+    """
+    GTFS 디렉터리 또는 zip의 파일 읽기 (zip 안 하위 폴더, __MACOSX 항목 무시)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._zip = zipfile.ZipFile(path) if zipfile.is_zipfile(path) else None
+        if self._zip is not None:
+            names = [n for n in self._zip.namelist() if not n.startswith('__MACOSX') and n.endswith('.txt')]
+        else:
+            names = [os.path.relpath(os.path.join(root, f), path) for root, _, files in os.walk(path)
+                     for f in files if f.endswith('.txt')]
+        self._members = {os.path.basename(n): n for n in names}
+
+    def __contains__(self, filename):
+        return filename in self._members
+
+    def open(self, filename):
+        member = self._members[filename]
+        if self._zip is not None:
+            return self._zip.open(member)
+        return open(os.path.join(self.path, member), 'rb')
+
+    def read(self, filename, **kwargs):
+        # 값은 모두 문자열로 읽음 (ID/시각/숫자 형식을 원본 그대로 보존)
+        with self.open(filename) as f:
+            return pd.read_csv(f, dtype=str, keep_default_na=False, encoding=GTFS_ENCODING, **kwargs)
+
+    def close(self):
+        if self._zip is not None:
+            self._zip.close()
+
+
+def select_stops(stops, stop_prefix=None, bbox=None):
+    # 조건에 맞는 정류장 ID 집합 (조건이 없으면 None = 모든 정류장)
+    if stop_prefix is None and bbox is None:
+        return None
+    mask = pd.Series(True, index=stops.index)
+    if stop_prefix is not None:
+        mask &= stops['stop_id'].str.startswith(stop_prefix)
+    if bbox is not None:
+        min_lon, min_lat, max_lon, max_lat = bbox
+        lat = pd.to_numeric(stops['stop_lat'], errors='coerce')
+        lon = pd.to_numeric(stops['stop_lon'], errors='coerce')
+        mask &= lat.between(min_lat, max_lat) & lon.between(min_lon, max_lon)
+    return set(stops.loc[mask, 'stop_id'])
+
+
+def select_trips(routes, trips, route_pattern=None):
+    # route_id 또는 노선명(route_short_name/route_long_name)이 정규식과 맞는 노선의 trip ID 집합 (조건이 없으면 None)
+    if route_pattern is None:
+        return None
+    mask = pd.Series(False, index=routes.index)
+    for column in ('route_id', 'route_short_name', 'route_long_name'):
+        if column in routes:
+            mask |= routes[column].str.contains(route_pattern, regex=True)
+    return set(trips.loc[trips['route_id'].isin(routes.loc[mask, 'route_id']), 'trip_id'])
+
+
+def _write_table(out, filename, table):
+    with io.TextIOWrapper(out.open(filename, 'w'), encoding=GTFS_ENCODING, newline='') as f:
+        table.to_csv(f, index=False)
+
+
+def _stream_stop_times(source, out, stop_ids, trip_ids, chunksize):
+    """
+    stop_times.txt를 청크 단위로 한 번 읽으며 조건에 맞는 행만 출력 zip에 기록 (시각은 HH:MM:SS로 정규화)
+    Returns: (남은 trip ID 집합, 남은 정류장 ID 집합, 읽은 행 수, 쓴 행 수)
+    """
+    kept_trips, kept_stops = set(), set()
+    rows_read = rows_written = 0
+    with io.TextIOWrapper(out.open('stop_times.txt', 'w'), encoding=GTFS_ENCODING, newline='') as f, \
+            source.open('stop_times.txt') as raw:
+        header = True
+        for chunk in pd.read_csv(raw, dtype=str, keep_default_na=False, encoding=GTFS_ENCODING,
+                                 chunksize=chunksize):
+            rows_read += len(chunk)
+            mask = pd.Series(True, index=chunk.index)
+            if stop_ids is not None:
+                mask &= chunk['stop_id'].isin(stop_ids)
+            if trip_ids is not None:
+                mask &= chunk['trip_id'].isin(trip_ids)
+            chunk = chunk[mask]
+            if len(chunk):
+                chunk = normalize_gtfs_times(chunk)
+                kept_trips.update(chunk['trip_id'].unique())
+                kept_stops.update(chunk['stop_id'].unique())
+            # 남은 행이 없어도 첫 청크에서 헤더는 기록
+            if len(chunk) or header:
+                chunk.to_csv(f, index=False, header=header)
+                header = False
+                rows_written += len(chunk)
+            logger.info(f"stop_times {rows_read}행 처리, {rows_written}행 기록")
+    return kept_trips, kept_stops, rows_read, rows_written
+
+
+def subset_feed(source_path, output_path, stop_prefix=None, route_pattern=None, bbox=None,
+                chunksize=SUBSET_CHUNK_ROWS):
+    """
+    GTFS 부분 추출 결과를 output_path zip으로 저장 (임시 파일에 쓴 뒤 이름을 바꿔 원자적으로 교체)
+
+    stop_prefix: 정류장 ID 접두어, route_pattern: route_id/노선명 정규식, bbox: (최소 경도, 최소 위도, 최대 경도, 최대 위도)
+    정류장 조건과 노선 조건을 함께 주면 두 조건을 모두 만족하는 stop_times 행만 남김
+    Returns: 테이블별 출력 행 수
+    """
+    if stop_prefix is None and route_pattern is None and bbox is None:
+        raise ValueError("추출 조건(stop_prefix, route_pattern, bbox)을 하나 이상 지정해야 합니다.")
+    source = GTFSSource(source_path)
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.subset-', suffix='.zip', dir=output_dir)
+    os.close(fd)
+    try:
+        stops = source.read('stops.txt')
+        routes = source.read('routes.txt')
+        trips = source.read('trips.txt')
+        stop_ids = select_stops(stops, stop_prefix, bbox)
+        trip_ids = select_trips(routes, trips, route_pattern)
+
+        counts = {}
+        with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_DEFLATED) as out:
+            kept_trips, kept_stops, rows_read, counts['stop_times'] = _stream_stop_times(
+                source, out, stop_ids, trip_ids, chunksize)
+
+            trips = trips[trips['trip_id'].isin(kept_trips)]
+            routes = routes[routes['route_id'].isin(trips['route_id'])]
+            service_ids = set(trips['service_id'])
+            tables = {
+                'stops': stops[stops['stop_id'].isin(kept_stops)],
+                'routes': routes,
+                'trips': trips,
+            }
+            # 선택 테이블: 남은 노선/trip/정류장/달력과 관련된 행만
+            optional = {
+                'agency': lambda t: t[t['agency_id'].isin(routes['agency_id'])]
+                if 'agency_id' in t and 'agency_id' in routes else t,
+                'calendar': lambda t: t[t['service_id'].isin(service_ids)],
+                'calendar_dates': lambda t: t[t['service_id'].isin(service_ids)],
+                'frequencies': lambda t: t[t['trip_id'].isin(kept_trips)],
+                'transfers': lambda t: t[t['from_stop_id'].isin(kept_stops) & t['to_stop_id'].isin(kept_stops)],
+                'feed_info': lambda t: t,
+            }
+            for name, keep in optional.items():
+                if f'{name}.txt' in source:
+                    tables[name] = keep(source.read(f'{name}.txt'))
+            if 'shapes.txt' in source and 'shape_id' in trips:
+                # shapes.txt도 클 수 있으므로 청크 단위로 걸러 읽음
+                shape_ids = set(trips['shape_id'])
+                with source.open('shapes.txt') as raw:
+                    tables['shapes'] = pd.concat(
+                        chunk[chunk['shape_id'].isin(shape_ids)]
+                        for chunk in pd.read_csv(raw, dtype=str, keep_default_na=False, encoding=GTFS_ENCODING,
+                                                 chunksize=chunksize))
+
+            for name, table in tables.items():
+                _write_table(out, f'{name}.txt', table)
+                counts[name] = len(table)
+        os.replace(tmp_path, output_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    finally:
+        source.close()
+    logger.info(f"부분 추출 완료: {output_path} (stop_times {rows_read}행 중 {counts['stop_times']}행)")
+    return counts
+
+
+def _parse_bbox(value):
+    values = [float(v) for v in value.split(',')]
+    if len(values) != 4:
+        raise argparse.ArgumentTypeError("bbox는 MIN_LON,MIN_LAT,MAX_LON,MAX_LAT 형식이어야 합니다.")
+    return tuple(values)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="GTFS 부분 추출 (정류장 접두어/노선 정규식/좌표 범위)")
+    parser.add_argument('source', help="원본 GTFS 디렉터리 또는 zip")
+    parser.add_argument('output', help="출력 GTFS zip 경로")
+    parser.add_argument('--stop-prefix', help="정류장 ID 접두어 (예: RS_ACC1_S-1)")
+    parser.add_argument('--route-pattern', help="route_id/노선명 정규식 (예: \"(?i)DJB|대전1호선\")")
+    parser.add_argument('--bbox', type=_parse_bbox, help="좌표 범위 MIN_LON,MIN_LAT,MAX_LON,MAX_LAT")
+    parser.add_argument('--chunksize', type=int, default=SUBSET_CHUNK_ROWS, help="stop_times 청크 크기 (행)")
+    args = parser.parse_args(argv)
+    if args.stop_prefix is None and args.route_pattern is None and args.bbox is None:
+        parser.error("--stop-prefix, --route-pattern, --bbox 중 하나 이상을 지정해야 합니다.")
+
+    counts = subset_feed(args.source, args.output, args.stop_prefix, args.route_pattern, args.bbox, args.chunksize)
+    for name, count in counts.items():
+        print(f"{name}: {count}행")
+
+
+if __name__ == '__main__':
+    main()
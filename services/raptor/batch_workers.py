@@ -0,0 +1,78 @@
+# services/raptor/batch_workers.py
+# 일괄 경로 탐색 프로세스 풀
+# - 서버 프로세스마다 한 번만 만들어 계속 사용 (gunicorn은 워커 fork 직후 post_fork에서 생성)
+# - 자식 프로세스는 spawn 방식으로 시작하므로 요청 스레드가 락을 잡은 채 fork되어 교착되는 일이 없음
+# - 자식 프로세스는 피드 캐시를 처음 쓸 때 memory-map으로 불러와 재사용 (같은 캐시 파일의 페이지를 다른 프로세스와 공유)
+# - 작업은 SearchPool 스레드에서 제출하고 기다리므로 탐색 요청과 같은 수용 제한/마감 시각이 적용됨
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from services.raptor.router import Raptor, SearchTimeout
+
+# 자식 프로세스에서 불러온 시간표 {GTFS 경로: (피드 버전, 시간표)}
+_timetables = {}
+
+
+def _worker_timetable(gtfs_path, version):
+    # 피드 버전이 바뀌었으면 캐시를 다시 불러옴 (요청한 버전과 다르면 오류, 서버도 곧 새 버전으로 교체됨)
+    cached = _timetables.get(gtfs_path)
+    if cached is None or cached[0] != version:
+        from services.gtfs.feed_cache import load_compiled_feed
+        compiled = load_compiled_feed(gtfs_path)
+        cached = _timetables[gtfs_path] = (compiled.version, compiled.timetable)
+    if cached[0] != version:
+        raise RuntimeError(f"피드 버전이 다릅니다 (요청 {version}, 캐시 {cached[0]})")
+    return cached[1]
+
+
+def _search_destinations(gtfs_path, version, settings, from_stop_id, departure_secs, destinations, max_transfers):
+    time_limit, transfer_wait, service_date, deadline = settings
+    router = Raptor(_worker_timetable(gtfs_path, version), time_limit, transfer_wait,
+                    service_date=service_date, deadline=deadline)
+    return list(router.search_destinations(from_stop_id, departure_secs, destinations, max_transfers))
+
+
+class BatchWorkers:
+    """
+    processes: 자식 프로세스 수
+    """
+
+    def __init__(self, processes):
+        self.processes = processes
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        # 현재 프로세스의 풀 (fork된 프로세스는 부모의 풀을 쓰지 않고 새로 만듦)
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(self.processes, mp_context=multiprocessing.get_context('spawn'))
+                self._pid = os.getpid()
+            return self._executor
+
+    def search_destinations(self, router, gtfs_path, version, from_stop_id, departure_secs, destinations,
+                            max_transfers):
+        """
+        router의 설정(열차 탐색 제한, 환승 대기, 운행일, 마감 시각)으로 자식 프로세스에서 Raptor.search_destinations 실행
+        gtfs_path/version: 자식 프로세스가 불러올 피드 캐시 (실시간 지연이 반영되지 않은 정적 시간표만 가능)
+        마감 시각(time.monotonic()은 프로세스 사이에서도 같은 시계)이 지나면 SearchTimeout
+        Returns: 목적지별 결과 딕셔너리 리스트
+        """
+        settings = (router.time_limit, router.transfer_wait, router.service_date, router.deadline)
+        future = self.start().submit(_search_destinations, gtfs_path, version, settings,
+                                     from_stop_id, departure_secs, destinations, max_transfers)
+        timeout = None if router.deadline is None else max(router.deadline - time.monotonic(), 0.0)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise SearchTimeout("일괄 탐색 시간 초과") from None
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,186 @@
+# services/raptor/instrumentation.py
+# RAPTOR 탐색 계측: 단계별 소요 시간(도보 확장, 노선 수집, 노선 스캔, 경로 복원)과
+# 표시된 정류장/노선 수, 스캔한 trip 수를 탐색마다 수집하고 프로세스 단위로 누적.
+# 누적값은 Prometheus 텍스트 형식(/api/metrics)과 krri_raptor 로거로 제공.
+# SEARCH_METRICS_ENABLED = False이면 아무것도 수집하지 않는 NULL_STATS를 사용.
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from config import SEARCH_METRICS_ENABLED
+from utils.logging import setup_logging
+
+logger = setup_logging()
+
+# 탐색 1회 소요 시간 히스토그램 구간 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class SearchStats:
+    """
+    탐색 1회의 계측값
+    phases: 단계별 누적 소요 시간 (초), counters: 누적 건수, rounds: 라운드별 기록
+    """
+    enabled = True
+
+    def __init__(self, metrics):
+        self._metrics = metrics
+        self._start = time.perf_counter()
+        self.elapsed = 0.0
+        self.phases = defaultdict(float)
+        self.counters = defaultdict(int)
+        self.rounds = []
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] += time.perf_counter() - start
+
+    def count(self, name, value=1):
+        self.counters[name] += value
+
+    def add_round(self, record):
+        self.rounds.append(record)
+
+    def finish(self):
+        self.elapsed = time.perf_counter() - self._start
+        self._metrics.record(self)
+
+
+class _NullStats:
+    # 계측 비활성화 시 사용 (모든 호출이 아무 일도 하지 않음)
+    enabled = False
+    elapsed = 0.0
+    phases = {}
+    counters = {}
+    rounds = ()
+
+    def phase(self, name):
+        return nullcontext()
+
+    def count(self, name, value=1):
+        pass
+
+    def add_round(self, record):
+        pass
+
+    def finish(self):
+        pass
+
+
+NULL_STATS = _NullStats()
+
+
+class SearchMetrics:
+    """
+    프로세스 단위 탐색 계측 누적기 (스레드 안전)
+    gunicorn 워커별로 따로 누적되므로 워커마다 /api/metrics 값이 다름
+
+    enabled: False이면 start_search()가 NULL_STATS를 반환하여 계측 비용 없음
+    hooks: 탐색이 끝날 때마다 SearchStats를 전달받는 함수 목록
+    """
+
+    def __init__(self, enabled=True, hooks=()):
+        self.enabled = enabled
+        self._hooks = list(hooks)
+        self._lock = threading.Lock()
+        self._searches = 0
+        self._latency_sum = 0.0
+        self._latency_buckets = [0] * len(LATENCY_BUCKETS)
+        self._phases = defaultdict(float)
+        self._counters = defaultdict(int)
+
+    def start_search(self):
+        return SearchStats(self) if self.enabled else NULL_STATS
+
+    def add_hook(self, hook):
+        self._hooks.append(hook)
+
+    def record(self, stats):
+        with self._lock:
+            self._searches += 1
+            self._latency_sum += stats.elapsed
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if stats.elapsed <= bound:
+                    self._latency_buckets[i] += 1
+            for name, secs in stats.phases.items():
+                self._phases[name] += secs
+            for name, value in stats.counters.items():
+                self._counters[name] += value
+        for hook in self._hooks:
+            hook(stats)
+
+    @contextmanager
+    def timer(self, phase):
+        # 탐색 밖에서 수행되는 단계(경로 복원 등) 소요 시간 누적
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._phases[phase] += elapsed
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'searches': self._searches,
+                'latency_sum': self._latency_sum,
+                'latency_buckets': dict(zip(LATENCY_BUCKETS, self._latency_buckets)),
+                'phases': dict(self._phases),
+                'counters': dict(self._counters),
+            }
+
+    def render_prometheus(self, gauges=None, counters=None):
+        """
+        Prometheus 텍스트 노출 형식으로 변환
+        gauges: 함께 노출할 현재 값 {이름: 값} (캐시 크기, 대기열 길이 등)
+        counters: 함께 노출할 누적 값 {이름: 값} (캐시 적중 수 등, 이름에 _total을 붙여 counter로 노출)
+        """
+        snapshot = self.snapshot()
+        lines = [
+            '# HELP raptor_search_seconds RAPTOR search latency',
+            '# TYPE raptor_search_seconds histogram',
+        ]
+        for bound, count in snapshot['latency_buckets'].items():
+            lines.append(f'raptor_search_seconds_bucket{{le="{bound}"}} {count}')
+        lines.append(f'raptor_search_seconds_bucket{{le="+Inf"}} {snapshot["searches"]}')
+        lines.append(f'raptor_search_seconds_sum {snapshot["latency_sum"]:.6f}')
+        lines.append(f'raptor_search_seconds_count {snapshot["searches"]}')
+        lines.append('# HELP raptor_phase_seconds_total Time spent per search phase')
+        lines.append('# TYPE raptor_phase_seconds_total counter')
+        for name, secs in sorted(snapshot['phases'].items()):
+            lines.append(f'raptor_phase_seconds_total{{phase="{name}"}} {secs:.6f}')
+        for name, value in sorted(snapshot['counters'].items()):
+            lines.append(f'# TYPE raptor_{name}_total counter')
+            lines.append(f'raptor_{name}_total {value}')
+        for name, value in sorted((counters or {}).items()):
+            lines.append(f'# TYPE {name}_total counter')
+            lines.append(f'{name}_total {value}')
+        for name, value in sorted((gauges or {}).items()):
+            lines.append(f'# TYPE {name} gauge')
+            lines.append(f'{name} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+def log_search(stats):
+    # 탐색 요약을 krri_raptor 로거(DEBUG)로 기록
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    for record in stats.rounds:
+        logger.debug(f"Round {record['round']}: 표시 정류장 {record['marked_stops']}개, 노선 {record['routes']}개, "
+                     f"trip {record['trips_scanned']}개, 도보 {record['foot_updates']}건, 노선 갱신 {record['route_updates']}건, "
+                     f"소요: {record['elapsed_time'] * 1000:.1f}ms")
+    phases = ', '.join(f"{name} {secs * 1000:.1f}ms" for name, secs in stats.phases.items())
+    logger.debug(f"RAPTOR 탐색 완료: {len(stats.rounds)}라운드, {stats.elapsed * 1000:.1f}ms ({phases})")
+
+
+# 기본 계측기 (Raptor에 metrics를 지정하지 않으면 사용)
+METRICS = SearchMetrics(enabled=SEARCH_METRICS_ENABLED, hooks=[log_search])
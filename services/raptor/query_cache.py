@@ -0,0 +1,114 @@
+# services/raptor/query_cache.py
+# 출발지별 RAPTOR 탐색 라벨 캐시 (LRU + TTL)
+# 인기 출발역/출퇴근 시간대 요청이 반복되므로 (출발역, 출발 시각 구간, 운행일, 최대 환승, 도보 설정, 피드 버전)별로
+# 목적지 지정 없이 계산한 SearchState를 보관하고, 같은 출발지의 다른 목적지는 라벨에서 바로 경로를 복원함.
+# 출발역-도착역 경로 탐색은 목적지 기준 가지치기(pareto_search) 결과를 정확한 출발 시각별로 보관.
+import math
+import threading
+import time
+from collections import OrderedDict
+
+
+class QueryCache:
+    """
+    크기 제한(LRU)과 만료 시간(TTL)이 있는 스레드 안전 캐시
+    피드 버전은 키(settings_key)에 포함되므로 피드가 교체되면 이전 버전 항목은 조회되지 않고 LRU/TTL로 제거됨
+
+    max_entries: 최대 보관 항목 수 (초과 시 가장 오래 사용되지 않은 항목 제거)
+    ttl: 항목 유효 시간 (초, 0이면 만료 없음)
+    """
+
+    def __init__(self, max_entries, ttl, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> (저장 시각, 값)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl and self._clock() - entry[0] > self.ttl:
+                del self._entries[key]
+                self.evictions += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+def cached_search_state(router, cache, from_stop_id, departure_secs, max_transfers, settings_key, bucket_secs,
+                        pool=None):
+    """
+    출발지 탐색 라벨을 캐시에서 찾고 없으면 계산하여 저장
+
+    출발 시각은 bucket_secs 단위로 올림하여 탐색 (요청 시각보다 늦게 출발하는 경로만 반환되므로 항상 탑승 가능)
+    settings_key: 라벨에 영향을 주는 설정 (피드 버전, 도보 반경/보행속도 등)
+    pool: 지정하면 탐색을 SearchPool에서 실행 (같은 키로 진행 중인 탐색에 병합, router.deadline까지 대기)
+    Returns: (state, rounds_stats, 탐색 출발 시각)
+    """
+    bucket_secs = max(int(bucket_secs), 1)
+    search_secs = math.ceil(departure_secs / bucket_secs) * bucket_secs
+    key = (from_stop_id, search_secs, max_transfers, router.time_limit, router.transfer_wait, router.service_date,
+           settings_key)
+    cached = cache.get(key)
+    if cached is None:
+        if pool is not None:
+            cached = pool.run(router.search_state, from_stop_id, search_secs, max_transfers, key=key,
+                              deadline=router.deadline)
+        else:
+            cached = router.search_state(from_stop_id, search_secs, max_transfers)
+        cache.put(key, cached)
+    state, rounds_stats = cached
+    return state, rounds_stats, search_secs
+
+
+def cached_journeys(router, cache, from_stop_id, to_stop_id, departure_secs, max_transfers, settings_key, pool=None):
+    """
+    출발역-도착역 파레토 경로를 캐시에서 찾고 없으면 목적지 기준 탐색(pareto_search)으로 계산하여 저장
+
+    출발 시각은 구간으로 묶지 않음 (목적지 기준 가지치기로 탐색이 짧아 요청 시각 그대로 탐색)
+    settings_key, pool: cached_search_state와 같음
+    Returns: pareto_search 경로 리스트
+    """
+    key = ('journeys', from_stop_id, to_stop_id, departure_secs, max_transfers, router.time_limit,
+           router.transfer_wait, router.service_date, settings_key)
+    cached = cache.get(key)
+    if cached is None:
+        if pool is not None:
+            cached = pool.run(router.pareto_search, from_stop_id, to_stop_id, departure_secs, max_transfers,
+                              key=key, deadline=router.deadline)
+        else:
+            cached = router.pareto_search(from_stop_id, to_stop_id, departure_secs, max_transfers)
+        cache.put(key, cached)
+    journeys, _ = cached
+    return journeys
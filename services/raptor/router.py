@@ -1,223 +1,736 @@
+import datetime
 import time
-import math
+from collections.abc import Mapping
 import numpy as np
-from collections import defaultdict
+from services.raptor.instrumentation import METRICS
+from services.raptor.timetable import NO_TRANSFER
+
+# 도달 불가 시각 (int32 최대값)
+INF_TIME = np.iinfo(np.int32).max
+SECS_PER_DAY = 86400
+
+
+class SearchTimeout(Exception):
+    # 탐색 마감 시각(Raptor.deadline) 초과 (라운드 사이에서 확인하여 중단)
+    pass
+
+
+def group_batch_queries(queries):
+    """
+    일괄 탐색 질의를 출발지별로 묶음 (같은 출발지·출발 시각은 한 번만 탐색)
+    queries: (출발역, 목적역, 출발 시각(초)) 목록
+    Returns: {(출발역, 출발 시각): [목적역, ...]} (질의 순서 유지)
+    """
+    groups = {}
+    for from_stop_id, to_stop_id, departure_secs in queries:
+        groups.setdefault((from_stop_id, departure_secs), []).append(to_stop_id)
+    return groups
+
+
+def _expand_csr(offsets, rows):
+    """
+    CSR 구간 여러 개를 한 번에 펼침
+    Returns: (구간별 행 번호 반복 배열, 펼친 원소 인덱스 배열)
+    """
+    starts = offsets[rows]
+    counts = offsets[rows + 1] - starts
+    total = int(counts.sum())
+    row_repeat = np.repeat(rows, counts)
+    entries = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(total)
+    return row_repeat, entries
+
+
+def _next_active_trips(route_trip_offsets, active):
+    """
+    trip별로 같은 노선에서 그 trip부터 처음 운행하는 trip 인덱스 (없으면 노선 끝 인덱스)
+    active: trip별 운행 여부 (bool 배열)
+    """
+    n_trips = len(active)
+    candidates = np.where(active, np.arange(n_trips), n_trips)
+    following = np.minimum.accumulate(candidates[::-1])[::-1]
+    route_ends = np.repeat(route_trip_offsets[1:], np.diff(route_trip_offsets))
+    return np.minimum(following, route_ends)
+
+
+class SearchState:
+    """
+    RAPTOR 탐색 라벨 묶음 (rRAPTOR에서는 출발 시각을 바꿔가며 재사용)
+
+    arrivals[k]: trip k개 이하로 도착 가능한 가장 빠른 시각 (라운드 k 시작 시 k-1 라운드 값을 이어받음)
+    parents: 라운드별 부모 정보 배열 (이전 정류장, trip 인덱스(-1이면 도보), 출발 시각, 대기/도보 시간)
+        parents['stop'] == -1 이면 해당 라운드에서 개선되지 않은 값(이전 라운드에서 이어받음) 또는 출발점
+    last_round: 라벨이 확정된 마지막 라운드
+    target: 목적지 정류장 인덱스 (지정하면 목적지 도착 시각보다 늦는 라벨은 갱신하지 않음 - target pruning)
+    targets: 여러 목적지 (정류장 인덱스 배열, 하차 후 도보 시간 배열) - 도보를 더한 가장 빠른 목적지 도착 시각 기준 pruning
+    """
+
+    def __init__(self, n_rounds, n_stops, target=None, targets=None):
+        self.arrivals = np.full((n_rounds, n_stops), INF_TIME, dtype=np.int32)
+        self.parents = {
+            'stop': np.full((n_rounds, n_stops), -1, dtype=np.int32),
+            'trip': np.full((n_rounds, n_stops), -1, dtype=np.int32),
+            'departure': np.zeros((n_rounds, n_stops), dtype=np.int32),
+            'wait': np.zeros((n_rounds, n_stops), dtype=np.int32),
+        }
+        self.last_round = 0
+        self.target = target
+        self.targets = targets
+
+    def target_bound(self, round_idx):
+        # 라운드의 목적지 도착 시각 (여러 목적지면 하차 후 도보 포함 최솟값, 목적지 미지정 시 None)
+        if self.target is not None:
+            return self.arrivals[round_idx, self.target]
+        if self.targets is not None:
+            stops, egress = self.targets
+            return int((self.arrivals[round_idx, stops] + egress).min())
+        return None
+
+    def prune(self, round_idx, candidates):
+        # 목적지 도착 시각보다 빠른 후보만 남기는 마스크 (목적지 미지정 시 전부 허용)
+        bound = self.target_bound(round_idx)
+        if bound is None:
+            return np.ones(len(candidates), dtype=bool)
+        return candidates < bound
+
+    @property
+    def best_arrivals(self):
+        return self.arrivals[self.last_round]
+
+
+class RaptorResult(Mapping):
+    """
+    탐색 결과 {stop_id: (total_time, path_stops, schedule_data)} 매핑
+    경로는 정류장을 처음 조회할 때 부모 정보를 따라 복원 (전체 정류장 복원은 순회할 때만 수행)
+    target이 지정된 탐색(point-to-point)은 다른 정류장 라벨이 정확하지 않으므로 목적지만 포함
+    """
+
+    def __init__(self, router, state, departure_secs):
+        self._router = router
+        self._state = state
+        self._departure_secs = departure_secs
+        self._paths = {}
+
+    def _reached(self):
+        best_arrivals = self._state.best_arrivals
+        if self._state.target is not None:
+            target = self._state.target
+            return [target] if best_arrivals[target] < INF_TIME else []
+        return np.flatnonzero(best_arrivals < INF_TIME).tolist()
+
+    def __getitem__(self, stop_id):
+        if stop_id not in self._paths:
+            if stop_id not in self:
+                raise KeyError(stop_id)
+            stop_idx = self._router.timetable.stop_index[stop_id]
+            total_time = int(self._state.best_arrivals[stop_idx]) - self._departure_secs  # 전체 소요 시간 계산
+            path_stops, schedule_data = self._router._reconstruct(stop_idx, self._state.last_round, self._state)
+            self._paths[stop_id] = (total_time, path_stops, schedule_data)
+        return self._paths[stop_id]
+
+    def __contains__(self, stop_id):
+        stop_idx = self._router.timetable.stop_index.get(stop_id)
+        if stop_idx is None:
+            return False
+        if self._state.target is not None:
+            return stop_idx == self._state.target and self._state.best_arrivals[stop_idx] < INF_TIME
+        return bool(self._state.best_arrivals[stop_idx] < INF_TIME)
+
+    def __iter__(self):
+        stop_ids = self._router.timetable.stop_ids
+        return (stop_ids[stop_idx] for stop_idx in self._reached())
+
+    def __len__(self):
+        return len(self._reached())
+
 
 class Raptor:
-    def __init__(self, feed_data, geo_data, walking_speed=1.4, time_limit=10800, transfer_wait=60):
+    def __init__(self, timetable, time_limit=10800, transfer_wait=60, metrics=None, service_date=None,
+                 deadline=None):
         """
-        feed_data: GTFS feed data object
-        geo_data: GeoDataFrame (AEQD 좌표계)
-        walking_speed: 보행 속도 (m/s)
+        timetable: 사전 계산된 RaptorTimetable (읽기 전용으로 공유)
         time_limit: 열차 탐색 시간 제한 (초)
         transfer_wait: 환승 시 최소 대기 시간 (초)
+        metrics: 탐색 계측기 (SearchMetrics, 기본값은 프로세스 공용 METRICS)
+        service_date: 운행일 (datetime.date). 지정하면 시각은 그날 0시 기준 초이고, 그날 운행하는 trip과
+                      전날 trip(24시 이후 운행분), 다음날 trip(자정을 넘기는 경로)만 탑승.
+                      None이면 날짜 구분 없이 모든 trip 탑승
+        deadline: 탐색 마감 시각 (time.monotonic() 기준). 지나면 다음 라운드를 시작하지 않고 SearchTimeout
         """
-        self.feed_data = feed_data
-        self.geo_data = geo_data
-        self.walking_speed = walking_speed
+        self.timetable = timetable
         self.time_limit = time_limit
         self.transfer_wait = transfer_wait  # 환승 최소 대기 시간
-        self.INF = math.inf
-
-    def _build_stop_groups(self):
-        # 정류장별 stop_times 그룹 생성
-        return {sid: grp for sid, grp in self.feed_data.stop_times.groupby('stop_id')}
-
-    def _build_trip_groups(self):
-        # trip_id별 정렬된 시간표 그룹 생성
-        return {tid: grp.sort_values('stop_sequence') for tid, grp in self.feed_data.stop_times.groupby('trip_id')}
-
-    def _build_foot_paths(self, radius=320.0):
-        # 도보로 이동 가능한 인접 정류장 계산 (320m 이내)
-        # 각 정류장의 버퍼에 대해 개별적으로 query()를 호출하여 교차하는 정류장을 찾음
-        foot_paths = defaultdict(list)  # key: 정류장, value: (이웃 정류장, 도보 소요시간) 튜플 목록
-        stop_ids = list(self.geo_data.index)
-        buffers = self.geo_data.geometry.buffer(radius)
-
-        for i, buf in enumerate(buffers):
-            possible_neighbors = self.geo_data.sindex.query(buf, predicate="intersects")
-            for j in possible_neighbors:
-                if i == j:
-                    continue  # 자기 자신 제외
-                station_id = stop_ids[i]
-                neighbor_id = stop_ids[j]
-                dist = self.geo_data.iloc[i].geometry.distance(self.geo_data.iloc[j].geometry)
-                if dist <= radius:
-                # 도보 소요시간은 거리/보행속도 (0 이상)
-                    foot_paths[station_id].append((neighbor_id, dist / self.walking_speed if dist > 0 else 0))
-        return foot_paths
-
-
-    def raptor_search(self, from_stop_id, departure_secs, max_transfers):
-        # RAPTOR 알고리즘 수행
-        stop_groups = self._build_stop_groups()
-        trip_groups = self._build_trip_groups()
-        trip_cache = {}
-
-        # 도보로 이동 가능한 인접 정류장 계산 (320m 이내) - 최적화된 함수 사용
-        radius = 320.0
-        foot_paths = self._build_foot_paths(radius=radius)
-
-        # 모든 정류장 리스트
-        all_stops = self.feed_data.stops['stop_id'].unique()
-        # 라운드별 도착 시간을 저장할 딕셔너리 리스트 (최대 max_transfers+1 라운드)
-        arrivals = [dict.fromkeys(all_stops, self.INF) for _ in range(max_transfers + 1)]
-        # 라운드별 부모 정보를 저장할 딕셔너리 리스트 (경로 추적을 위함)
-        parents = [dict.fromkeys(all_stops, None) for _ in range(max_transfers + 1)]
-        # 각 라운드별 업데이트된 정류장 추적 (탐색된 정류장 집합)
-        updated_stops = [set() for _ in range(max_transfers + 1)]
-        # 출발 정류장에 대해 시작 시각을 설정
-        arrivals[0][from_stop_id] = departure_secs
-        updated_stops[0].add(from_stop_id)
-
-        rounds_stats = []  # 각 라운드별 통계 기록
+        self.metrics = metrics or METRICS
+        self.service_date = service_date
+        self.deadline = deadline
+        self.INF = INF_TIME
+        self._service_days = self._build_service_days()
+
+    def _build_service_days(self):
+        """
+        탐색할 운행일 목록 [(시각 보정값(초), trip별 다음 운행 trip 인덱스 배열)] (보정값 오름차순)
+        운행일 D+k의 trip 시각은 k일만큼 보정 (역방향 시간표는 시각 부호가 반대이므로 보정값도 반대)
+        날짜 미지정 또는 달력 없는 시간표는 [(0, None)] (모든 trip 운행)
+        실시간 반영 시간표의 탑승 불가 trip(canceled_trips)은 모든 운행일에서 제외
+        """
+        tt = self.timetable
+        running = ~tt.canceled_trips if tt.canceled_trips is not None else None
+        if self.service_date is None or tt.calendar is None or tt.trip_services is None:
+            if running is None:
+                return [(0, None)]
+            return [(0, _next_active_trips(tt.route_trip_offsets, running))]
+        service_days = []
+        for day_offset in (-1, 0, 1):
+            date = self.service_date + datetime.timedelta(days=day_offset)
+            active = tt.calendar.active_services(date)[tt.trip_services]
+            if running is not None:
+                active &= running
+            if active.any():
+                service_days.append((tt.time_sign * day_offset * SECS_PER_DAY,
+                                     _next_active_trips(tt.route_trip_offsets, active)))
+        return sorted(service_days, key=lambda day: day[0])
+
+    def raptor_search(self, from_stop_id, departure_secs, max_transfers, to_stop_id=None):
+        """
+        라운드 기반 RAPTOR 탐색 (정류장/노선은 정수 인덱스, 라벨은 int32 배열)
+        to_stop_id: 지정하면 point-to-point 탐색 (목적지보다 늦는 라벨/노선은 탐색하지 않고 목적지 경로만 반환)
+
+        Returns:
+            final_result: {stop_id: (total_time, path_stops, schedule_data)} 매핑 (RaptorResult, 조회 시 경로 복원)
+            arrivals: 라운드별 도착 시각 배열 (라운드 수 x 정류장 수, trip k개 이하 기준)
+            parents: 라운드별 부모 정보 배열 딕셔너리
+            rounds_stats: 라운드별 통계
+            all_stops: 정류장 ID 배열
+            INF: 도달 불가 시각
+        """
+        target = self.timetable.stop_index[to_stop_id] if to_stop_id is not None else None
+        state, rounds_stats = self.search_state(from_stop_id, departure_secs, max_transfers, target)
+        final_result = RaptorResult(self, state, departure_secs)
+        return final_result, state.arrivals, state.parents, rounds_stats, self.timetable.stop_ids, self.INF
+
+    def search_state(self, from_stop_id, departure_secs, max_transfers, target=None):
+        """
+        탐색 라벨(SearchState)만 계산 (목적지 미지정 시 모든 정류장 라벨이 정확하여 결과 캐시에 재사용 가능)
+        target: 목적지 정류장 인덱스 (target pruning)
+        Returns: (state, rounds_stats)
+        """
+        tt = self.timetable
+        state = SearchState(max_transfers + 1, tt.n_stops, target=target)
+        rounds_stats = self._run_rounds(state, [(tt.stop_index[from_stop_id], departure_secs)], max_transfers)
+        return state, rounds_stats
+
+    def _run_rounds(self, state, sources, max_transfers, stats=None):
+        """
+        출발점 라벨을 설정하고 라운드를 진행 (state의 기존 라벨은 그대로 두고 개선된 정류장만 탐색)
+        sources: (정류장 인덱스, 출발 시각) 목록
+        stats: 계측값을 모을 SearchStats (지정하지 않으면 이번 탐색만 계측하고 종료 시 기록)
+        Returns: 라운드별 통계 (계측 비활성화 시 빈 값)
+        """
+        owns_stats = stats is None
+        if owns_stats:
+            stats = self.metrics.start_search()
+        arrivals, parents = state.arrivals, state.parents
+        marked = []
+        for stop_idx, departure_secs in sources:
+            if departure_secs < arrivals[0, stop_idx]:
+                arrivals[0, stop_idx] = departure_secs
+                parents['stop'][0, stop_idx] = -1
+                marked.append(stop_idx)
 
         for round_idx in range(max_transfers + 1):
-            round_start_time = time.time()  # 라운드 시작 시간 기록
-            foot_updates = 0  # 도보 업데이트 횟수
-            route_updates = 0  # 노선 업데이트 횟수
-
-            # 도보 확장: 현재 라운드에서 도보로 인접 정류장 이동
-            newly_updated = set()
-            for stop_id in updated_stops[round_idx]:
-                base_time = arrivals[round_idx][stop_id]  # 해당 정류장에서의 도착 시간
-                for nbr_id, foot_time in foot_paths.get(stop_id, []):
-                    new_arrival = base_time + foot_time  # 도보 이동 후 도착 시간 계산
-                    if new_arrival < arrivals[round_idx][nbr_id]:
-                        arrivals[round_idx][nbr_id] = new_arrival
-                        # 부모 정보: (이전 정류장, 현재 라운드, 이동 모드, 출발 시간, 도착 시간, 도보 소요시간)
-                        parents[round_idx][nbr_id] = (stop_id, round_idx, 'foot', base_time, new_arrival, foot_time)
-                        newly_updated.add(nbr_id)
-                        foot_updates += 1
-            updated_stops[round_idx].update(newly_updated)
-
-            # 노선 확장: 현재 정류장에서 열차를 타고 이동 가능한 정류장 업데이트
+            if self.deadline is not None and time.monotonic() > self.deadline:
+                raise SearchTimeout(f"탐색 시간 초과 (라운드 {round_idx})")
+            round_start_time = time.perf_counter() if stats.enabled else 0.0  # 라운드 시작 시간 기록
+            state.last_round = round_idx
+
+            # 도보 확장: 현재 라운드에서 개선된 정류장으로부터 인접 정류장 이동
+            with stats.phase('foot_paths'):
+                foot_updates = self._relax_foot_paths(round_idx, marked, state)
+                marked = list(dict.fromkeys(marked + foot_updates))
+
+            # 노선 확장: 표시된 정류장을 경유하는 노선을 모아 노선별로 한 번씩 스캔
+            route_updates = 0
+            trips_scanned = 0
+            marked_routes = {}
+            next_marked = []
             if round_idx < max_transfers:
-                newly_updated_next = set()
-                for station_id in updated_stops[round_idx]:
-                    t_base = arrivals[round_idx][station_id]
-                    if t_base == self.INF or station_id not in stop_groups:
-                        continue
-                    # 환승 시 최소 대기시간(transfer_wait) 반영 및 보행 소요시간 적용:
-                    # 만약 현재 라운드가 환승(0라운드가 아닌 경우)라면, 이전 정류장과의 직선 거리를 계산하여
-                    # 일정 기준(여기서는 320m 미만) 이하면 보행시간(거리/보행속도)을 effective_time에 반영함.
-                    if round_idx > 0 and parents[round_idx].get(station_id) is not None:
-                        prev_station = parents[round_idx][station_id][0]
-                        try:
-                            dist_transfer = self.geo_data.loc[station_id].geometry.distance(
-                                self.geo_data.loc[prev_station].geometry
-                            )
-                        except Exception:
-                            dist_transfer = None
-                        if dist_transfer is not None and dist_transfer < radius:
-                            walking_transfer_time = dist_transfer / self.walking_speed
-                            effective_time = t_base + max(walking_transfer_time, self.transfer_wait)
-                        else:
-                            effective_time = t_base + self.transfer_wait
-                    else:
-                        effective_time = t_base + self.transfer_wait
-
-                    candidates = stop_groups[station_id]  # 해당 정류장에서 출발하는 열차 후보
-                    # 시간 제한 내 열차 후보 필터링
-                    filtered = candidates[
-                        (candidates['departure_time'] >= effective_time) &
-                        (candidates['departure_time'] <= effective_time + self.time_limit)
-                    ]
-                    if filtered.empty:
-                        continue
-                    # departure_time 기준 정렬 후, 이진 탐색으로 시작 인덱스 찾기
-                    sorted_candidates = filtered.sort_values('departure_time').reset_index(drop=True)
-                    departure_times = sorted_candidates['departure_time'].values
-                    start_index = np.searchsorted(departure_times, effective_time)
-                    valid_candidates = sorted_candidates.iloc[start_index:]
-                    # 같은 trip_id별 가장 빠른 departure_time 행 선택
-                    best_rows = valid_candidates.groupby('trip_id', as_index=False).first()
-
-                    for _, best_row in best_rows.iterrows():
-                        trip_id = best_row['trip_id']
-                        origin_dep = best_row['departure_time']
-                        origin_seq = best_row['stop_sequence']
-                        wait_time = origin_dep - t_base  # 대기 시간 계산
-                        if wait_time < 0:
-                            continue
-
-                        # 캐싱: 해당 trip의 시간표 데이터를 NumPy 배열로 변환해 재사용
-                        if trip_id in trip_cache:
-                            seq_arr, arr_arr, stopid_arr = trip_cache[trip_id]
-                        else:
-                            trip_df = trip_groups[trip_id]
-                            seq_arr = trip_df['stop_sequence'].to_numpy()
-                            arr_arr = trip_df['arrival_time'].to_numpy()
-                            stopid_arr = trip_df['stop_id'].to_numpy()
-                            trip_cache[trip_id] = (seq_arr, arr_arr, stopid_arr)
-
-                        # origin_seq 이후 정류장들에 대해 업데이트
-                        start_pos = np.searchsorted(seq_arr, origin_seq)
-                        for i in range(start_pos, len(seq_arr)):
-                            dest_id = stopid_arr[i]
-                            candidate_arrival = arr_arr[i]
-                            if candidate_arrival < arrivals[round_idx + 1][dest_id]:
-                                arrivals[round_idx + 1][dest_id] = candidate_arrival
-                                # 부모 정보: (이전 정류장, 현재 라운드, 'trip:열차ID', 출발 시각, 도착 시각, 대기 시간)
-                                parents[round_idx + 1][dest_id] = (
-                                    station_id,
-                                    round_idx,
-                                    f"trip:{trip_id}",
-                                    origin_dep,
-                                    candidate_arrival,
-                                    wait_time
-                                )
-                                newly_updated_next.add(dest_id)
-                                route_updates += 1
-                updated_stops[round_idx + 1] = newly_updated_next
-
-            round_elapsed = time.time() - round_start_time  # 라운드 소요 시간 계산
-            reached_count = sum(1 for sid in all_stops if arrivals[round_idx][sid] < self.INF)  # 도달한 정류장 수
-            rounds_stats.append({
-                'round': round_idx,
-                'reached_stops': reached_count,
-                'foot_updates': foot_updates,
-                'route_updates': route_updates,
-                'elapsed_time': round_elapsed
-            })
-            print(f"Round {round_idx}: 정류장 {reached_count}개, 도보 {foot_updates}건, 노선 {route_updates}건, 소요: {round_elapsed:.2f}초")
-
-            if round_idx < max_transfers and len(updated_stops[round_idx + 1]) == 0:
-                print(f"Round {round_idx + 1}: 업데이트 없음 -> 종료")
+                with stats.phase('collect_routes'):
+                    self._carry_labels(round_idx, state)
+                    state.last_round = round_idx + 1
+                    board_times = self._board_times(round_idx, marked, state)
+                    marked_routes = self._collect_routes(marked)
+                with stats.phase('scan_routes'):
+                    for route, first_pos in marked_routes.items():
+                        improved, boarded = self._scan_route(route, first_pos, round_idx, board_times, state)
+                        next_marked.extend(improved)
+                        route_updates += len(improved)
+                        trips_scanned += boarded
+
+            if stats.enabled:
+                stats.count('rounds')
+                stats.count('marked_stops', len(marked))
+                stats.count('routes_scanned', len(marked_routes))
+                stats.count('trips_scanned', trips_scanned)
+                stats.add_round({
+                    'round': round_idx,
+                    'marked_stops': len(marked),
+                    'routes': len(marked_routes),
+                    'trips_scanned': trips_scanned,
+                    'foot_updates': len(foot_updates),
+                    'route_updates': route_updates,
+                    'elapsed_time': time.perf_counter() - round_start_time
+                })
+
+            if round_idx < max_transfers and not next_marked:
+                # 남은 라운드도 라벨을 이어받아 라운드별 단조성 유지 (rRAPTOR 재사용 대비)
+                for remaining in range(round_idx + 1, max_transfers):
+                    self._carry_labels(remaining, state)
+                break
+            marked = list(dict.fromkeys(next_marked))
+
+        if owns_stats:
+            stats.finish()
+        return list(stats.rounds)
+
+    def _carry_labels(self, round_idx, state):
+        # 다음 라운드 라벨이 현재 라운드보다 늦으면 현재 라운드 값을 이어받음 (부모 정보는 '개선 없음'으로 표시)
+        current, following = state.arrivals[round_idx], state.arrivals[round_idx + 1]
+        carried = current < following
+        following[carried] = current[carried]
+        state.parents['stop'][round_idx + 1, carried] = -1
+
+    def pareto_search(self, from_stop_id, to_stop_id, departure_secs, max_transfers):
+        """
+        목적지 기준 다기준 탐색: 도착 시각과 탑승 trip 수의 파레토 최적 경로 목록
+
+        목적지 도착 시각보다 늦는 라벨은 갱신하지 않고(target pruning),
+        라운드 k의 목적지 라벨이 k-1 라운드보다 빠를 때만 trip k개 경로로 기록
+        (가장 적은 환승 경로부터 가장 빠른 경로까지)
+
+        Returns:
+            journeys: 탑승 trip 수 순 경로 딕셔너리 리스트
+                (departure_secs, arrival_secs, total_secs, trips, transfers, route, schedule)
+            rounds_stats: 라운드별 통계
+        """
+        target = self.timetable.stop_index[to_stop_id]
+        state, rounds_stats = self.search_state(from_stop_id, departure_secs, max_transfers, target)
+        return self.pareto_journeys(state, to_stop_id, departure_secs), rounds_stats
+
+    def pareto_journeys(self, state, to_stop_id, departure_secs):
+        # 탐색 라벨에서 목적지의 파레토 경로 추출 (라운드 k 라벨이 k-1 라운드보다 빠를 때만 기록)
+        target = self.timetable.stop_index[to_stop_id]
+        labels = state.arrivals[:, target]
+        journeys = []
+        for trips in range(state.last_round + 1):
+            if labels[trips] >= self.INF or (trips > 0 and labels[trips] >= labels[trips - 1]):
+                continue
+            journeys.append(self._journey(target, trips, state, departure_secs))
+        return journeys
+
+    def location_search(self, sources, targets, departure_secs, max_transfers):
+        """
+        여러 출발 후보/도착 후보 정류장 탐색 (좌표 출발/도착: 가까운 정류장들을 한 번에 탐색)
+
+        sources: [(정류장 인덱스, 출발지에서 걷는 시간(초))] - 라운드 0에 모두 출발점으로 설정
+        targets: [(정류장 인덱스, 도착지까지 걷는 시간(초))] - 도보를 더한 도착 시각 기준으로 목적지 선택
+        Returns: pareto_search와 같은 형식의 경로 리스트
+            (arrival_secs/total_secs는 마지막 도보 포함, access/egress: 출발/도착 정류장과 도보 시간)
+        """
+        tt = self.timetable
+        target_stops = np.array([stop_idx for stop_idx, _ in targets], dtype=np.int64)
+        egress = np.array([walk for _, walk in targets], dtype=np.int64)
+        state = SearchState(max_transfers + 1, tt.n_stops, targets=(target_stops, egress))
+        self._run_rounds(state, [(stop_idx, departure_secs + walk) for stop_idx, walk in sources], max_transfers)
+        access = dict(sources)
+
+        journeys = []
+        best = self.INF
+        for trips in range(state.last_round + 1):
+            totals = state.arrivals[trips, target_stops].astype(np.int64) + egress
+            choice = int(np.argmin(totals))
+            if state.arrivals[trips, target_stops[choice]] >= self.INF or totals[choice] >= best:
+                continue
+            best = int(totals[choice])
+            journey = self._journey(int(target_stops[choice]), trips, state, departure_secs)
+            first_stop = tt.stop_index[journey['route'][0]]
+            journey['arrival_secs'] = best
+            journey['total_secs'] = best - departure_secs
+            journey['access'] = {'stop_id': journey['route'][0], 'walk_secs': int(access[first_stop])}
+            journey['egress'] = {'stop_id': journey['route'][-1], 'walk_secs': int(egress[choice])}
+            journeys.append(journey)
+        return journeys
+
+    def arrive_by_search(self, from_stop_id, to_stop_id, arrival_secs, max_transfers):
+        """
+        도착 시각 기준 탐색: arrival_secs까지 도착하면서 가장 늦게 출발하는 경로
+
+        역방향 시간표(timetable.reversed())에서 목적지부터 한 번 탐색하여 출발역의 출발 시각 후보를 구한 뒤,
+        전방향 탐색으로 확인하며 가장 늦은 출발 시각을 찾음. 정류장 라벨은 가장 이른 도착 시각만 남기고 도보 환승의
+        탑승 가능 시각은 도보 출발 시각으로 정하므로, 역방향 탐색이 찾은 경로를 전방향 탐색은 다른 라벨에 밀려 찾지
+        못할 수 있음. 그래서 후보는 추정값으로만 쓰고, 도착 가능한 후보와 도착 불가능한 후보 사이를 1초 단위로
+        이분 탐색 (출발이 늦을수록 도착도 늦으므로)
+
+        Returns: pareto_search와 같은 형식의 경로 리스트 (도착 시각이 arrival_secs 이하인 경로만, 없으면 빈 리스트)
+        """
+        tt = self.timetable
+        origin = tt.stop_index[from_stop_id]
+        backward = Raptor(tt.reversed(), self.time_limit, self.transfer_wait, self.metrics, self.service_date,
+                          self.deadline)
+        state, _ = backward.search_state(to_stop_id, -(arrival_secs + self.transfer_wait), max_transfers, origin)
+        labels = state.arrivals[:, origin]
+        # 역방향 탐색의 trip 수별 출발 시각 추정 (늦은 순)
+        estimates = sorted({-int(label) - self.transfer_wait for label in labels.tolist() if label < self.INF},
+                           reverse=True)
+        if not estimates:
+            return []
+
+        def arriving(departure_secs):
+            journeys, _ = self.pareto_search(from_stop_id, to_stop_id, departure_secs, max_transfers)
+            return [journey for journey in journeys if journey['arrival_secs'] <= arrival_secs]
+
+        # latest: 도착 가능한 출발 시각과 그 경로, earliest_late: 도착 불가능한 가장 이른 출발 시각
+        latest, journeys, earliest_late = None, [], arrival_secs + 1
+        for departure_secs in estimates:
+            if departure_secs >= earliest_late:
+                continue
+            journeys = arriving(departure_secs)
+            if journeys:
+                latest = departure_secs
                 break
+            earliest_late = departure_secs
+        # 추정이 모두 늦으면 time_limit까지 간격을 두 배씩 늘리며 앞당겨 확인
+        step = 60
+        while latest is None and step <= self.time_limit:
+            departure_secs = earliest_late - step
+            journeys = arriving(departure_secs)
+            if journeys:
+                latest = departure_secs
+            else:
+                earliest_late, step = departure_secs, step * 2
+        if latest is None:
+            return []
+
+        while earliest_late - latest > 1:
+            departure_secs = (latest + earliest_late) // 2
+            candidate = arriving(departure_secs)
+            if candidate:
+                latest, journeys = departure_secs, candidate
+            else:
+                earliest_late = departure_secs
+        return journeys
+
+    def range_search(self, from_stop_id, to_stop_id, start_secs, end_secs, max_transfers):
+        """
+        rRAPTOR 출발 시간대 탐색: [start_secs, end_secs] 사이에 출발하는 파레토 최적 경로 목록
+
+        출발역(및 도보 이웃)에서 열차를 탈 수 있는 출발 시각들을 늦은 순서로 탐색하며 라벨을 재사용.
+        이전(더 늦은 출발) 탐색보다 도착이 빨라진 경우만 새 경로로 기록하므로
+        (출발 시각, 도착 시각, 탑승 trip 수) 기준으로 서로 지배하지 않는 경로만 남음.
+        목적지가 도보 이웃이면 도보 경로(trip 0개)도 포함. 도보는 언제든 출발할 수 있으므로 start_secs 출발로
+        한 번만 기록하며, 도보보다 늦게 도착하는 열차 경로는 기록하지 않음.
+
+        Returns: 출발 시각순 경로 딕셔너리 리스트
+            (departure_secs, arrival_secs, total_secs, trips, transfers, route, schedule)
+        """
+        tt = self.timetable
+        origin = tt.stop_index[from_stop_id]
+        target = tt.stop_index[to_stop_id]
+        state = SearchState(max_transfers + 1, tt.n_stops, target=target)
+        stats = self.metrics.start_search()
+        journeys = []
+        for departure_secs in self._departure_candidates(origin, start_secs, end_secs):
+            previous = state.arrivals[:, target].copy()
+            self._run_rounds(state, [(origin, departure_secs)], max_transfers, stats)
+            current = state.arrivals[:, target]
+            for trips in range(1, state.last_round + 1):
+                arrival = int(current[trips])
+                # 이번 출발 시각에서 개선되었고, 더 적은 trip 수로는 같은 도착이 불가능한 경우만 기록
+                if arrival >= previous[trips] or arrival >= current[trips - 1]:
+                    continue
+                journeys.append(self._journey(target, trips, state, departure_secs))
+        # 도보 경로 (라운드 0, 출발 시각과 무관하게 소요 시간이 같음)
+        walk_state = SearchState(1, tt.n_stops, target=target)
+        self._run_rounds(walk_state, [(origin, start_secs)], 0, stats)
+        if origin != target and walk_state.arrivals[0, target] < self.INF:
+            journeys.append(self._journey(target, 0, walk_state, start_secs))
+        stats.finish()
+        journeys.sort(key=lambda journey: (journey['departure_secs'], journey['trips']))
+        return journeys
+
+    def _departure_candidates(self, origin, start_secs, end_secs):
+        # 출발역 또는 도보 이웃에서 열차에 탑승할 수 있는 마지막 출발 시각들 (늦은 순, 중복 제거)
+        tt = self.timetable
+        neighbors, walk_secs = tt.foot_path_slice(origin)
+        candidates = []
+        for stop_idx, walk in zip([origin] + neighbors.tolist(), [0] + walk_secs.tolist()):
+            routes, positions = tt.stop_route_slice(stop_idx)
+            for route, pos in zip(routes.tolist(), positions.tolist()):
+                route_departures = tt.route_times(route)[1][:, pos].astype(np.int64)
+                for shift, next_active in self._service_days:
+                    departures = route_departures[self._active_rows(route, next_active)] + shift
+                    departures -= walk + self.transfer_wait
+                    candidates.append(departures[(departures >= start_secs) & (departures <= end_secs)])
+        if not candidates:
+            return []
+        return np.unique(np.concatenate(candidates))[::-1].tolist()
+
+    def _active_rows(self, route, next_active):
+        # 노선 내 운행 trip 순번 (next_active가 None이면 전체)
+        start, end = self.timetable.route_trip_offsets[route], self.timetable.route_trip_offsets[route + 1]
+        if next_active is None:
+            return slice(None)
+        return np.flatnonzero(next_active[start:end] == np.arange(start, end))
+
+    def search_destinations(self, from_stop_id, departure_secs, destinations, max_transfers):
+        """
+        한 출발지에서 여러 목적지까지 한 번의 탐색으로 계산
+        Yields: 목적지별 결과 딕셔너리 (도달 불가 또는 잘못된 정류장이면 'error' 포함)
+        """
+        base = {'from_station': from_stop_id, 'departure_secs': departure_secs}
+        if from_stop_id not in self.timetable.stop_index:
+            for destination in destinations:
+                yield {**base, 'to_station': destination, 'error': '알 수 없는 출발역'}
+            return
 
-        # 최종 경로 복원: 각 정류장에 대해 최단 경로 추적
-        final_result = {}
-        for station_id in all_stops:
-            best_arrival_time = self.INF
-            best_round = None
-            for rr in range(max_transfers + 1):
-                if arrivals[rr][station_id] < best_arrival_time:
-                    best_arrival_time = arrivals[rr][station_id]
-                    best_round = rr
-            if best_arrival_time == self.INF:
+        # 목적지가 하나면 point-to-point 탐색 (여러 목적지는 한 번 탐색 후 목적지 경로만 복원)
+        to_stop_id = destinations[0] if len(set(destinations)) == 1 else None
+        if to_stop_id not in self.timetable.stop_index:
+            to_stop_id = None
+        final_result = self.raptor_search(from_stop_id, departure_secs, max_transfers, to_stop_id)[0]
+        for destination in destinations:
+            if destination not in final_result:
+                yield {**base, 'to_station': destination, 'error': '경로를 찾지 못했습니다.'}
                 continue
+            total_time, path_stops, schedule_data = final_result[destination]
+            trips = [mode for _, _, _, _, mode in schedule_data if mode and mode.startswith('trip:')]
+            yield {
+                **base,
+                'to_station': destination,
+                'arrival_secs': departure_secs + total_time,
+                'total_secs': total_time,
+                'transfers': max(len(trips) - 1, 0),
+                'route': [str(stop_id) for stop_id in path_stops],
+            }
 
-            total_time = best_arrival_time - departure_secs  # 전체 소요 시간 계산
-            path_stops = []
-            schedule_data = []
-            current_stop, current_round = station_id, best_round
-            visited_set = set()  # 사이클 방지를 위한 집합
-            while True:
-                key = (current_stop, current_round)
-                if key in visited_set:
-                    break  # 이미 방문한 경우 종료
-                visited_set.add(key)
-                path_stops.append(current_stop)
-                parent_data = parents[current_round][current_stop]
-                if parent_data is None:
-                    base_time = arrivals[0].get(current_stop, departure_secs)
-                    schedule_data.append((current_stop, base_time, base_time, 0, None))
-                    break
-                schedule_data.append((current_stop, arrivals[current_round][current_stop], parent_data[3], parent_data[5], parent_data[2]))
-                current_stop, current_round = parent_data[0], parent_data[1]
-            path_stops.reverse()
-            schedule_data.reverse()
-            final_result[station_id] = (total_time, path_stops, schedule_data)
-
-        return final_result, arrivals, parents, rounds_stats, all_stops, self.INF
+    def batch_search(self, queries, max_transfers):
+        """
+        여러 출발지/목적지 쌍 일괄 탐색 (같은 출발지·출발 시각은 한 번만 탐색, 순차 실행)
+        서버에서는 출발지별 탐색을 SearchPool/BatchWorkers로 나누어 실행 (server/route_api.py batch_route)
+
+        queries: (출발역, 목적역, 출발 시각(초)) 목록
+        Yields: 쌍별 결과 딕셔너리
+        """
+        for (from_stop_id, departure_secs), destinations in group_batch_queries(queries).items():
+            yield from self.search_destinations(from_stop_id, departure_secs, destinations, max_transfers)
+
+    def _relax_foot_paths(self, round_idx, marked, state):
+        # 도보 확장 (1회 이동만 허용): 현재 라운드 라벨을 개선하는 경우에만 갱신
+        tt = self.timetable
+        labels = state.arrivals[round_idx]
+        parents = state.parents
+        edge_sources, edges = _expand_csr(tt.foot_offsets, np.asarray(marked, dtype=np.int32))
+        if not len(edges):
+            return []
+
+        # 표시된 정류장들의 도보 간선을 한 번에 펼쳐 후보 도착 시각 계산
+        neighbors = tt.foot_neighbors[edges]
+        walk_secs = tt.foot_walk_secs[edges]
+        candidates = labels[edge_sources].astype(np.int64) + walk_secs
+
+        # 이웃 정류장별 가장 빠른 후보만 남긴 뒤 현재 라벨과 비교
+        order = np.lexsort((candidates, neighbors))
+        first = np.concatenate(([True], neighbors[order][1:] != neighbors[order][:-1]))
+        best_edges = order[first]
+        best_candidates = candidates[best_edges]
+        improving = best_edges[(best_candidates < labels[neighbors[best_edges]])
+                               & state.prune(round_idx, best_candidates)]
+        if not len(improving):
+            return []
+
+        nbrs = neighbors[improving]
+        base_times = labels[edge_sources[improving]]
+        labels[nbrs] = candidates[improving]
+        parents['stop'][round_idx, nbrs] = edge_sources[improving]
+        parents['trip'][round_idx, nbrs] = -1
+        parents['departure'][round_idx, nbrs] = base_times
+        parents['wait'][round_idx, nbrs] = walk_secs[improving]
+        return nbrs.tolist()
+
+    def _board_times(self, round_idx, marked, state):
+        """
+        정류장별 탑승 가능 시각 (표시되지 않은 정류장은 INF), 환승 시간은 사전 계산된 환승 시간표에서 조회
+        - 출발 라운드: 도착 시각 + transfer_wait
+        - 열차로 도착한 정류장(같은 정류장 환승): 도착 시각 + 정류장 최소 환승 시간 (transfer_wait 이상)
+        - 도보로 도착한 정류장: 도보 출발 정류장의 시각 + 정류장 쌍 환승 시간 (transfers.txt 값이 없으면 보행시간,
+          transfer_wait 이상). 환승 시간이 보행을 포함하므로 도보 도착 시각에 더하지 않고 대신함.
+          도보 도착 시각보다 이르게 탑승하지 않으며, transfers.txt에서 환승 불가인 쌍은 탑승하지 않음
+        """
+        tt = self.timetable
+        labels, parents = state.arrivals[round_idx], state.parents
+        board_times = np.full(tt.n_stops, self.INF, dtype=np.int64)
+        stops = np.asarray(marked, dtype=np.int64)
+        if not len(stops):
+            return board_times
+        arrivals = labels[stops].astype(np.int64)
+        if round_idx == 0:
+            board_times[stops] = arrivals + self.transfer_wait
+            return board_times
+
+        boards = arrivals + np.maximum(tt.min_transfer_secs[stops], self.transfer_wait)
+        prev_stops = parents['stop'][round_idx, stops]
+        foot = np.flatnonzero((prev_stops >= 0) & (parents['trip'][round_idx, stops] < 0))
+        if len(foot):
+            foot_stops = stops[foot]
+            walk_secs = parents['wait'][round_idx, foot_stops].astype(np.int64)
+            pair_secs = tt.transfer_times(prev_stops[foot], foot_stops, walk_secs)
+            walk_start = parents['departure'][round_idx, foot_stops].astype(np.int64)
+            boards[foot] = np.maximum(walk_start + np.maximum(pair_secs, self.transfer_wait), arrivals[foot])
+            boards[foot[pair_secs == NO_TRANSFER]] = self.INF
+        board_times[stops] = boards
+        return board_times
+
+    def _collect_routes(self, marked):
+        # 표시된 정류장을 경유하는 노선별로 가장 앞선 정류장 위치 수집
+        tt = self.timetable
+        _, entries = _expand_csr(tt.stop_route_offsets, np.asarray(marked, dtype=np.int32))
+        first_pos = np.full(tt.n_routes, len(tt.route_stops), dtype=np.int32)
+        np.minimum.at(first_pos, tt.stop_routes[entries], tt.stop_route_positions[entries])
+        routes = np.flatnonzero(first_pos < len(tt.route_stops))
+        return dict(zip(routes.tolist(), first_pos[routes].tolist()))
+
+    def _scan_route(self, route, first_pos, round_idx, board_times, state):
+        """
+        노선을 first_pos부터 한 번 스캔하여 다음 라운드 도착 시각 갱신
+
+        표시된 정류장들에서 탑승 가능한 가장 빠른 trip을 운행일별 한 번의 이진 탐색으로 찾고,
+        위치별로 그때까지 탑승 가능한 가장 빠른 trip(누적 최소)을 따라 도착 시각을 계산.
+        여러 운행일의 trip은 (운행일 순번 x trip 수 + trip 순번)으로 번호를 매겨 같은 방식으로 비교
+        (노선의 한 정류장 출발 시각 범위가 하루 미만이면 이른 운행일의 trip이 항상 먼저 출발)
+        Returns: (갱신된 정류장 인덱스 리스트, 탑승한 trip 수)
+        """
+        tt = self.timetable
+        stops = tt.route_stop_slice(route)[first_pos:]
+        arr_matrix, dep_matrix = tt.route_times(route)
+        n_trips, n_positions = len(dep_matrix), len(stops)
+        origin = tt.route_trip_offsets[route]
+        service_days = self._service_days
+        n_candidates = n_trips * len(service_days)
+
+        # 위치별 탑승 가능한 가장 빠른 trip 번호 (탑승 불가 위치는 n_candidates)
+        stop_board_times = board_times[stops]
+        boardable = np.flatnonzero(stop_board_times < self.INF)
+        # 가장 빠른 탑승 시각부터 목적지 라벨보다 늦으면 노선 전체 생략
+        bound = state.target_bound(round_idx + 1)
+        if bound is not None and stop_board_times[boardable].min(initial=self.INF) >= bound:
+            return [], 0
+        catchable = np.full(n_positions, n_candidates, dtype=np.int64)
+        board_at = stop_board_times[boardable]
+        for rank, (shift, next_active) in enumerate(service_days):
+            trip_pos = tt.earliest_trips(route, boardable + first_pos, board_at - shift)
+            if next_active is not None:
+                # 운행하지 않는 trip은 건너뛰고 같은 노선의 다음 운행 trip 탑승
+                found = trip_pos < n_trips
+                trip_pos[found] = next_active[origin + trip_pos[found]] - origin
+            # 시간 제한 내 열차만 탑승
+            in_range = trip_pos < n_trips
+            in_range[in_range] = (dep_matrix[trip_pos[in_range], boardable[in_range] + first_pos]
+                                  <= board_at[in_range] - shift + self.time_limit)
+            if rank == 0:
+                catchable[boardable[in_range]] = trip_pos[in_range]
+            else:
+                np.minimum.at(catchable, boardable[in_range], rank * n_trips + trip_pos[in_range])
+
+        # 누적 최소로 각 위치에 도착하는 trip과 탑승 위치 계산 (더 빠른 trip일 때만 갈아탐)
+        current_trip = np.minimum.accumulate(catchable)
+        previous_trip = np.concatenate(([n_candidates], current_trip[:-1]))
+        board_starts = np.where(catchable < previous_trip, np.arange(n_positions), -1)
+        board_pos = np.maximum.accumulate(board_starts)
+        boarded = int(np.count_nonzero(board_starts >= 0))
+
+        # 위치 i의 도착은 i 이전에 탑승한 trip 기준
+        valid = previous_trip < n_candidates
+        if not valid.any():
+            return [], boarded
+        positions = np.flatnonzero(valid)
+        if len(service_days) == 1:
+            trips = previous_trip[positions]
+            shifts = np.full(len(positions), service_days[0][0], dtype=np.int64)
+        else:
+            ranks, trips = np.divmod(previous_trip[positions], n_trips)
+            shifts = np.array([shift for shift, _ in service_days], dtype=np.int64)[ranks]
+        candidate_arrivals = arr_matrix[trips, positions + first_pos] + shifts
+        next_round = round_idx + 1
+        labels = state.arrivals[next_round]
+        improving = (candidate_arrivals < labels[stops[positions]]) & state.prune(next_round, candidate_arrivals)
+        if not improving.any():
+            return [], boarded
+
+        arrivals, parents = state.arrivals, state.parents
+        improved = []
+        for pos, trip, shift, arrival in zip(positions[improving].tolist(), trips[improving].tolist(),
+                                             shifts[improving].tolist(), candidate_arrivals[improving].tolist()):
+            dest_idx = int(stops[pos])
+            # 순환 노선에서 같은 정류장이 여러 번 나오는 경우 대비 재확인
+            if arrival >= labels[dest_idx]:
+                continue
+            from_pos = int(board_pos[pos - 1])
+            from_idx = int(stops[from_pos])
+            origin_dep = int(dep_matrix[trip, from_pos + first_pos]) + shift
+            labels[dest_idx] = arrival
+            parents['stop'][next_round, dest_idx] = from_idx
+            parents['trip'][next_round, dest_idx] = origin + trip
+            parents['departure'][next_round, dest_idx] = origin_dep
+            parents['wait'][next_round, dest_idx] = origin_dep - int(arrivals[round_idx, from_idx])
+            improved.append(dest_idx)
+        return improved, boarded
+
+    def _journey(self, stop_idx, trips, state, departure_secs):
+        # 라운드 trips의 라벨로 경로 복원 후 응답용 딕셔너리 생성
+        arrival = int(state.arrivals[trips, stop_idx])
+        path_stops, schedule_data = self._reconstruct(stop_idx, trips, state)
+        return {
+            'departure_secs': departure_secs,
+            'arrival_secs': arrival,
+            'total_secs': arrival - departure_secs,
+            'trips': trips,
+            'transfers': max(trips - 1, 0),
+            'route': [str(stop_id) for stop_id in path_stops],
+            'schedule': schedule_data,
+        }
+
+    def _reconstruct(self, stop_idx, round_idx, state):
+        # 부모 정보를 따라 경로 복원 (개선되지 않은 라운드는 이전 라운드로 내려가며 추적)
+        # schedule_data 항목: (stop_id, 도착 시각, 출발 시각, 대기/도보 시간, 이동 모드)
+        with self.metrics.timer('reconstruct'):
+            return self._reconstruct_path(stop_idx, round_idx, state)
+
+    def _reconstruct_path(self, stop_idx, round_idx, state):
+        tt = self.timetable
+        arrivals, parents = state.arrivals, state.parents
+        path_stops = []
+        schedule_data = []
+        current_stop, current_round = stop_idx, round_idx
+        while True:
+            while current_round > 0 and parents['stop'][current_round, current_stop] < 0:
+                current_round -= 1
+            stop_id = tt.stop_ids[current_stop]
+            path_stops.append(stop_id)
+            arrival = int(arrivals[current_round, current_stop])
+            prev_idx = int(parents['stop'][current_round, current_stop])
+            if prev_idx < 0:
+                schedule_data.append((stop_id, arrival, arrival, 0, None))
+                break
+            trip_idx = int(parents['trip'][current_round, current_stop])
+            mode = 'foot' if trip_idx < 0 else f"trip:{tt.trip_ids[trip_idx]}"
+            schedule_data.append((
+                stop_id,
+                arrival,
+                int(parents['departure'][current_round, current_stop]),
+                int(parents['wait'][current_round, current_stop]),
+                mode
+            ))
+            if trip_idx >= 0:
+                current_round -= 1
+            current_stop = prev_idx
+        path_stops.reverse()
+        schedule_data.reverse()
+        return path_stops, schedule_data
@@ -0,0 +1,156 @@
+# services/raptor/search_pool.py
+# 경로 탐색 작업 풀 (요청 스레드 대신 크기가 정해진 스레드 풀에서 탐색 실행)
+# - 수용 제한: 실행 중 + 대기 중 탐색이 workers + max_queue개를 넘으면 즉시 PoolOverloaded (HTTP 503)
+# - 마감 시각: 요청별 deadline까지 결과를 기다리고, 탐색 자체도 라운드 사이에서 중단 (SearchTimeout)
+# - 요청 병합: 같은 키(출발역, 출발 시각 구간 등)의 탐색이 진행 중이면 새로 계산하지 않고 그 결과를 함께 기다림
+# - 일괄 작업: map_unordered로 여러 탐색을 window개씩 나누어 제출 (작업마다 같은 수용 제한과 마감 시각 적용)
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait
+from services.raptor.router import SearchTimeout
+
+
+class PoolOverloaded(Exception):
+    # 탐색 풀 수용 한도 초과
+    pass
+
+
+class SearchPool:
+    """
+    workers: 동시에 실행할 탐색 수 (스레드 수)
+    max_queue: 실행을 기다릴 수 있는 탐색 수
+    """
+
+    def __init__(self, workers, max_queue):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='raptor-search')
+        self._lock = threading.Lock()
+        self._inflight = {}  # key -> Future (진행 중인 탐색)
+        self._pending = 0
+        self.submitted = 0
+        self.completed = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self.timeouts = 0
+
+    def run(self, fn, *args, key=None, deadline=None):
+        """
+        fn(*args)를 풀에서 실행하고 결과 반환
+        key: 지정하면 같은 key로 진행 중인 탐색에 병합 (None이면 병합하지 않음)
+        deadline: 결과를 기다릴 마감 시각 (time.monotonic() 기준, 지나면 SearchTimeout)
+        """
+        future = self.submit(fn, *args, key=key)
+        timeout = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+        try:
+            return future.result(timeout)
+        except (FutureTimeoutError, SearchTimeout):
+            self._count_timeout()
+            raise SearchTimeout("탐색 시간 초과") from None
+
+    def submit(self, fn, *args, key=None):
+        """
+        fn(*args)를 풀에 제출하고 Future 반환 (수용 한도를 넘으면 PoolOverloaded)
+        key: 지정하면 같은 key로 진행 중인 탐색의 Future를 그대로 반환
+        """
+        leader = False
+        with self._lock:
+            future = self._inflight.get(key) if key is not None else None
+            if future is not None:
+                self.coalesced += 1
+            else:
+                if self._pending >= self.workers + self.max_queue:
+                    self.rejected += 1
+                    raise PoolOverloaded(f"탐색 대기열이 가득 찼습니다 ({self._pending}건 처리 중)")
+                self._pending += 1
+                self.submitted += 1
+                future = self._executor.submit(fn, *args)
+                if key is not None:
+                    self._inflight[key] = future
+                leader = True
+        if leader:
+            # 완료 시 대기 건수/진행 중 키 정리 (이미 끝났으면 즉시 호출)
+            future.add_done_callback(lambda done: self._release(key, done))
+        return future
+
+    def map_unordered(self, fn, args_list, window, timeout):
+        """
+        args_list의 각 인자로 fn(*args, deadline)을 풀에서 실행하고 끝난 순서대로 결과 반환
+        - 한 번에 window개까지만 제출하여 큰 일괄 작업이 풀을 독점하지 않음
+        - 작업별 마감 시각은 제출 시각 + timeout (fn에 deadline으로 전달, 지나면 결과 대신 SearchTimeout)
+        - 첫 작업이 수용 한도를 넘으면 즉시 PoolOverloaded, 이후에는 앞 작업이 끝나기를 기다렸다 다시 제출
+          (진행 중인 작업이 없는데도 한도를 넘으면 결과 대신 PoolOverloaded)
+
+        Returns: (args, 결과 또는 예외 객체) 이터레이터
+        """
+        pending = iter(args_list)
+        running = {}  # Future -> (args, deadline)
+        first = next(pending, None)
+        if first is not None:
+            deadline = time.monotonic() + timeout
+            running[self.submit(fn, *first, deadline)] = (first, deadline)
+        return self._drain(fn, pending, running, window, timeout)
+
+    def _drain(self, fn, pending, running, window, timeout):
+        retry = None
+        while True:
+            while len(running) < window:
+                args = retry if retry is not None else next(pending, None)
+                retry = None
+                if args is None:
+                    break
+                deadline = time.monotonic() + timeout
+                try:
+                    running[self.submit(fn, *args, deadline)] = (args, deadline)
+                except PoolOverloaded as e:
+                    if not running:
+                        yield args, e
+                        continue
+                    retry = args
+                    break
+            if not running:
+                return
+
+            earliest = min(deadline for _, deadline in running.values())
+            done, _ = wait(running, timeout=max(earliest - time.monotonic(), 0.0), return_when=FIRST_COMPLETED)
+            now = time.monotonic()
+            for future, (args, deadline) in list(running.items()):
+                if future in done:
+                    del running[future]
+                    try:
+                        yield args, future.result()
+                    except SearchTimeout:
+                        self._count_timeout()
+                        yield args, SearchTimeout("탐색 시간 초과")
+                    except Exception as e:
+                        yield args, e
+                elif now >= deadline:
+                    # 결과를 더 기다리지 않음 (탐색 자체는 deadline을 넘기면 라운드 사이에서 중단)
+                    del running[future]
+                    self._count_timeout()
+                    yield args, SearchTimeout("탐색 시간 초과")
+
+    def _count_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def _release(self, key, future):
+        with self._lock:
+            self._pending -= 1
+            self.completed += 1
+            if key is not None and self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'max_queue': self.max_queue,
+                'pending': self._pending,
+                'inflight_keys': len(self._inflight),
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'coalesced': self.coalesced,
+                'rejected': self.rejected,
+                'timeouts': self.timeouts,
+            }
@@ -0,0 +1,422 @@
+# services/raptor/timetable.py
+import copy
+import os
+from collections import defaultdict
+import numpy as np
+import pandas as pd
+from services.geo.geo_utils import build_foot_paths
+from services.gtfs.service_calendar import ServiceCalendar
+from utils.logging import setup_logging
+
+logger = setup_logging()
+
+
+# save()/load() 대상 배열 (foot_* 도보 그래프는 반경/보행속도별로 따로 저장)
+TIMETABLE_ARRAYS = (
+    'stop_ids', 'route_ids', 'route_stop_offsets', 'route_stops', 'route_trip_offsets',
+    'trip_ids', 'route_time_offsets', 'arrival_times', 'departure_times',
+)
+FOOT_PATH_ARRAYS = ('foot_offsets', 'foot_neighbors', 'foot_walk_secs')
+# 시간표에서 유도되는 색인 배열 (저장해 두면 워커가 다시 계산하지 않고 memory-map으로 공유)
+DERIVED_ARRAYS = ('stop_route_offsets', 'stop_routes', 'stop_route_positions', 'departure_keys')
+# 운행 달력 (trip별 service 번호, 달력은 calendar/ 하위 디렉터리)
+SERVICE_ARRAYS = ('trip_services',)
+# transfers.txt 환승 시간 (정류장별 최소 환승 시간, 정류장 쌍별 환승 시간)
+TRANSFER_ARRAYS = ('min_transfer_secs', 'transfer_from_stops', 'transfer_to_stops', 'transfer_pair_secs')
+NO_TRANSFER = -1  # 환승 불가 (transfer_type 3) 표시값
+
+
+def transfers_from_feed(feed_data, stop_index):
+    """
+    feed_data: partridge feed (transfers 테이블, 없으면 빈 테이블)
+    stop_index: {stop_id: 정류장 인덱스}
+    transfer_type 2(최소 환승 시간)는 min_transfer_time, 3(환승 불가)은 NO_TRANSFER로 기록하고
+    나머지 유형과 시간표에 없는 정류장 행은 무시. 같은 정류장 안의 환승은 정류장별 최소 환승 시간으로 기록
+    Returns: (min_transfer_secs, transfer_from_stops, transfer_to_stops, transfer_pair_secs)
+    """
+    min_transfer_secs = np.zeros(len(stop_index), dtype=np.int32)
+    transfers = getattr(feed_data, 'transfers', None)
+    if transfers is None or not len(transfers):
+        empty = np.empty(0, dtype=np.int32)
+        return min_transfer_secs, empty, empty.copy(), empty.copy()
+
+    transfer_type = pd.to_numeric(transfers['transfer_type'], errors='coerce').fillna(0).astype(int).to_numpy()
+    min_time = pd.to_numeric(transfers.get('min_transfer_time', pd.Series(0, index=transfers.index)),
+                             errors='coerce').fillna(0).to_numpy(dtype=np.int32)
+    from_stops = transfers['from_stop_id'].astype(str).map(stop_index).to_numpy(dtype=float)
+    to_stops = transfers['to_stop_id'].astype(str).map(stop_index).to_numpy(dtype=float)
+    secs = np.where(transfer_type == 3, NO_TRANSFER, min_time)
+    keep = (np.isin(transfer_type, (2, 3)) & ~np.isnan(from_stops) & ~np.isnan(to_stops))
+    from_stops, to_stops, secs = from_stops[keep].astype(np.int32), to_stops[keep].astype(np.int32), secs[keep]
+
+    same = (from_stops == to_stops) & (secs != NO_TRANSFER)
+    np.maximum.at(min_transfer_secs, from_stops[same], secs[same])
+    pairs = from_stops != to_stops
+    logger.info(f"transfers.txt 환승 시간: 정류장 {int(same.sum())}건, 정류장 쌍 {int(pairs.sum())}건")
+    return min_transfer_secs, from_stops[pairs], to_stops[pairs], secs[pairs].astype(np.int32)
+
+
+class RaptorTimetable:
+    """
+    RAPTOR 탐색용 사전 계산 시간표 (앱 시작 시 1회 생성, 이후 읽기 전용으로 공유)
+
+    - 노선(route): 같은 정류장 순서(stop pattern)를 갖는 trip 묶음.
+      추월하는 trip이 있으면 별도 노선으로 분리하여 노선 내 모든 정류장에서
+      출발 시각이 trip 순서대로 정렬되도록 보장 (이진 탐색 가능)
+    - route_stops[route_stop_offsets[r]:route_stop_offsets[r + 1]]: 노선 r의 정류장 인덱스
+    - trip_ids[route_trip_offsets[r]:route_trip_offsets[r + 1]]: 노선 r의 trip (첫 출발 시각순)
+    - arrival_times / departure_times: 노선별 (trip 수 x 정류장 수) 행렬을 평탄화한 배열,
+      노선 r의 시작 위치는 route_time_offsets[r]
+    - departure_keys: 노선별 (정류장 수 x trip 수) 순서로 (노선 내 위치 << 32) + 출발 시각을 담은 배열.
+      노선 구간 전체가 정렬되어 있어 여러 정류장의 가장 빠른 trip을 한 번의 이진 탐색으로 찾을 수 있음
+    - stop_routes / stop_route_positions: 정류장별 경유 노선과 노선 내 위치 (stop_route_offsets 기준)
+    - foot_neighbors / foot_walk_secs: 정류장별 도보 이웃과 도보 소요시간(초) (foot_offsets 기준 CSR)
+    - trip_services / calendar: trip별 service 번호와 운행 달력 (ServiceCalendar, 없으면 날짜 구분 없이 모든 trip 운행)
+    - min_transfer_secs: 정류장별 최소 환승 시간(초) (transfers.txt, 없으면 0)
+    - transfer_keys / transfer_secs: 정류장 쌍 (이전 정류장 * 정류장 수 + 탑승 정류장) 정렬 키와 환승 시간(초).
+      도보 그래프의 보행시간을 기본값으로, transfers.txt의 정류장 쌍 값(NO_TRANSFER는 환승 불가)으로 덮어씀
+    - time_sign: 1이면 전방향 시간표, -1이면 reversed()로 만든 역방향 시간표 (시각 부호가 반대)
+    - route_overrides / canceled_trips: with_route_times()로 만든 실시간 반영 시간표의 바뀐 노선 시각과
+      trip별 탑승 불가 여부 (원본 시간표는 빈 딕셔너리/None)
+    """
+
+    def __init__(self, stop_ids, route_ids, route_stop_offsets, route_stops,
+                 route_trip_offsets, trip_ids, route_time_offsets,
+                 arrival_times, departure_times, foot_offsets, foot_neighbors, foot_walk_secs,
+                 stop_route_offsets=None, stop_routes=None, stop_route_positions=None, departure_keys=None,
+                 trip_services=None, calendar=None, min_transfer_secs=None, transfer_from_stops=None,
+                 transfer_to_stops=None, transfer_pair_secs=None, canceled_trips=None):
+        # np.memmap으로 불러온 배열도 일반 ndarray 뷰로 감싸 슬라이싱마다 생기는 memmap 객체 생성 비용 제거
+        self.stop_ids = np.asarray(stop_ids)
+        self.stop_index = {sid: i for i, sid in enumerate(self.stop_ids.tolist())}
+        self.route_ids = np.asarray(route_ids)
+        self.route_stop_offsets = np.asarray(route_stop_offsets)
+        self.route_stops = np.asarray(route_stops)
+        self.route_trip_offsets = np.asarray(route_trip_offsets)
+        self.trip_ids = np.asarray(trip_ids)
+        self.route_time_offsets = np.asarray(route_time_offsets)
+        self.arrival_times = np.asarray(arrival_times)
+        self.departure_times = np.asarray(departure_times)
+        self.foot_offsets = np.asarray(foot_offsets)
+        self.foot_neighbors = np.asarray(foot_neighbors)
+        self.foot_walk_secs = np.asarray(foot_walk_secs)
+        if stop_routes is None:
+            self._build_stop_routes()
+        else:
+            self.stop_route_offsets = np.asarray(stop_route_offsets)
+            self.stop_routes = np.asarray(stop_routes)
+            self.stop_route_positions = np.asarray(stop_route_positions)
+        if departure_keys is None:
+            self._build_departure_keys()
+        else:
+            self.departure_keys = np.asarray(departure_keys)
+        self.trip_services = np.asarray(trip_services) if trip_services is not None else None
+        self.calendar = calendar
+        self._build_transfers(min_transfer_secs, transfer_from_stops, transfer_to_stops, transfer_pair_secs)
+        self.canceled_trips = np.asarray(canceled_trips, dtype=bool) if canceled_trips is not None else None
+        self.route_overrides = {}  # 노선 -> (도착 행렬, 출발 행렬, 출발 정렬 키)
+        self.time_sign = 1
+        self._reversed = None  # reversed()에서 생성하는 역방향 시간표
+        self._base = None  # with_route_times()로 만든 시간표의 원본 시간표
+
+    @property
+    def n_stops(self):
+        return len(self.stop_ids)
+
+    @property
+    def n_routes(self):
+        return len(self.route_ids)
+
+    def _build_stop_routes(self):
+        # 정류장 -> (노선, 노선 내 위치) 역색인 생성
+        n_route_stops = np.diff(self.route_stop_offsets)
+        route_of = np.repeat(np.arange(self.n_routes, dtype=np.int32), n_route_stops)
+        position_of = (np.arange(len(self.route_stops), dtype=np.int32)
+                       - np.repeat(self.route_stop_offsets[:-1], n_route_stops))
+        order = np.lexsort((position_of, route_of, self.route_stops))
+        counts = np.bincount(self.route_stops, minlength=self.n_stops)
+        self.stop_route_offsets = np.zeros(self.n_stops + 1, dtype=np.int32)
+        np.cumsum(counts, out=self.stop_route_offsets[1:])
+        self.stop_routes = route_of[order]
+        self.stop_route_positions = position_of[order]
+
+    def _build_transfers(self, min_transfer_secs, from_stops, to_stops, pair_secs):
+        # 정류장 쌍 환승 시간표: transfers.txt 값 우선, 없으면 도보 그래프 보행시간 (키 정렬, 이진 탐색용)
+        empty = np.empty(0, dtype=np.int32)
+        self.min_transfer_secs = (np.asarray(min_transfer_secs) if min_transfer_secs is not None
+                                  else np.zeros(self.n_stops, dtype=np.int32))
+        self.transfer_from_stops = np.asarray(from_stops) if from_stops is not None else empty
+        self.transfer_to_stops = np.asarray(to_stops) if to_stops is not None else empty
+        self.transfer_pair_secs = np.asarray(pair_secs) if pair_secs is not None else empty
+        # 도보 간선 (정류장 -> 이웃)은 이웃에서 정류장으로 오는 환승
+        foot_stops = np.repeat(np.arange(self.n_stops, dtype=np.int64), np.diff(self.foot_offsets))
+        keys = np.concatenate((self.transfer_from_stops.astype(np.int64) * self.n_stops + self.transfer_to_stops,
+                               self.foot_neighbors.astype(np.int64) * self.n_stops + foot_stops))
+        secs = np.concatenate((self.transfer_pair_secs, self.foot_walk_secs)).astype(np.int32)
+        # 같은 키는 앞쪽(transfers.txt) 값만 남김
+        self.transfer_keys, first = np.unique(keys, return_index=True)
+        self.transfer_secs = secs[first]
+
+    def transfer_times(self, prev_stops, stops, default):
+        """
+        정류장 쌍별 환승 시간 (이전 정류장 -> 탑승 정류장, 배열 단위 조회)
+        default: 표에 없는 쌍의 환승 시간 (배열 또는 스칼라)
+        Returns: 환승 시간(초) 배열 (환승 불가는 NO_TRANSFER)
+        """
+        keys = prev_stops.astype(np.int64) * self.n_stops + stops
+        if not len(self.transfer_keys):
+            return np.broadcast_to(default, keys.shape).copy()
+        positions = np.minimum(np.searchsorted(self.transfer_keys, keys), len(self.transfer_keys) - 1)
+        return np.where(self.transfer_keys[positions] == keys, self.transfer_secs[positions], default)
+
+    def _build_departure_keys(self):
+        # (trip, 위치) 순서의 출발 시각을 노선별 (위치, trip) 순서로 전치하여 정렬 키 생성
+        n_route_stops = np.diff(self.route_stop_offsets).astype(np.int64)
+        n_route_trips = np.diff(self.route_trip_offsets).astype(np.int64)
+        block_sizes = n_route_stops * n_route_trips
+        route_of = np.repeat(np.arange(self.n_routes), block_sizes)
+        local = np.arange(len(self.departure_times), dtype=np.int64) - self.route_time_offsets[:-1][route_of]
+        trip_pos, stop_pos = np.divmod(local, n_route_stops[route_of])
+        transposed = self.route_time_offsets[:-1][route_of] + stop_pos * n_route_trips[route_of] + trip_pos
+        self.departure_keys = np.empty(len(self.departure_times), dtype=np.int64)
+        self.departure_keys[transposed] = (stop_pos << 32) + self.departure_times
+
+    def earliest_trips(self, route, positions, board_times):
+        """
+        노선의 여러 위치에서 board_times 이후 출발하는 가장 빠른 trip 위치를 한 번의 이진 탐색으로 계산
+        Returns: 위치별 trip 순번 (탑승 가능한 trip이 없으면 노선의 trip 수)
+        """
+        n_trips = self.route_trip_offsets[route + 1] - self.route_trip_offsets[route]
+        start = self.route_time_offsets[route]
+        n_stops = self.route_stop_offsets[route + 1] - self.route_stop_offsets[route]
+        override = self.route_overrides.get(route)
+        keys = override[2] if override is not None else self.departure_keys[start:start + n_stops * n_trips]
+        positions = positions.astype(np.int64)
+        return np.searchsorted(keys, (positions << 32) + board_times) - positions * n_trips
+
+    def reversed(self):
+        """
+        도착 시각 기준(arrive-by) 탐색용 역방향 시간표 (처음 호출 시 생성 후 재사용)
+
+        노선별 정류장 순서와 trip 순서를 뒤집고 시각의 부호를 바꿔(도착 <-> 출발) 같은 전방향 RAPTOR로
+        가장 늦은 출발 시각을 구할 수 있게 함. 추월 없는(FIFO) 노선은 뒤집어도 FIFO가 유지됨.
+        정류장/도보 그래프 배열은 원본과 공유.
+        실시간 반영 시간표는 원본의 역방향 시간표에 바뀐 노선만 뒤집어 덧씌움.
+        """
+        if self._reversed is None and self._base is not None:
+            route_times = {}
+            for route in self.route_overrides:
+                arr_matrix, dep_matrix = self.route_times(route)
+                route_times[route] = (-dep_matrix[::-1, ::-1], -arr_matrix[::-1, ::-1])
+            canceled_trips = self.canceled_trips
+            if canceled_trips is not None:
+                canceled_trips = canceled_trips[self._reversed_trip_order()]
+            self._reversed = self._base.reversed().with_route_times(route_times, canceled_trips)
+        if self._reversed is None:
+            route_stops = np.empty_like(self.route_stops)
+            trip_order = self._reversed_trip_order()
+            arrival_times = np.empty_like(self.arrival_times)
+            departure_times = np.empty_like(self.departure_times)
+            for route in range(self.n_routes):
+                stop_start, stop_end = self.route_stop_offsets[route], self.route_stop_offsets[route + 1]
+                trip_start, trip_end = self.route_trip_offsets[route], self.route_trip_offsets[route + 1]
+                time_start = self.route_time_offsets[route]
+                time_end = time_start + (stop_end - stop_start) * (trip_end - trip_start)
+                arr_matrix, dep_matrix = self.route_times(route)
+                route_stops[stop_start:stop_end] = self.route_stops[stop_start:stop_end][::-1]
+                arrival_times[time_start:time_end] = -dep_matrix[::-1, ::-1].ravel()
+                departure_times[time_start:time_end] = -arr_matrix[::-1, ::-1].ravel()
+            trip_services = self.trip_services[trip_order] if self.trip_services is not None else None
+            self._reversed = RaptorTimetable(
+                self.stop_ids, self.route_ids, self.route_stop_offsets, route_stops,
+                self.route_trip_offsets, self.trip_ids[trip_order], self.route_time_offsets,
+                arrival_times, departure_times, self.foot_offsets, self.foot_neighbors, self.foot_walk_secs,
+                trip_services=trip_services, calendar=self.calendar,
+                # 역방향 탐색의 이전 정류장은 실제로는 다음 정류장이므로 환승 방향을 뒤집음
+                min_transfer_secs=self.min_transfer_secs, transfer_from_stops=self.transfer_to_stops,
+                transfer_to_stops=self.transfer_from_stops, transfer_pair_secs=self.transfer_pair_secs,
+            )
+            self._reversed.time_sign = -self.time_sign
+        return self._reversed
+
+    def _reversed_trip_order(self):
+        # 노선별 trip 순서를 뒤집은 trip 인덱스 (역방향 시간표의 trip i는 원본 trip order[i])
+        n_route_trips = np.diff(self.route_trip_offsets)
+        route_of = np.repeat(np.arange(self.n_routes), n_route_trips)
+        return (self.route_trip_offsets[:-1][route_of] + self.route_trip_offsets[1:][route_of] - 1
+                - np.arange(len(self.trip_ids)))
+
+    def with_route_times(self, route_times, canceled_trips=None):
+        """
+        일부 노선의 trip 시각만 바꾼 새 시간표 (실시간 지연 반영용, 원본 배열은 수정하지 않음)
+
+        route_times: {노선: (도착 행렬, 출발 행렬)} - 원본 노선과 같은 trip 순서/크기의 (trip 수 x 정류장 수) 행렬로,
+                     모든 정류장에서 trip 순서대로 시각이 줄지 않아야 함 (이진 탐색 전제)
+        canceled_trips: trip별 탑승 불가 여부 (bool 배열, 생략하면 원본 값 유지)
+        바뀐 노선의 시각 행렬과 출발 정렬 키만 따로 보관하고(route_overrides), 나머지 배열은 원본과 공유.
+        trip 순서가 같으므로 trip ID/운행 달력과 정류장 -> 노선 색인도 그대로 사용
+        """
+        patched = copy.copy(self)
+        patched.route_overrides = dict(self.route_overrides)
+        for route, (arr_matrix, dep_matrix) in route_times.items():
+            n_trips, n_stops = dep_matrix.shape
+            positions = np.arange(n_stops, dtype=np.int64)[:, None] << 32
+            patched.route_overrides[route] = (arr_matrix, dep_matrix, (positions + dep_matrix.T).ravel())
+        if canceled_trips is not None:
+            patched.canceled_trips = np.asarray(canceled_trips, dtype=bool)
+        patched._base = self._base if self._base is not None else self
+        patched._reversed = None
+        return patched
+
+    def route_stop_slice(self, route):
+        return self.route_stops[self.route_stop_offsets[route]:self.route_stop_offsets[route + 1]]
+
+    def route_times(self, route):
+        # 노선의 (도착, 출발) 시각 행렬 (trip 수 x 정류장 수) 뷰 반환
+        override = self.route_overrides.get(route)
+        if override is not None:
+            return override[0], override[1]
+        n_stops = self.route_stop_offsets[route + 1] - self.route_stop_offsets[route]
+        n_trips = self.route_trip_offsets[route + 1] - self.route_trip_offsets[route]
+        start = self.route_time_offsets[route]
+        end = start + n_stops * n_trips
+        return (self.arrival_times[start:end].reshape(n_trips, n_stops),
+                self.departure_times[start:end].reshape(n_trips, n_stops))
+
+    def stop_route_slice(self, stop):
+        start, end = self.stop_route_offsets[stop], self.stop_route_offsets[stop + 1]
+        return self.stop_routes[start:end], self.stop_route_positions[start:end]
+
+    def foot_path_slice(self, stop):
+        start, end = self.foot_offsets[stop], self.foot_offsets[stop + 1]
+        return self.foot_neighbors[start:end], self.foot_walk_secs[start:end]
+
+    def save(self, directory):
+        # 시간표/색인 배열을 .npy 파일로 저장 (문자열 ID는 고정 길이 유니코드 배열로 변환하여 memory-map 가능하게 함)
+        if self._base is not None:
+            raise ValueError("실시간 반영 시간표는 저장할 수 없습니다 (원본 시간표를 저장)")
+        os.makedirs(directory, exist_ok=True)
+        for name in TIMETABLE_ARRAYS + DERIVED_ARRAYS + SERVICE_ARRAYS + TRANSFER_ARRAYS:
+            array = getattr(self, name)
+            if array is None:
+                continue
+            if array.dtype == object:
+                array = array.astype(str)
+            np.save(os.path.join(directory, f"{name}.npy"), array)
+        if self.calendar is not None:
+            self.calendar.save(os.path.join(directory, 'calendar'))
+
+    @classmethod
+    def load(cls, directory, foot_paths, mmap_mode='r'):
+        """
+        directory: save()로 저장한 디렉터리
+        foot_paths: (offsets, neighbors, walk_secs) 도보 그래프
+        mmap_mode: np.load memory-map 모드 (None이면 메모리로 읽음)
+                   읽기 전용 memory-map은 같은 파일을 연 모든 프로세스가 OS 페이지 캐시를 공유 (복사 없음)
+        """
+        arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode)
+                  for name in TIMETABLE_ARRAYS}
+        for name in DERIVED_ARRAYS + SERVICE_ARRAYS + TRANSFER_ARRAYS:
+            path = os.path.join(directory, f"{name}.npy")
+            if os.path.exists(path):
+                arrays[name] = np.load(path, mmap_mode=mmap_mode)
+        calendar_dir = os.path.join(directory, 'calendar')
+        if os.path.exists(calendar_dir):
+            arrays['calendar'] = ServiceCalendar.load(calendar_dir, mmap_mode=mmap_mode)
+        return cls(**arrays, **dict(zip(FOOT_PATH_ARRAYS, foot_paths)))
+
+    @classmethod
+    def from_feed(cls, feed_data, geo_data, radius=320.0, walking_speed=1.4, foot_paths=None):
+        """
+        feed_data: GTFS feed data object (시간값은 초 단위로 변환된 상태)
+        geo_data: GeoDataFrame (AEQD 좌표계, stop_id 인덱스)
+        radius: 도보 환승 허용 반경 (m)
+        walking_speed: 보행 속도 (m/s)
+        foot_paths: 미리 계산된 (offsets, neighbors, walk_secs) 도보 그래프 (geo_data 행 순서 기준)
+        """
+        stop_ids = np.asarray(feed_data.stops['stop_id'].unique(), dtype=object)
+        stop_index = {sid: i for i, sid in enumerate(stop_ids)}
+
+        stop_times = feed_data.stop_times.sort_values(['trip_id', 'stop_sequence'])
+        trip_col = stop_times['trip_id'].to_numpy()
+        stop_col = stop_times['stop_id'].map(stop_index).to_numpy(dtype=np.int32)
+        arr_col = stop_times['arrival_time'].to_numpy(dtype=np.int32)
+        dep_col = stop_times['departure_time'].to_numpy(dtype=np.int32)
+
+        # trip별 구간 경계 계산
+        boundaries = np.flatnonzero(trip_col[1:] != trip_col[:-1]) + 1
+        starts = np.concatenate(([0], boundaries))
+        ends = np.concatenate((boundaries, [len(trip_col)]))
+        trip_route = dict(zip(feed_data.trips['trip_id'], feed_data.trips['route_id']))
+        calendar = ServiceCalendar.from_feed(feed_data)
+        transfers = transfers_from_feed(feed_data, stop_index)
+        trip_service = None
+        if calendar is not None:
+            trip_service = dict(zip(feed_data.trips['trip_id'],
+                                    feed_data.trips['service_id'].astype(str).map(calendar.service_index)))
+
+        # 정류장 순서(패턴)별 trip 묶기
+        patterns = defaultdict(list)
+        for start, end in zip(starts, ends):
+            trip_id = trip_col[start]
+            key = (trip_route.get(trip_id), stop_col[start:end].tobytes())
+            patterns[key].append((dep_col[start], trip_id, start, end))
+
+        route_ids, route_stop_offsets, route_stops = [], [0], []
+        route_trip_offsets, trip_ids = [0], []
+        route_time_offsets, arrival_blocks, departure_blocks = [0], [], []
+        for (route_id, _), trips in patterns.items():
+            trips.sort(key=lambda t: t[0])
+            pattern_stops = stop_col[trips[0][2]:trips[0][3]]
+            # 추월이 없는 trip끼리만 같은 노선에 배정 (FIFO 보장)
+            sub_routes = []
+            for _, trip_id, start, end in trips:
+                dep = dep_col[start:end]
+                arr = arr_col[start:end]
+                for sub in sub_routes:
+                    last_arr, last_dep = sub[-1][1], sub[-1][2]
+                    if np.all(last_dep <= dep) and np.all(last_arr <= arr):
+                        sub.append((trip_id, arr, dep))
+                        break
+                else:
+                    sub_routes.append([(trip_id, arr, dep)])
+
+            for sub in sub_routes:
+                route_ids.append(route_id)
+                route_stops.append(pattern_stops)
+                route_stop_offsets.append(route_stop_offsets[-1] + len(pattern_stops))
+                trip_ids.extend(t[0] for t in sub)
+                route_trip_offsets.append(route_trip_offsets[-1] + len(sub))
+                arrival_blocks.extend(t[1] for t in sub)
+                departure_blocks.extend(t[2] for t in sub)
+                route_time_offsets.append(route_time_offsets[-1] + len(sub) * len(pattern_stops))
+
+        # 도보 그래프의 정류장 순서가 시간표와 같아야 함
+        if not np.array_equal(np.asarray(geo_data.index, dtype=str), np.asarray(stop_ids, dtype=str)):
+            geo_data = geo_data.reindex(stop_ids)
+            foot_paths = None
+        if foot_paths is None:
+            foot_paths = build_foot_paths(geo_data, radius, walking_speed)
+        foot_offsets, foot_neighbors, foot_walk_secs = foot_paths
+
+        timetable = cls(
+            stop_ids=stop_ids,
+            route_ids=np.array(route_ids, dtype=object),
+            route_stop_offsets=np.array(route_stop_offsets, dtype=np.int32),
+            route_stops=np.concatenate(route_stops).astype(np.int32),
+            route_trip_offsets=np.array(route_trip_offsets, dtype=np.int32),
+            trip_ids=np.array(trip_ids, dtype=object),
+            route_time_offsets=np.array(route_time_offsets, dtype=np.int64),
+            arrival_times=np.concatenate(arrival_blocks).astype(np.int32),
+            departure_times=np.concatenate(departure_blocks).astype(np.int32),
+            foot_offsets=foot_offsets,
+            foot_neighbors=foot_neighbors,
+            foot_walk_secs=foot_walk_secs,
+            trip_services=(np.array([trip_service[trip_id] for trip_id in trip_ids], dtype=np.int32)
+                           if trip_service is not None else None),
+            calendar=calendar,
+            **dict(zip(TRANSFER_ARRAYS, transfers)),
+        )
+        logger.info(f"RAPTOR 시간표 생성: 정류장 {timetable.n_stops}개, 노선 {timetable.n_routes}개, "
+                    f"trip {len(timetable.trip_ids)}개")
+        return timetable
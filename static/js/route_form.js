@@ -1,5 +1,28 @@
 // route_form.js
 // 경로 검색 폼 제출 및 결과 렌더링 처리
+let routeMap = null;
+
+// 경로 GeoJSON(구간 LineString, 정류장 Point)을 노선 색상으로 표시
+function drawRouteGeometry(geometry) {
+  if (routeMap) {
+    routeMap.remove();
+  }
+  routeMap = L.map('map');
+  L.tileLayer('https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png', {
+    attribution: '&copy; OpenStreetMap contributors'
+  }).addTo(routeMap);
+  const layer = L.geoJSON(geometry, {
+    style: feature => ({ color: feature.properties.color, weight: 5, opacity: 0.8 }),
+    pointToLayer: (feature, latlng) => L.circleMarker(latlng, {
+      radius: 5,
+      color: feature.properties.color,
+      fill: true,
+      fillOpacity: 1.0
+    }).bindTooltip(feature.properties.station)
+  }).addTo(routeMap);
+  routeMap.fitBounds(layer.getBounds());
+}
+
 function initRouteForm() {
   $('#route-form').on('submit', async (e) => {
     e.preventDefault();
@@ -45,17 +68,9 @@ function initRouteForm() {
         </div>
       `);
 
-      // 지도 iframe 표시
-      const mapFrame = $('<iframe>', {
-        src: 'static/route_result.html',
-        css: {
-          width: '100%',
-          height: '100%',
-          border: 'none'
-        }
-      });
-      $('#map').empty().append(mapFrame);
       $('#result').removeClass('d-none');
+      // 경로 GeoJSON을 Leaflet 지도에 표시
+      drawRouteGeometry(data.geometry);
     } catch (error) {
       console.error("find_route 오류:", error);
       alert("경로 검색 중 오류가 발생했습니다.");
@@ -66,7 +81,7 @@ function initRouteForm() {
 }
 
 if (typeof module !== 'undefined' && module.exports) {
-  module.exports = { initRouteForm };
+  module.exports = { initRouteForm, drawRouteGeometry };
 } else {
   window.initRouteForm = initRouteForm;
 }
\ No newline at end of file
@@ -1,6 +1,47 @@
 // station.js
-// 역 목록 불러오기 및 Select2 초기화, 호선/역 필터링 처리
-let stations = [];
+// 호선 목록 불러오기 및 Select2 초기화, 역은 검색 API(api/stations/search)로 찾기 (호선 선택 시 그 호선으로 한정)
+let lines = [];
+
+// 역 Select2 초기화: 입력한 검색어와 선택한 호선으로 서버에서 검색
+function initStationSearch($stationSelect, $lineSelect) {
+  $stationSelect.select2({
+    placeholder: "역 검색",
+    allowClear: true,
+    minimumInputLength: 0,
+    templateResult: formatStation,
+    templateSelection: formatStation,
+    ajax: {
+      url: 'api/stations/search',
+      dataType: 'json',
+      delay: 250,
+      data: params => ({ q: params.term || '', line: $lineSelect.val() || '' }),
+      processResults: data => ({
+        results: data.map(s => ({
+          id: s.stop_id,
+          text: s.stop_name,
+          line: s.line,
+          color: getLineColor(s.operator, s.line)
+        }))
+      }),
+      // 호선도 검색어도 없으면 요청하지 않음 (서버가 400 반환)
+      transport: (params, success, failure) => {
+        if (!params.data.q.trim() && !params.data.line) {
+          success([]);
+          return null;
+        }
+        return $.ajax(params).then(success).fail(failure);
+      }
+    }
+  });
+
+  // 호선을 바꾸면 선택한 역이 다른 호선일 수 있으므로 선택 해제
+  $lineSelect.on('change', () => {
+    const selected = $stationSelect.select2('data')[0];
+    if (selected && selected.line && $lineSelect.val() && selected.line !== $lineSelect.val()) {
+      $stationSelect.val(null).trigger('change');
+    }
+  });
+}
 
 function initStationSelectors() {
   const $fromLineSelect = $('#from-line');
@@ -10,36 +51,26 @@ function initStationSelectors() {
 
   // 노선 Select2 초기화 (템플릿 적용)
   $fromLineSelect.select2({
-    placeholder: "호선 선택",
+    placeholder: "전체 호선",
+    allowClear: true,
     templateResult: formatLine,
     templateSelection: formatLine
   });
   $toLineSelect.select2({
-    placeholder: "호선 선택",
+    placeholder: "전체 호선",
+    allowClear: true,
     templateResult: formatLine,
     templateSelection: formatLine
   });
-  // 역 Select2 초기화 (템플릿 적용)
-  $fromStationSelect.select2({
-    placeholder: "역 선택",
-    templateResult: formatStation,
-    templateSelection: formatStation
-  });
-  $toStationSelect.select2({
-    placeholder: "역 선택",
-    templateResult: formatStation,
-    templateSelection: formatStation
-  });
+  initStationSearch($fromStationSelect, $fromLineSelect);
+  initStationSearch($toStationSelect, $toLineSelect);
 
-  // 역 목록 불러오기
-  fetch('api/stations')
+  // 호선 목록 불러오기
+  fetch('api/stations/lines')
     .then(response => response.json())
     .then(data => {
-      console.log("Received stations:", data);
-      stations = data;
-      const lines = [...new Set(stations.map(s => s.line))];
-      lines.sort((a, b) => a.localeCompare(b));
-      lines.forEach(line => {
+      lines = data;
+      lines.forEach(({ line }) => {
         $fromLineSelect.append($('<option>', { value: line, text: line }));
         $toLineSelect.append($('<option>', { value: line, text: line }));
       });
@@ -47,55 +78,7 @@ function initStationSelectors() {
       $toLineSelect.trigger('change');
     })
     .catch(error => {
-      console.error("Error fetching stations:", error);
-      alert("역 목록 불러오기에 실패했습니다.");
-    });
-
-  // 출발 호선 선택 시 해당 호선의 역만 표시
-  $fromLineSelect.on('change', () => {
-    const selectedLine = $fromLineSelect.val();
-    if (!selectedLine) {
-      $fromStationSelect.empty().append('<option value="">역 선택</option>')
-        .prop('disabled', true)
-        .trigger('change');
-      return;
-    }
-    $fromStationSelect.prop('disabled', false);
-    const filteredStations = stations
-      .filter(s => s.line === selectedLine)
-      .sort((a, b) => a.stop_name.localeCompare(b.stop_name));
-    $fromStationSelect.empty().append('<option value="">역 선택</option>');
-    filteredStations.forEach(s => {
-      const $option = $('<option>')
-        .val(s.stop_id)
-        .text(s.stop_name)
-        .data('color', getLineColor(s.operator, s.line));
-      $fromStationSelect.append($option);
+      console.error("Error fetching lines:", error);
+      alert("호선 목록 불러오기에 실패했습니다.");
     });
-    $fromStationSelect.trigger('change');
-  });
-
-  // 도착 호선 선택 시 해당 호선의 역만 표시
-  $toLineSelect.on('change', () => {
-    const selectedLine = $toLineSelect.val();
-    if (!selectedLine) {
-      $toStationSelect.empty().append('<option value="">역 선택</option>')
-        .prop('disabled', true)
-        .trigger('change');
-      return;
-    }
-    $toStationSelect.prop('disabled', false);
-    const filteredStations = stations
-      .filter(s => s.line === selectedLine)
-      .sort((a, b) => a.stop_name.localeCompare(b.stop_name));
-    $toStationSelect.empty().append('<option value="">역 선택</option>');
-    filteredStations.forEach(s => {
-      const $option = $('<option>')
-        .val(s.stop_id)
-        .text(s.stop_name)
-        .data('color', getLineColor(s.operator, s.line));
-      $toStationSelect.append($option);
-    });
-    $toStationSelect.trigger('change');
-  });
 }
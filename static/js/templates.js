@@ -4,9 +4,9 @@ function formatLine(state) {
   if (!state.id) {
     return state.text;
   }
-  // 전역 변수 stations에서 해당 노선을 탐색
-  const selectedStation = stations.find(s => s.line === state.id);
-  const operator = selectedStation ? selectedStation.operator : 'A1';
+  // 전역 변수 lines(호선 목록)에서 해당 노선의 운영기관 탐색
+  const selectedLine = lines.find(l => l.line === state.id);
+  const operator = selectedLine ? selectedLine.operator : 'A1';
   const color = getLineColor(operator, state.id);
   // 노선 앞에 "● " 추가
   return $('<span>', { style: `color: ${color}; font-weight: bold;` }).text(`● ${state.text}`);
@@ -15,6 +15,7 @@ function formatLine(state) {
 // Select2 템플릿 함수 (역용)
 function formatStation(state) {
   if (!state.id) return state.text;
-  const color = $(state.element).data('color') || '#CCCCCC';
+  // 검색 결과 항목은 color 속성, 기존 option은 data-color 사용
+  const color = state.color || $(state.element).data('color') || '#CCCCCC';
   return $('<span>', { style: `color: ${color}; font-weight: bold;` }).text(state.text);
 }
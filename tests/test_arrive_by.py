@@ -0,0 +1,79 @@
+# tests/test_arrive_by.py
+# 도착 시각 기준 탐색이 가장 늦은 출발 시각을 찾는지 전방향 전수 탐색과 비교 (도보 환승 포함 합성 피드)
+import pytest
+from services.raptor.router import Raptor
+from tests import test_router
+from tests.test_transfers import build_timetable, secs
+
+# 역방향 라벨이 전방향에서 도착 불가능한 출발 시각을 주는 피드 (X ~8초 도보~ Y)
+# A --R1--> X 08:01:40, A --R2--> Y 08:01:45 (둘 다 A 08:00 출발), Y --R3--> Z 08:02:40 출발 08:10 도착
+#   역방향: X 하차 후 도보(환승 대기 60초 포함)로 R3 탑승 가능 -> 07:59 출발로 추정
+#   전방향: Y에 R2로 먼저 도착(08:01:45)하여 라벨이 되고 R3를 놓침 -> 07:59 출발은 도착 불가
+# A --R4--> W 07:55 출발, W --R5--> Z 08:02 출발 08:10 도착 (실제 가장 늦은 출발 07:54)
+# A --R0--> Z 07:40 출발 08:10 도착 (trip 1개 라운드의 추정 07:39)
+LATE_ESTIMATE_FEED = dict(test_router.FEED, **{
+    'stops.txt': "stop_id,stop_name,stop_lat,stop_lon\n"
+                 "A,A,37.5000,127.0000\nX,X,37.5100,127.0000\nY,Y,37.5101,127.0000\n"
+                 "Z,Z,37.5200,127.0000\nW,W,37.5000,127.0200\n",
+    'routes.txt': "route_id,agency_id,route_short_name,route_type\n"
+                  + ''.join(f"R{route},X,R{route},1\n" for route in range(6)),
+    'trips.txt': "route_id,service_id,trip_id\n" + ''.join(f"R{route},S,T{route}\n" for route in range(6)),
+    'stop_times.txt': "trip_id,arrival_time,departure_time,stop_id,stop_sequence\n"
+                      "T0,07:40:00,07:40:00,A,1\nT0,08:10:00,08:10:00,Z,2\n"
+                      "T1,08:00:00,08:00:00,A,1\nT1,08:01:40,08:01:40,X,2\n"
+                      "T2,08:00:00,08:00:00,A,1\nT2,08:01:45,08:01:45,Y,2\n"
+                      "T3,08:02:40,08:02:40,Y,1\nT3,08:10:00,08:10:00,Z,2\n"
+                      "T4,07:55:00,07:55:00,A,1\nT4,08:00:00,08:00:00,W,2\n"
+                      "T5,08:02:00,08:02:00,W,1\nT5,08:10:00,08:10:00,Z,2\n",
+})
+
+# (출발역, 도착역, 도착 시각): B -> B2는 도보 후 탑승, A -> D는 열차 후 도보 환승
+QUERIES = [
+    ('A', 'D', '08:24:30'),
+    ('A', 'D', '08:23:00'),
+    ('A', 'D', '08:39:59'),
+    ('A', 'C', '08:30:00'),
+    ('B', 'D', '08:24:30'),
+    ('B', 'D', '08:40:00'),
+    ('B', 'B2', '08:00:00'),
+    ('A', 'D', '08:20:00'),
+]
+
+
+def brute_force_latest_departure(router, origin, destination, arrival_secs, window=3600):
+    # 1초 단위로 출발 시각을 늦춰 가며 전방향 탐색, 도착 시각 이내로 도착하는 가장 늦은 출발 시각
+    for departure_secs in range(arrival_secs, arrival_secs - window, -1):
+        journeys, _ = router.pareto_search(origin, destination, departure_secs, 3)
+        if any(journey['arrival_secs'] <= arrival_secs for journey in journeys):
+            return departure_secs
+    return None
+
+
+@pytest.fixture(scope='module')
+def timetable(tmp_path_factory):
+    return build_timetable(tmp_path_factory.mktemp('feed'))
+
+
+@pytest.mark.parametrize('origin, destination, arrival', QUERIES)
+def test_arrive_by_returns_latest_departure(timetable, origin, destination, arrival):
+    router = Raptor(timetable)
+    arrival_secs = secs(arrival)
+    expected = brute_force_latest_departure(router, origin, destination, arrival_secs)
+    journeys = router.arrive_by_search(origin, destination, arrival_secs, 3)
+    if expected is None:
+        assert journeys == []
+        return
+    assert journeys and {journey['departure_secs'] for journey in journeys} == {expected}
+    assert all(journey['arrival_secs'] <= arrival_secs for journey in journeys)
+
+
+def test_arrive_by_steps_past_infeasible_estimate(tmp_path):
+    # 역방향 추정(07:59)이 도착 불가능해도 다음 추정(07:39)으로 내려가지 않고 그 사이의 가장 늦은 출발을 찾음
+    router = Raptor(test_router.build_timetable(tmp_path, LATE_ESTIMATE_FEED))
+    arrival_secs = secs('08:10:00')
+    assert not [journey for journey in router.pareto_search('A', 'Z', secs('07:59:00'), 3)[0]
+                if journey['arrival_secs'] <= arrival_secs]
+    journeys = router.arrive_by_search('A', 'Z', arrival_secs, 3)
+    assert brute_force_latest_departure(router, 'A', 'Z', arrival_secs) == secs('07:54:00')
+    assert [(journey['departure_secs'], journey['route']) for journey in journeys] == \
+           [(secs('07:54:00'), ['A', 'W', 'Z'])]
@@ -0,0 +1,26 @@
+# tests/test_feed_cache.py
+# 피드 캐시 테이블 컬럼 저장/불러오기
+import numpy as np
+import pandas as pd
+from services.gtfs.feed_cache import save_table, load_table
+
+
+def test_table_round_trip(tmp_path):
+    table = pd.DataFrame({
+        'stop_id': pd.Categorical(['B', 'A', 'B'], categories=['A', 'B']),
+        'stop_name': pd.Series(['역삼', None, '강남'], dtype=str),
+        'stop_sequence': np.array([1, 2, 3], dtype=np.int16),
+        'stop_lat': [37.5, 37.6, 37.7],
+    })
+    save_table(table, tmp_path / 'stops')
+    loaded = load_table(tmp_path / 'stops')
+    pd.testing.assert_frame_equal(loaded, table)
+
+
+def test_numeric_columns_are_memory_mapped(tmp_path):
+    table = pd.DataFrame({'arrival_time': np.arange(5, dtype=np.int32)})
+    save_table(table, tmp_path / 'stop_times')
+    base = load_table(tmp_path / 'stop_times')['arrival_time'].to_numpy()
+    while base is not None and not isinstance(base, np.memmap):
+        base = base.base
+    assert base is not None
@@ -0,0 +1,74 @@
+# tests/test_feed_registry.py
+# 피드 레지스트리 (파일 변경 시 교체, 메모리 예산 초과 시 LRU 해제)
+import functools
+import os
+import zipfile
+from services.gtfs.feed_cache import load_compiled_feed
+from services.gtfs.feed_registry import FeedRegistry
+from tests.test_query_cache import FakeClock
+from tests.test_router import FEED
+
+
+def write_feed(path, feed=FEED):
+    with zipfile.ZipFile(path, 'w') as archive:
+        for name, content in feed.items():
+            archive.writestr(name, content)
+    return str(path)
+
+
+def make_registry(tmp_path, feeds, memory_budget_mb=1024, check_interval=60):
+    clock = FakeClock()
+    loader = functools.partial(load_compiled_feed, cache_root=str(tmp_path / 'cache'))
+    registry = FeedRegistry(feeds, next(iter(feeds)), memory_budget_mb, check_interval, loader=loader, clock=clock)
+    return registry, clock
+
+
+def test_changed_feed_file_is_swapped_after_check_interval(tmp_path):
+    path = write_feed(tmp_path / 'seoul.zip')
+    registry, clock = make_registry(tmp_path, {'seoul': path})
+    old = registry.get()
+
+    # 막차 시각만 바꾼 새 버전
+    feed = dict(FEED, **{'stop_times.txt': FEED['stop_times.txt'].replace('09:10:00', '09:15:00')})
+    write_feed(path, feed)
+    os.utime(path, ns=(old.file_stat[1] + 10 ** 9, old.file_stat[1] + 10 ** 9))
+    clock.now = 59
+    assert registry.get() is old
+
+    clock.now = 61
+    new = registry.get()
+    assert new is not old and new.version != old.version
+    assert registry.get('seoul') is new
+    assert registry.stats()['swaps'] == 1
+    # 이전 버전을 쓰던 요청은 이전 시간표를 끝까지 사용
+    assert old.timetable.arrival_times.max() < new.timetable.arrival_times.max()
+
+
+def test_unchanged_feed_is_not_reloaded(tmp_path):
+    registry, clock = make_registry(tmp_path, {'seoul': write_feed(tmp_path / 'seoul.zip')})
+    context = registry.get()
+    clock.now = 1000
+    assert registry.get() is context
+    assert registry.stats()['loads'] == 1
+
+
+def test_least_recently_used_feed_is_evicted_over_budget(tmp_path):
+    feeds = {'seoul': write_feed(tmp_path / 'seoul.zip'), 'busan': write_feed(tmp_path / 'busan.zip')}
+    # 예산 0MB: 방금 불러온 피드 하나만 남김
+    registry, _ = make_registry(tmp_path, feeds, memory_budget_mb=0)
+    registry.get('seoul')
+    registry.get('busan')
+    assert [context.name for context in registry.loaded()] == ['busan']
+    registry.get('seoul')
+    assert [context.name for context in registry.loaded()] == ['seoul']
+    assert registry.stats()['loads'] == 3 and registry.stats()['evictions'] == 2
+
+
+def test_feeds_within_budget_stay_loaded(tmp_path):
+    feeds = {'seoul': write_feed(tmp_path / 'seoul.zip'), 'busan': write_feed(tmp_path / 'busan.zip')}
+    registry, _ = make_registry(tmp_path, feeds)
+    seoul = registry.get('seoul')
+    registry.get('busan')
+    assert registry.get('seoul') is seoul
+    assert [context.name for context in registry.loaded()] == ['busan', 'seoul']
+    assert registry.stats()['evictions'] == 0
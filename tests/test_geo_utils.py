@@ -0,0 +1,20 @@
+# tests/test_geo_utils.py
+# 도보 환승 그래프 (STRtree 일괄 질의)
+import numpy as np
+import geopandas as gpd
+from shapely.geometry import Point
+from services.geo.geo_utils import build_foot_paths
+
+
+def test_foot_paths_match_pairwise_distances():
+    rng = np.random.default_rng(0)
+    x, y = rng.uniform(0, 2000, 60), rng.uniform(0, 2000, 60)
+    gdf = gpd.GeoDataFrame(geometry=[Point(px, py) for px, py in zip(x, y)])
+    offsets, neighbors, walk_secs = build_foot_paths(gdf, radius=320.0, walking_speed=1.4)
+
+    dist = np.hypot(x[:, None] - x[None, :], y[:, None] - y[None, :])
+    for stop in range(len(gdf)):
+        expected = [j for j in range(len(gdf)) if j != stop and dist[stop, j] <= 320.0]
+        assert neighbors[offsets[stop]:offsets[stop + 1]].tolist() == expected
+        np.testing.assert_array_equal(walk_secs[offsets[stop]:offsets[stop + 1]],
+                                      np.ceil(dist[stop, expected] / 1.4).astype(np.int32))
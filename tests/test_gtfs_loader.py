@@ -0,0 +1,66 @@
+# tests/test_gtfs_loader.py
+# GTFS 시각 일괄 변환, ID 정수 코드화와 컬럼 자료형 축소
+import numpy as np
+import pytest
+from services.gtfs.gtfs_loader import (ID_COLUMNS, MISSING_TIME, GTFSLoader, build_station_data, format_gtfs_times,
+                                      parse_gtfs_times, time_to_seconds)
+from tests.test_router import FEED
+
+
+def test_parse_gtfs_times_matches_row_parser():
+    values = ['08:00:00', '8:05:30', '25:10:00', '08:00', '08:00:00', ' 07:59:59 ']
+    expected = [time_to_seconds(value.strip()) for value in values]
+    np.testing.assert_array_equal(parse_gtfs_times(values), expected)
+
+
+def test_blank_and_missing_times_are_marked():
+    np.testing.assert_array_equal(parse_gtfs_times(['', None, '00:00:01']), [MISSING_TIME, MISSING_TIME, 1])
+
+
+def test_invalid_time_raises():
+    with pytest.raises(ValueError):
+        parse_gtfs_times(['08:00:00', '8h00'])
+
+
+def test_format_round_trip():
+    secs = np.array([0, 3661, 90000, MISSING_TIME], dtype=np.int32)
+    assert format_gtfs_times(secs).tolist() == ['00:00:00', '01:01:01', '25:00:00', '']
+    np.testing.assert_array_equal(parse_gtfs_times(format_gtfs_times(secs)), secs)
+
+
+def load_feed_data(tmp_path, feed=FEED):
+    for name, content in feed.items():
+        (tmp_path / name).write_text(content, encoding='utf-8')
+    loader = GTFSLoader(str(tmp_path))
+    loader.load_feed()
+    return loader.get_feed_data()
+
+
+def test_ids_share_sorted_codes_across_tables(tmp_path):
+    feed_data = load_feed_data(tmp_path)
+    for column, table_names in ID_COLUMNS.items():
+        dtypes = [getattr(feed_data, name)[column].dtype for name in table_names
+                  if column in getattr(feed_data, name, {})]
+        assert all(dtype == dtypes[0] for dtype in dtypes)
+        assert list(dtypes[0].categories) == sorted(dtypes[0].categories)
+    stop_times = feed_data.stop_times
+    assert stop_times['stop_id'].cat.codes.dtype == np.int8
+    # 코드 <-> ID 변환과 문자열 비교 결과 유지
+    categories = stop_times['stop_id'].cat.categories
+    assert categories[stop_times['stop_id'].cat.codes].tolist() == stop_times['stop_id'].astype(str).tolist()
+    assert (stop_times['stop_id'] == 'B').sum() == 4
+    assert stop_times.sort_values('trip_id')['trip_id'].astype(str).tolist() == \
+        sorted(stop_times['trip_id'].astype(str))
+
+
+def test_columns_are_narrowed(tmp_path):
+    stop_times = load_feed_data(tmp_path).stop_times
+    assert stop_times['stop_sequence'].dtype == np.int8
+    for column in ('arrival_time', 'departure_time'):
+        assert stop_times[column].dtype == np.int32
+
+
+def test_station_data_uses_string_ids(tmp_path):
+    stations = build_station_data(load_feed_data(tmp_path))
+    assert [(station['stop_id'], station['line']) for station in stations] == [('A', 'R1'), ('B', 'R2'), ('Z', 'R1')]
+    assert all(type(station['stop_id']) is str for station in stations)
@@ -0,0 +1,29 @@
+# tests/test_instrumentation.py
+# 탐색 계측 (라운드별 기록, 단계별 시간, Prometheus 출력)
+from services.raptor.instrumentation import SearchMetrics
+from services.raptor.router import Raptor
+from tests.test_router import build_timetable, secs
+
+
+def test_search_records_rounds_and_phases(tmp_path):
+    recorded = []
+    metrics = SearchMetrics(hooks=[recorded.append])
+    Raptor(build_timetable(tmp_path), metrics=metrics).pareto_search('A', 'Z', secs('07:55:00'), 3)
+
+    assert len(recorded) == 1
+    stats = recorded[0]
+    assert [record['round'] for record in stats.rounds] == list(range(len(stats.rounds)))
+    assert stats.counters['trips_scanned'] > 0
+    snapshot = metrics.snapshot()
+    assert snapshot['searches'] == 1 and snapshot['phases']
+
+    text = metrics.render_prometheus({'raptor_pool_pending': 0}, {'raptor_cache_hits': 2})
+    assert 'raptor_search_seconds_count 1' in text
+    assert 'raptor_cache_hits_total 2' in text
+    assert 'raptor_pool_pending 0' in text
+
+
+def test_disabled_metrics_collect_nothing(tmp_path):
+    metrics = SearchMetrics(enabled=False)
+    Raptor(build_timetable(tmp_path), metrics=metrics).pareto_search('A', 'Z', secs('07:55:00'), 3)
+    assert metrics.snapshot()['searches'] == 0
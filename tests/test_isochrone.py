@@ -0,0 +1,54 @@
+# tests/test_isochrone.py
+# 시간 예산별 도달 가능 정류장과 도보 반경 폴리곤
+import types
+import numpy as np
+import pandas as pd
+import shapely
+from services.geo.isochrone import isochrone_polygons, reachable_stops
+from services.gtfs.gtfs_loader import create_gdf
+from services.raptor.router import INF_TIME, Raptor
+from tests.test_router import build_timetable, secs
+
+STOPS = pd.DataFrame({
+    'stop_id': ['A', 'B', 'C', 'D'],
+    'stop_lat': [37.50, 37.51, 37.52, 37.53],
+    'stop_lon': [127.0, 127.0, 127.0, 127.0],
+})
+
+
+def test_reachable_stops_per_budget():
+    arrivals = np.array([secs('08:00:00'), secs('08:10:00'), INF_TIME, secs('08:25:00')], dtype=np.int32)
+    travel_secs, reachable = reachable_stops(arrivals, secs('08:00:00'), [600, 1200])
+    assert travel_secs.tolist() == [0, 600, -1, -1]
+    assert {budget: stops.tolist() for budget, stops in reachable.items()} == {600: [0, 1], 1200: [0, 1]}
+
+
+def test_reachable_stops_from_one_to_all_search(tmp_path):
+    timetable = build_timetable(tmp_path)
+    state, _ = Raptor(timetable).search_state('A', secs('07:55:00'), 3)
+    travel_secs, reachable = reachable_stops(state.best_arrivals, secs('07:55:00'), [30 * 60, 50 * 60])
+    stop_ids = timetable.stop_ids
+    # B 08:15 (20분), Z 08:40 (45분)
+    assert [stop_ids[i] for i in reachable[30 * 60]] == ['A', 'B']
+    assert [stop_ids[i] for i in reachable[50 * 60]] == ['A', 'B', 'Z']
+
+
+def test_isochrone_polygons_cover_remaining_walk():
+    gdf = create_gdf(types.SimpleNamespace(stops=STOPS))
+    travel_secs = np.array([0, 300, 500, -1])
+    reachable = {600: np.array([0, 1, 2]), 300: np.array([0, 1])}
+    collection = isochrone_polygons(gdf, travel_secs, reachable, walking_speed=1.0, max_walk_secs=200)
+    features = collection['features']
+    assert [feature['properties'] for feature in features] == [
+        {'budget_minutes': 5, 'stops': 2}, {'budget_minutes': 10, 'stops': 3}]
+
+    polygons = [shapely.geometry.shape(feature['geometry']) for feature in features]
+    wgs84 = gdf.to_crs('epsg:4326').geometry
+    # 5분: A는 최대 도보 200m, B는 남은 시간 0초
+    assert polygons[0].contains(wgs84.iloc[0]) and not polygons[0].contains(wgs84.iloc[2])
+    assert polygons[0].area < polygons[1].area
+    # 10분: C는 남은 100초 -> 100m, D는 도달 불가
+    assert polygons[1].contains(wgs84.iloc[2]) and not polygons[1].contains(wgs84.iloc[3])
+    # 반경은 max_walk_secs * walking_speed를 넘지 않음 (A에서 북쪽 300m 지점은 제외)
+    north = shapely.Point(127.0, 37.50 + 300 / 111_000)
+    assert not polygons[1].contains(north)
@@ -0,0 +1,40 @@
+# tests/test_nearest.py
+# 좌표 -> 가까운 정류장 검색 (STRtree, 반경/개수 제한)
+import types
+import pandas as pd
+import pyproj
+import pytest
+from services.geo.nearest import StopLocator
+from services.gtfs.gtfs_loader import create_gdf
+
+STOPS = pd.DataFrame({
+    'stop_id': ['A', 'B', 'C', 'D'],
+    'stop_lat': [37.5000, 37.5020, 37.4990, 37.5200],
+    'stop_lon': [127.0000, 127.0000, 127.0015, 127.0000],
+})
+GEOD = pyproj.Geod(ellps='WGS84')
+
+
+@pytest.fixture
+def locator():
+    return StopLocator(create_gdf(types.SimpleNamespace(stops=STOPS)), walking_speed=1.4)
+
+
+def geodesic(lat, lon, stop):
+    return GEOD.inv(lon, lat, STOPS.stop_lon[stop], STOPS.stop_lat[stop])[2]
+
+
+def test_nearest_stops_in_distance_order(locator):
+    lat, lon = 37.5003, 127.0002
+    nearest = locator.nearest(lat, lon, k=3, radius=1000.0)
+    # D(약 2.2km)는 반경 밖
+    assert [stop for stop, _, _ in nearest] == [0, 2, 1]
+    for stop, distance, walk_secs in nearest:
+        assert distance == pytest.approx(geodesic(lat, lon, stop), abs=1.0)
+        assert walk_secs == -(-distance // 1.4)
+
+
+def test_nearest_respects_k_and_radius(locator):
+    assert [stop for stop, _, _ in locator.nearest(37.5003, 127.0002, k=1)] == [0]
+    assert [stop for stop, _, _ in locator.nearest(37.5003, 127.0002, k=5, radius=187.0)] == [0, 2]
+    assert locator.nearest(37.6, 127.1, radius=1000.0) == []
@@ -0,0 +1,65 @@
+# tests/test_query_cache.py
+# 경로 캐시 (LRU/TTL, 출발역-도착역 경로 캐시)
+from services.raptor.query_cache import QueryCache, cached_journeys, cached_search_state
+from services.raptor.router import Raptor
+from tests.test_router import build_timetable, secs
+
+
+def test_cached_journeys_reuses_point_to_point_result(tmp_path):
+    router = Raptor(build_timetable(tmp_path))
+    cache = QueryCache(max_entries=8, ttl=0)
+    first = cached_journeys(router, cache, 'A', 'Z', secs('07:55:00'), 3, ('v1',))
+    second = cached_journeys(router, cache, 'A', 'Z', secs('07:55:00'), 3, ('v1',))
+    assert second is first
+    assert first == router.pareto_search('A', 'Z', secs('07:55:00'), 3)[0]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = QueryCache(max_entries=8, ttl=10, clock=clock)
+    cache.put('key', 'value')
+    clock.now = 10
+    assert cache.get('key') == 'value'
+    clock.now = 10.5
+    assert cache.get('key') is None
+    assert cache.stats()['evictions'] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = QueryCache(max_entries=2, ttl=0)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+
+
+def test_search_state_is_shared_within_departure_bucket(tmp_path):
+    # 출발 시각을 구간 단위로 올림하므로 같은 구간의 요청은 같은 라벨을 사용
+    router = Raptor(build_timetable(tmp_path))
+    cache = QueryCache(max_entries=8, ttl=0)
+    state, _, search_secs = cached_search_state(router, cache, 'A', secs('07:51:00'), 3, ('v1',), 300)
+    again, _, again_secs = cached_search_state(router, cache, 'A', secs('07:54:59'), 3, ('v1',), 300)
+    assert search_secs == again_secs == secs('07:55:00')
+    assert again is state
+
+
+def test_feed_version_is_part_of_key(tmp_path):
+    # 피드 교체 후에는 이전 버전 라벨을 쓰지 않고 새로 탐색
+    router = Raptor(build_timetable(tmp_path))
+    cache = QueryCache(max_entries=8, ttl=0)
+    old, _, _ = cached_search_state(router, cache, 'A', secs('07:55:00'), 3, ('v1',), 300)
+    new, _, _ = cached_search_state(router, cache, 'A', secs('07:55:00'), 3, ('v2',), 300)
+    assert new is not old
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert cached_search_state(router, cache, 'A', secs('07:55:00'), 3, ('v1',), 300)[0] is old
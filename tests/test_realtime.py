@@ -0,0 +1,172 @@
+# tests/test_realtime.py
+# GTFS-Realtime 지연 반영 (운행일 일치, 추월 trip 제외, 바뀐 노선만 덧씌움, 백그라운드 갱신)
+import datetime
+import functools
+import time
+import zoneinfo
+import numpy as np
+import pytest
+from google.transit import gtfs_realtime_pb2
+from config import SERVICE_TIMEZONE
+from services.gtfs.feed_cache import load_compiled_feed
+from services.gtfs.feed_registry import FeedRegistry
+from services.gtfs.realtime import RealtimeOverlay
+from services.raptor.router import Raptor
+from tests.test_feed_registry import write_feed
+from tests.test_router import build_timetable, secs
+
+TODAY = datetime.date(2026, 3, 2)
+
+
+def write_updates(path, updates, start_date=TODAY):
+    """
+    updates: [(trip_id, 출발 지연(초) 또는 None(운행 취소))]
+    """
+    message = gtfs_realtime_pb2.FeedMessage()
+    message.header.gtfs_realtime_version = '2.0'
+    message.header.timestamp = 1
+    for trip_id, delay in updates:
+        entity = message.entity.add()
+        entity.id = trip_id
+        trip = entity.trip_update.trip
+        trip.trip_id = trip_id
+        if start_date is not None:
+            trip.start_date = start_date.strftime('%Y%m%d')
+        if delay is None:
+            trip.schedule_relationship = gtfs_realtime_pb2.TripDescriptor.CANCELED
+            continue
+        stop_update = entity.trip_update.stop_time_update.add()
+        stop_update.stop_sequence = 1
+        stop_update.departure.delay = delay
+    path.write_bytes(message.SerializeToString())
+    return str(path)
+
+
+@pytest.fixture
+def timetable(tmp_path):
+    feed_dir = tmp_path / 'feed'
+    feed_dir.mkdir()
+    return build_timetable(feed_dir)
+
+
+def make_overlay(timetable, path, today=TODAY, **kwargs):
+    # stop_sequence 1은 노선 첫 정류장
+    stop_sequences = {trip_id: {1: 0} for trip_id in timetable.trip_ids.tolist()}
+    return RealtimeOverlay(timetable, 'v1', path, stop_sequences=stop_sequences, today=lambda: today, **kwargs)
+
+
+def route_of(timetable, trip_id):
+    trip = timetable.trip_ids.tolist().index(trip_id)
+    return int(np.searchsorted(timetable.route_trip_offsets, trip, side='right')) - 1
+
+
+def arrival(timetable, stop_id, departure='07:55:00'):
+    state, _ = Raptor(timetable).search_state('A', secs(departure), 3)
+    return int(state.best_arrivals[timetable.stop_index[stop_id]])
+
+
+def test_delay_patches_only_affected_route(timetable, tmp_path):
+    overlay = make_overlay(timetable, write_updates(tmp_path / 'rt.pb', [('T3a', 300)]))
+    assert overlay.refresh()
+    patched, version, service_date = overlay.snapshot
+    assert service_date == TODAY and version.startswith('v1-rt')
+    # 08:40 도착이던 B -> Z 환승 경로가 5분 늦어짐
+    assert arrival(timetable, 'Z') == secs('08:40:00')
+    assert arrival(patched, 'Z') == secs('08:45:00')
+    # 바뀐 노선만 따로 보관하고 나머지 배열은 원본과 공유
+    assert list(patched.route_overrides) == [route_of(timetable, 'T3a')]
+    assert patched.arrival_times is timetable.arrival_times
+    assert patched.trip_ids is timetable.trip_ids
+    assert not overlay.refresh()
+
+
+def test_updates_for_other_service_day_are_ignored(timetable, tmp_path):
+    path = write_updates(tmp_path / 'rt.pb', [('T3a', 300)], start_date=TODAY - datetime.timedelta(days=1))
+    overlay = make_overlay(timetable, path)
+    overlay.refresh()
+    patched, _, service_date = overlay.snapshot
+    assert overlay.stats['trips_other_day'] == 1 and overlay.stats['trips_patched'] == 0
+    assert service_date == TODAY and arrival(patched, 'Z') == secs('08:40:00')
+
+
+def test_service_day_change_reapplies_updates(timetable, tmp_path):
+    days = [TODAY]
+    overlay = RealtimeOverlay(timetable, 'v1', write_updates(tmp_path / 'rt.pb', [('T3a', 300)]),
+                              stop_sequences={'T3a': {1: 0}}, today=lambda: days[0])
+    overlay.refresh()
+    assert overlay.stats['trips_patched'] == 1
+    days[0] = TODAY + datetime.timedelta(days=1)
+    assert overlay.refresh()
+    assert overlay.snapshot[2] == days[0] and overlay.stats['trips_other_day'] == 1
+
+
+def test_overtaking_trip_is_dropped(timetable, tmp_path):
+    # 08:05 출발 T2a가 40분 늦어져 08:35 출발 T2b를 추월 -> T2a 탑승 불가, 시각은 임의로 맞추지 않음
+    overlay = make_overlay(timetable, write_updates(tmp_path / 'rt.pb', [('T2a', 2400)]))
+    overlay.refresh()
+    patched = overlay.snapshot[0]
+    assert overlay.stats['trips_overtaking'] == 1
+    assert patched.canceled_trips.tolist() == [trip_id == 'T2a' for trip_id in timetable.trip_ids.tolist()]
+    # T2b(08:45 B 도착) -> T3b(09:10 Z 도착), 직행 R1(09:00)이 더 빠름
+    assert arrival(patched, 'B') == secs('08:45:00')
+    assert arrival(patched, 'Z') == secs('09:00:00')
+    # 탑승 불가 trip을 제외한 trip 순서대로 모든 정류장 시각이 줄지 않음
+    for route in patched.route_overrides:
+        arr_matrix, dep_matrix = patched.route_times(route)
+        assert (np.diff(arr_matrix, axis=0) >= 0).all() and (np.diff(dep_matrix, axis=0) >= 0).all()
+
+
+def test_canceled_trip_is_skipped_forward_and_backward(timetable, tmp_path):
+    overlay = make_overlay(timetable, write_updates(tmp_path / 'rt.pb', [('T3a', None)]))
+    overlay.refresh()
+    patched = overlay.snapshot[0]
+    assert overlay.stats['trips_canceled'] == 1
+    assert arrival(patched, 'Z') == secs('09:00:00')
+    # 도착 기준 탐색(역방향 시간표)도 취소 trip을 타지 않음
+    assert patched.reversed().trip_ids[patched.reversed().canceled_trips].tolist() == ['T3a']
+    journeys = Raptor(patched).arrive_by_search('A', 'Z', secs('08:50:00'), 3)
+    assert journeys == []
+    journeys = Raptor(timetable).arrive_by_search('A', 'Z', secs('08:50:00'), 3)
+    assert [journey['departure_secs'] for journey in journeys] == [secs('08:04:00')]
+
+
+def test_background_thread_refreshes(timetable, tmp_path):
+    overlay = make_overlay(timetable, write_updates(tmp_path / 'rt.pb', [('T3a', 300)]), poll_interval=0.01)
+    overlay.start()
+    try:
+        deadline = time.monotonic() + 5
+        while overlay.snapshot[2] is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert overlay.snapshot[2] == TODAY
+        assert arrival(overlay.snapshot[0], 'Z') == secs('08:45:00')
+    finally:
+        overlay.stop()
+
+
+def test_feed_uses_realtime_only_for_todays_requests(tmp_path):
+    today = datetime.datetime.now(zoneinfo.ZoneInfo(SERVICE_TIMEZONE)).date()
+    # stop_id로 정류장 지정 (stop_sequence 매핑은 피드 테이블에서 생성)
+    message = gtfs_realtime_pb2.FeedMessage()
+    message.header.gtfs_realtime_version = '2.0'
+    entity = message.entity.add()
+    entity.id = 'T3a'
+    entity.trip_update.trip.trip_id = 'T3a'
+    entity.trip_update.trip.start_date = today.strftime('%Y%m%d')
+    stop_update = entity.trip_update.stop_time_update.add()
+    stop_update.stop_id = 'B'
+    stop_update.departure.delay = 300
+    (tmp_path / 'rt.pb').write_bytes(message.SerializeToString())
+
+    registry = FeedRegistry({'seoul': write_feed(tmp_path / 'seoul.zip')}, 'seoul', 1024, 60,
+                            realtime_paths={'seoul': str(tmp_path / 'rt.pb')},
+                            loader=functools.partial(load_compiled_feed, cache_root=str(tmp_path / 'cache')))
+    feed = registry.get()
+    try:
+        deadline = time.monotonic() + 5
+        while feed.realtime.snapshot[2] is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        timetable, version = feed.snapshot_for(today)
+        assert version != feed.static_version and arrival(timetable, 'Z') == secs('08:45:00')
+        assert feed.snapshot_for(today + datetime.timedelta(days=1)) == feed.static_snapshot
+    finally:
+        feed.close()
@@ -0,0 +1,42 @@
+# tests/test_route_map_store.py
+# 경로 지도 저장소 (워커 프로세스 사이 공유)
+import os
+from server.route_map_store import RouteMapStore
+
+GEOMETRY = {
+    'type': 'FeatureCollection',
+    'features': [
+        {'type': 'Feature', 'geometry': {'type': 'LineString', 'coordinates': [[127.0, 37.5], [127.0, 37.51]]},
+         'properties': {'color': '#0052A4'}},
+        {'type': 'Feature', 'geometry': {'type': 'Point', 'coordinates': [127.0, 37.5]},
+         'properties': {'color': '#0052A4', 'station': 'A'}},
+        {'type': 'Feature', 'geometry': {'type': 'Point', 'coordinates': [127.0, 37.51]},
+         'properties': {'color': '#0052A4', 'station': 'B'}},
+    ],
+}
+
+
+def test_map_saved_by_one_worker_is_served_by_another(tmp_path):
+    digest = RouteMapStore(str(tmp_path), max_maps=8).put(GEOMETRY)
+    other = RouteMapStore(str(tmp_path), max_maps=8)
+    html = other.html(digest)
+    assert html is not None and '<html' in html.lower()
+    assert other.html(digest) == html
+    assert other.stats()['renders'] == 1 and other.stats()['hits'] == 1
+
+
+def test_unknown_or_invalid_digest(tmp_path):
+    store = RouteMapStore(str(tmp_path), max_maps=8)
+    assert store.html('0123456789abcdef') is None
+    assert store.html('../../etc/passwd') is None
+
+
+def test_oldest_maps_are_pruned(tmp_path):
+    store = RouteMapStore(str(tmp_path), max_maps=2)
+    digests = []
+    for offset in range(3):
+        digests.append(store.put({**GEOMETRY, 'offset': offset}))
+        # 저장 순서대로 수정 시각 지정 (파일 시스템 시각 해상도와 무관하게)
+        os.utime(tmp_path / f'{digests[-1]}.json', ns=(offset * 10**9, offset * 10**9))
+    remaining = {path.stem for path in tmp_path.glob('*.json')}
+    assert digests[0] not in remaining and len(remaining) == 2
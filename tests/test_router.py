@@ -0,0 +1,121 @@
+# tests/test_router.py
+# 배열 RAPTOR 탐색 동작 테스트 (합성 피드)
+#
+# A --R1--> Z                  R1: A 08:00 출발, Z 09:00 도착 (직행, 느림)
+# A --R2--> B --R3--> Z        R2: A 08:05 / 08:35 출발, B에 10분 뒤 도착
+#                              R3: B 08:20 / 08:50 출발, Z에 20분 뒤 도착
+# 정류장 사이는 도보 반경보다 멀어 도보 환승 없음
+import pytest
+from services.gtfs.gtfs_loader import GTFSLoader, create_gdf
+from services.raptor.router import Raptor, group_batch_queries
+from services.raptor.timetable import RaptorTimetable
+
+FEED = {
+    'agency.txt': "agency_id,agency_name,agency_url,agency_timezone\nX,X,http://x,Asia/Seoul\n",
+    'calendar.txt': "service_id,monday,tuesday,wednesday,thursday,friday,saturday,sunday,start_date,end_date\n"
+                    "S,1,1,1,1,1,1,1,20240101,20301231\n",
+    'stops.txt': "stop_id,stop_name,stop_lat,stop_lon\n"
+                 "A,A,37.5000,127.0000\nB,B,37.5100,127.0000\nZ,Z,37.5200,127.0000\n",
+    'routes.txt': "route_id,agency_id,route_short_name,route_type\nR1,X,R1,1\nR2,X,R2,1\nR3,X,R3,1\n",
+    'trips.txt': "route_id,service_id,trip_id\nR1,S,T1\nR2,S,T2a\nR2,S,T2b\nR3,S,T3a\nR3,S,T3b\n",
+    'stop_times.txt': "trip_id,arrival_time,departure_time,stop_id,stop_sequence\n"
+                      "T1,08:00:00,08:00:00,A,1\nT1,09:00:00,09:00:00,Z,2\n"
+                      "T2a,08:05:00,08:05:00,A,1\nT2a,08:15:00,08:15:00,B,2\n"
+                      "T2b,08:35:00,08:35:00,A,1\nT2b,08:45:00,08:45:00,B,2\n"
+                      "T3a,08:20:00,08:20:00,B,1\nT3a,08:40:00,08:40:00,Z,2\n"
+                      "T3b,08:50:00,08:50:00,B,1\nT3b,09:10:00,09:10:00,Z,2\n",
+}
+
+
+def build_timetable(tmp_path, feed=FEED):
+    for name, content in feed.items():
+        (tmp_path / name).write_text(content, encoding='utf-8')
+    loader = GTFSLoader(str(tmp_path))
+    loader.load_feed()
+    feed_data = loader.get_feed_data()
+    return RaptorTimetable.from_feed(feed_data, create_gdf(feed_data))
+
+
+def secs(hhmmss):
+    h, m, s = map(int, hhmmss.split(':'))
+    return h * 3600 + m * 60 + s
+
+
+@pytest.fixture
+def timetable(tmp_path):
+    return build_timetable(tmp_path)
+
+
+def test_range_search_returns_each_non_dominated_departure(timetable):
+    # 출발 시각은 탑승 시각 - transfer_wait(60초)
+    journeys = Raptor(timetable).range_search('A', 'Z', secs('07:30:00'), secs('08:40:00'), 3)
+    assert [(journey['departure_secs'], journey['arrival_secs'], journey['trips']) for journey in journeys] == [
+        (secs('07:59:00'), secs('09:00:00'), 1),
+        (secs('08:04:00'), secs('08:40:00'), 2),
+        (secs('08:34:00'), secs('09:10:00'), 2),
+    ]
+
+
+def test_range_search_matches_single_departure_searches(timetable):
+    # 시간대 탐색의 각 경로는 그 출발 시각에서 단일 탐색한 도착 시각과 같아야 함
+    router = Raptor(timetable)
+    for journey in router.range_search('A', 'Z', secs('07:30:00'), secs('08:40:00'), 3):
+        single, _ = router.pareto_search('A', 'Z', journey['departure_secs'], 3)
+        assert journey['arrival_secs'] in [candidate['arrival_secs'] for candidate in single]
+
+
+def test_range_search_outside_window_is_empty(timetable):
+    assert Raptor(timetable).range_search('A', 'Z', secs('09:00:00'), secs('10:00:00'), 3) == []
+
+
+def test_pareto_search_returns_fewer_transfers_and_faster_journeys(timetable):
+    journeys, _ = Raptor(timetable).pareto_search('A', 'Z', secs('07:55:00'), 3)
+    assert [(journey['trips'], journey['transfers'], journey['arrival_secs']) for journey in journeys] == [
+        (1, 0, secs('09:00:00')),
+        (2, 1, secs('08:40:00')),
+    ]
+    assert journeys[-1]['route'] == ['A', 'B', 'Z']
+
+
+def test_pareto_search_pruning_matches_untargeted_labels(timetable):
+    # 목적지 기준 가지치기를 해도 목적지 없이 탐색한 라벨에서 뽑은 파레토 경로와 같아야 함
+    router = Raptor(timetable)
+    departure_secs = secs('07:55:00')
+    state, _ = router.search_state('A', departure_secs, 3)
+    untargeted = router.pareto_journeys(state, 'Z', departure_secs)
+    targeted, _ = router.pareto_search('A', 'Z', departure_secs, 3)
+    assert [(journey['trips'], journey['arrival_secs']) for journey in targeted] == \
+           [(journey['trips'], journey['arrival_secs']) for journey in untargeted]
+
+
+def test_point_to_point_search_returns_only_target(timetable):
+    router = Raptor(timetable)
+    departure_secs = secs('07:55:00')
+    targeted = router.raptor_search('A', departure_secs, 3, 'Z')[0]
+    untargeted = router.raptor_search('A', departure_secs, 3)[0]
+    assert list(targeted) == ['Z']
+    assert set(untargeted) == {'A', 'B', 'Z'}
+    assert targeted['Z'] == untargeted['Z']
+
+
+def test_round_labels(timetable):
+    # 라운드 k 라벨은 trip k개 이하로 닿는 가장 이른 도착 시각
+    _, arrivals, parents, *_ = Raptor(timetable).raptor_search('A', secs('07:55:00'), 3)
+    index = timetable.stop_index
+    assert arrivals[0, index['A']] == secs('07:55:00')
+    assert arrivals[1, index['B']] == secs('08:15:00')
+    assert arrivals[1, index['Z']] == secs('09:00:00')
+    assert arrivals[2, index['Z']] == secs('08:40:00')
+    assert parents['stop'][2, index['Z']] == index['B']
+
+
+def test_batch_search_groups_origins(timetable):
+    queries = [('A', 'Z', secs('07:55:00')), ('A', 'B', secs('07:55:00')), ('X', 'Z', secs('07:55:00'))]
+    assert group_batch_queries(queries) == {('A', secs('07:55:00')): ['Z', 'B'], ('X', secs('07:55:00')): ['Z']}
+    results = list(Raptor(timetable).batch_search(queries, 3))
+    assert [(result['from_station'], result['to_station'], result.get('arrival_secs')) for result in results] == [
+        ('A', 'Z', secs('08:40:00')),
+        ('A', 'B', secs('08:15:00')),
+        ('X', 'Z', None),
+    ]
+    assert results[0]['transfers'] == 1 and results[2]['error'] == '알 수 없는 출발역'
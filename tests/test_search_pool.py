@@ -0,0 +1,93 @@
+# tests/test_search_pool.py
+# 탐색 작업 풀 일괄 실행 (map_unordered)
+import threading
+import time
+import pytest
+from services.raptor.router import SearchTimeout
+from services.raptor.search_pool import PoolOverloaded, SearchPool
+
+
+def test_map_unordered_limits_window():
+    pool = SearchPool(workers=4, max_queue=0)
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def work(value, deadline):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+        return value * 2
+
+    results = dict(pool.map_unordered(work, [(value,) for value in range(6)], window=2, timeout=5))
+    assert results == {(value,): value * 2 for value in range(6)}
+    assert peak[0] <= 2
+
+
+def test_map_unordered_deadline_per_task():
+    pool = SearchPool(workers=2, max_queue=0)
+
+    def work(delay, deadline):
+        time.sleep(delay)
+        return delay
+
+    results = dict(pool.map_unordered(work, [(0.0,), (0.5,)], window=2, timeout=0.1))
+    assert results[(0.0,)] == 0.0
+    assert isinstance(results[(0.5,)], SearchTimeout)
+    assert pool.stats()['timeouts'] == 1
+
+
+def test_map_unordered_rejects_when_pool_is_full():
+    pool = SearchPool(workers=1, max_queue=0)
+    release = threading.Event()
+    pool.submit(release.wait)
+    try:
+        with pytest.raises(PoolOverloaded):
+            pool.map_unordered(lambda value, deadline: value, [(1,)], window=1, timeout=1)
+    finally:
+        release.set()
+
+
+def test_run_rejects_over_admission_limit():
+    # 실행 1 + 대기 1까지 받고 그 이상은 즉시 거부
+    pool = SearchPool(workers=1, max_queue=1)
+    release = threading.Event()
+    running = pool.submit(release.wait)
+    queued = pool.submit(lambda: 'queued')
+    try:
+        with pytest.raises(PoolOverloaded):
+            pool.run(lambda: 'rejected')
+        assert pool.stats()['rejected'] == 1
+    finally:
+        release.set()
+    assert running.result(1) and queued.result(1) == 'queued'
+    assert pool.run(lambda: 'accepted') == 'accepted'
+    assert pool.stats()['pending'] == 0
+
+
+def test_run_times_out_at_deadline():
+    pool = SearchPool(workers=1, max_queue=0)
+    release = threading.Event()
+    try:
+        with pytest.raises(SearchTimeout):
+            pool.run(release.wait, deadline=time.monotonic() + 0.05)
+        assert pool.stats()['timeouts'] == 1
+    finally:
+        release.set()
+
+
+def test_run_coalesces_same_key():
+    pool = SearchPool(workers=2, max_queue=0)
+    release, calls = threading.Event(), []
+
+    def search():
+        calls.append(1)
+        release.wait()
+        return 'labels'
+
+    first = pool.submit(search, key='A')
+    second = pool.submit(search, key='A')
+    release.set()
+    assert second is first and first.result(1) == 'labels'
+    assert len(calls) == 1 and pool.stats()['coalesced'] == 1
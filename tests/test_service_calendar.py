@@ -0,0 +1,69 @@
+# tests/test_service_calendar.py
+# 운행 달력 (요일/기간, calendar_dates 예외, 자정 넘는 전날 trip, 한 시간표로 여러 날짜 처리)
+import datetime
+import pytest
+from services.raptor.router import INF_TIME, Raptor
+from services.raptor.timetable import RaptorTimetable
+from tests.test_router import FEED, build_timetable, secs
+
+MONDAY = datetime.date(2026, 3, 2)
+# 평일(WK) / 주말(WE) 운행, 3월 3일(화)은 휴일이라 주말 시간표
+CALENDAR_FEED = dict(FEED, **{
+    'calendar.txt': "service_id,monday,tuesday,wednesday,thursday,friday,saturday,sunday,start_date,end_date\n"
+                    "WK,1,1,1,1,1,0,0,20260101,20261231\nWE,0,0,0,0,0,1,1,20260101,20261231\n",
+    'calendar_dates.txt': "service_id,date,exception_type\nWK,20260303,2\nWE,20260303,1\n",
+    'stops.txt': "stop_id,stop_name,stop_lat,stop_lon\nA,A,37.5000,127.0000\nZ,Z,37.5200,127.0000\n",
+    'routes.txt': "route_id,agency_id,route_short_name,route_type\nR1,X,R1,1\n",
+    # T3: 평일 운행일의 24:30 출발 (다음 날 00:30)
+    'trips.txt': "route_id,service_id,trip_id\nR1,WK,T1\nR1,WE,T2\nR1,WK,T3\n",
+    'stop_times.txt': "trip_id,arrival_time,departure_time,stop_id,stop_sequence\n"
+                      "T1,08:00:00,08:00:00,A,1\nT1,09:00:00,09:00:00,Z,2\n"
+                      "T2,10:00:00,10:00:00,A,1\nT2,11:00:00,11:00:00,Z,2\n"
+                      "T3,24:30:00,24:30:00,A,1\nT3,25:00:00,25:00:00,Z,2\n",
+})
+
+
+@pytest.fixture
+def timetable(tmp_path):
+    return build_timetable(tmp_path, CALENDAR_FEED)
+
+
+def arrival(timetable, service_date, departure):
+    state, _ = Raptor(timetable, service_date=service_date).search_state('A', secs(departure), 3)
+    return int(state.best_arrivals[timetable.stop_index['Z']])
+
+
+def test_weekday_and_weekend_services(timetable):
+    assert arrival(timetable, MONDAY, '07:55:00') == secs('09:00:00')
+    assert arrival(timetable, MONDAY + datetime.timedelta(days=5), '07:55:00') == secs('11:00:00')
+
+
+def test_calendar_dates_exceptions(timetable):
+    # 휴일(화): 평일 운행 제외, 주말 운행 추가
+    assert arrival(timetable, MONDAY + datetime.timedelta(days=1), '07:55:00') == secs('11:00:00')
+    assert arrival(timetable, MONDAY + datetime.timedelta(days=2), '07:55:00') == secs('09:00:00')
+
+
+def test_previous_day_trip_after_midnight(timetable):
+    # 토요일 00:10: 금요일 운행 T3 (24:30 = 토요일 00:30 출발)
+    saturday = MONDAY + datetime.timedelta(days=5)
+    assert arrival(timetable, saturday, '00:10:00') == secs('01:00:00')
+    # 일요일 00:10: 토요일은 평일 운행이 없어 T3 없음 (일요일 10:00 T2는 대기 한도 3시간 밖)
+    assert arrival(timetable, saturday + datetime.timedelta(days=1), '00:10:00') == INF_TIME
+    # 날짜 미지정: 달력과 무관하게 모든 trip
+    assert arrival(timetable, None, '07:55:00') == secs('09:00:00')
+
+
+def test_outside_calendar_range_has_no_service(timetable):
+    assert not timetable.calendar.active_services(datetime.date(2027, 1, 4)).any()
+    assert arrival(timetable, datetime.date(2027, 1, 4), '07:55:00') == INF_TIME
+
+
+def test_calendar_survives_save_and_load(timetable, tmp_path):
+    timetable.save(tmp_path / 'compiled')
+    foot_paths = (timetable.foot_offsets, timetable.foot_neighbors, timetable.foot_walk_secs)
+    loaded = RaptorTimetable.load(tmp_path / 'compiled', foot_paths)
+    assert loaded.calendar.start_date == timetable.calendar.start_date
+    for day in range(7):
+        date = MONDAY + datetime.timedelta(days=day)
+        assert arrival(loaded, date, '07:55:00') == arrival(timetable, date, '07:55:00')
@@ -0,0 +1,62 @@
+# tests/test_station_index.py
+# 역 이름 검색 (접두어 우선, 부분 문자열 역색인, 초성, 호선 한정)
+from services.gtfs.station_index import StationIndex
+
+STATIONS = [
+    {'stop_id': '0222', 'stop_name': '강남', 'operator': 'A1', 'line': '2호선', 'line_info': []},
+    {'stop_id': 'D7', 'stop_name': '강남', 'operator': 'A3', 'line': '신분당선', 'line_info': []},
+    {'stop_id': '0329', 'stop_name': '고속터미널', 'operator': 'A1', 'line': '3호선', 'line_info': []},
+    {'stop_id': '0230', 'stop_name': '신도림', 'operator': 'A1', 'line': '2호선', 'line_info': []},
+    {'stop_id': '0150', 'stop_name': '서울역', 'operator': 'A1', 'line': '1호선', 'line_info': []},
+    {'stop_id': '0239', 'stop_name': '잠실나루', 'operator': 'A1', 'line': '2호선', 'line_info': []},
+    {'stop_id': '0216', 'stop_name': '잠실', 'operator': 'A1', 'line': '2호선', 'line_info': []},
+    {'stop_id': '0247', 'stop_name': '강변', 'operator': 'A1', 'line': '2호선', 'line_info': []},
+]
+
+
+def stop_ids(stations):
+    return [station['stop_id'] for station in stations]
+
+
+def test_prefix_matches_come_before_substring_matches():
+    index = StationIndex(STATIONS)
+    # "강"으로 시작하는 역(이름순) 다음에 "강"이 들어간 역
+    assert stop_ids(index.search('강', limit=10)) == ['0222', 'D7', '0247']
+    assert stop_ids(index.search('실', limit=10)) == ['0216', '0239']
+    assert stop_ids(index.search('도림')) == ['0230']
+    assert stop_ids(index.search('터미널 ')) == ['0329']
+    assert index.search('없는역') == [] and index.search('  ') == []
+
+
+def test_station_suffix_and_limit():
+    index = StationIndex(STATIONS)
+    # 이름에 "역"이 있으면 그대로, 없으면 "역"을 뺀 이름으로 찾음
+    assert stop_ids(index.search('서울역')) == ['0150']
+    assert stop_ids(index.search('잠실역')) == ['0216', '0239']
+    assert stop_ids(index.search('강', limit=2)) == ['0222', 'D7']
+
+
+def test_substring_index_matches_linear_scan():
+    index = StationIndex(STATIONS)
+    names = [station['stop_name'] for station in STATIONS]
+    for query in ['강', '남', '실나', '울역', '신', '터미널', '림', '나루', '남강', '울']:
+        found = stop_ids(index.search(query, limit=len(STATIONS)))
+        assert sorted(found) == sorted(STATIONS[i]['stop_id'] for i, name in enumerate(names) if query in name)
+
+
+def test_choseong_search():
+    index = StationIndex(STATIONS)
+    assert stop_ids(index.search('ㄱㄴ')) == ['0222', 'D7']
+    assert stop_ids(index.search('ㅈㅅ')) == ['0216', '0239']
+    assert stop_ids(index.search('ㄷㄹ')) == ['0230']
+
+
+def test_line_filter_and_line_list():
+    index = StationIndex(STATIONS)
+    assert stop_ids(index.search('강남', line='신분당선')) == ['D7']
+    assert stop_ids(index.search('ㄱ', line='2호선')) == ['0222', '0247']
+    assert index.search('강남', line='3호선') == []
+    assert stop_ids(index.line_stations('2호선')) == ['0222', '0247', '0230', '0216', '0239']
+    assert index.line_stations('9호선') == []
+    assert index.lines == [{'line': '1호선', 'operator': 'A1'}, {'line': '2호선', 'operator': 'A1'},
+                           {'line': '3호선', 'operator': 'A1'}, {'line': '신분당선', 'operator': 'A3'}]
@@ -0,0 +1,55 @@
+# tests/test_subset.py
+# GTFS 부분 추출 (정류장/노선/좌표 조건, stop_times 청크 스트리밍, 관련 테이블 정리)
+import pytest
+from services.gtfs.subset import GTFSSource, subset_feed
+from services.gtfs.gtfs_loader import GTFSLoader, create_gdf
+from services.raptor.router import Raptor
+from services.raptor.timetable import RaptorTimetable
+from tests.test_feed_registry import write_feed
+from tests.test_router import secs
+
+
+def read_table(path, name):
+    source = GTFSSource(str(path))
+    try:
+        return source.read(name)
+    finally:
+        source.close()
+
+
+def test_route_subset_keeps_related_rows(tmp_path):
+    output = tmp_path / 'r23.zip'
+    # 청크 2행: stop_times를 여러 청크로 나눠 기록해도 헤더는 한 번
+    counts = subset_feed(write_feed(tmp_path / 'feed.zip'), str(output), route_pattern='^R[23]$', chunksize=2)
+    assert counts == {'stop_times': 8, 'stops': 3, 'routes': 2, 'trips': 4, 'agency': 1, 'calendar': 1}
+    assert read_table(output, 'trips.txt')['trip_id'].tolist() == ['T2a', 'T2b', 'T3a', 'T3b']
+    assert read_table(output, 'stop_times.txt')['arrival_time'].tolist()[:2] == ['08:05:00', '08:15:00']
+
+    # 추출한 피드로 바로 경로 탐색 (R1 직행 없이 B 환승)
+    loader = GTFSLoader(str(output))
+    loader.load_feed()
+    feed_data = loader.get_feed_data()
+    timetable = RaptorTimetable.from_feed(feed_data, create_gdf(feed_data))
+    state, _ = Raptor(timetable).search_state('A', secs('07:55:00'), 3)
+    assert state.best_arrivals[timetable.stop_index['Z']] == secs('08:40:00')
+
+
+def test_stop_and_bbox_subsets(tmp_path):
+    source = write_feed(tmp_path / 'feed.zip')
+    # 정류장 A, B만 (위도 37.505 이하는 A): 두 조건 모두 만족하는 행만
+    subset_feed(source, str(tmp_path / 'a.zip'), stop_prefix='A', bbox=(126.9, 37.49, 127.1, 37.505))
+    assert read_table(tmp_path / 'a.zip', 'stops.txt')['stop_id'].tolist() == ['A']
+    assert set(read_table(tmp_path / 'a.zip', 'stop_times.txt')['trip_id']) == {'T1', 'T2a', 'T2b'}
+
+    counts = subset_feed(source, str(tmp_path / 'b.zip'), bbox=(126.9, 37.505, 127.1, 37.515))
+    assert counts['stops'] == 1 and counts['trips'] == 4 and counts['routes'] == 2
+
+
+def test_subset_requires_condition_and_leaves_no_partial_file(tmp_path):
+    source = write_feed(tmp_path / 'feed.zip')
+    with pytest.raises(ValueError):
+        subset_feed(source, str(tmp_path / 'out.zip'))
+    # 기록 중 실패하면 임시 zip을 지우고 출력 파일을 만들지 않음
+    with pytest.raises(ValueError):
+        subset_feed(source, str(tmp_path / 'out.zip'), route_pattern='R1', chunksize=0)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['feed.zip']
@@ -0,0 +1,52 @@
+# tests/test_timetable.py
+# 시간표 저장/memory-map 불러오기 (워커 프로세스 간 공유)
+import numpy as np
+from services.raptor.router import Raptor
+from services.raptor.timetable import RaptorTimetable, TIMETABLE_ARRAYS, DERIVED_ARRAYS
+from tests.test_router import build_timetable, secs
+
+
+def memory_mapped(array):
+    # ndarray 뷰로 감싼 memory-map도 base를 따라가 확인
+    while array is not None and not isinstance(array, np.memmap):
+        array = array.base
+    return array is not None
+
+
+def test_loaded_timetable_is_read_only_memory_map(tmp_path):
+    timetable = build_timetable(tmp_path)
+    timetable.save(tmp_path / 'timetable')
+    foot_paths = (timetable.foot_offsets, timetable.foot_neighbors, timetable.foot_walk_secs)
+    loaded = RaptorTimetable.load(tmp_path / 'timetable', foot_paths)
+    for name in ('route_stops', 'arrival_times', 'departure_times', 'departure_keys'):
+        array = getattr(loaded, name)
+        assert memory_mapped(array) and not array.flags.writeable
+    for name in TIMETABLE_ARRAYS + DERIVED_ARRAYS:
+        np.testing.assert_array_equal(getattr(loaded, name), getattr(timetable, name))
+
+    journeys, _ = Raptor(loaded).pareto_search('A', 'Z', secs('07:55:00'), 3)
+    assert journeys == Raptor(timetable).pareto_search('A', 'Z', secs('07:55:00'), 3)[0]
+
+
+def test_from_feed_groups_trips_by_stop_pattern(tmp_path):
+    timetable = build_timetable(tmp_path)
+    stop_ids = timetable.stop_ids
+    patterns = {str(timetable.route_ids[route]): [str(stop_ids[stop]) for stop in timetable.route_stop_slice(route)]
+                for route in range(timetable.n_routes)}
+    assert sorted(patterns.values()) == [['A', 'B'], ['A', 'Z'], ['B', 'Z']]
+    for route in range(timetable.n_routes):
+        arrivals, departures = timetable.route_times(route)
+        # trip은 출발 시각순 (같은 노선 안에서 추월 없음)
+        assert (np.diff(departures[:, 0]) >= 0).all()
+
+
+def test_searches_do_not_modify_timetable(tmp_path):
+    # 시간표는 한 번 만들어 모든 탐색이 공유 (탐색이 배열을 바꾸지 않아야 함)
+    timetable = build_timetable(tmp_path)
+    before = {name: getattr(timetable, name).copy() for name in TIMETABLE_ARRAYS + DERIVED_ARRAYS}
+    router = Raptor(timetable)
+    router.pareto_search('A', 'Z', secs('07:55:00'), 3)
+    router.range_search('A', 'Z', secs('07:30:00'), secs('08:40:00'), 3)
+    router.arrive_by_search('A', 'Z', secs('09:00:00'), 3)
+    for name, array in before.items():
+        np.testing.assert_array_equal(getattr(timetable, name), array)
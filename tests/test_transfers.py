@@ -0,0 +1,107 @@
+# tests/test_transfers.py
+# transfers.txt 환승 시간 반영 회귀 테스트 (합성 피드)
+#
+# A --R1--> B --R2--> C
+#           B ~100m 도보~ B2 --R3--> D
+# R1: A 08:00 출발, B 08:10 도착
+# R2: B 08:12 / 08:20 출발, C에 10분 뒤 도착
+# R3: B2 08:13:00 / 08:14:30 / 08:30 출발, D에 10분 뒤 도착
+import numpy as np
+import pytest
+from services.gtfs.gtfs_loader import GTFSLoader, create_gdf
+from services.raptor.router import Raptor
+from services.raptor.timetable import RaptorTimetable
+
+FEED = {
+    'agency.txt': "agency_id,agency_name,agency_url,agency_timezone\nX,X,http://x,Asia/Seoul\n",
+    'calendar.txt': "service_id,monday,tuesday,wednesday,thursday,friday,saturday,sunday,start_date,end_date\n"
+                    "S,1,1,1,1,1,1,1,20240101,20301231\n",
+    'stops.txt': "stop_id,stop_name,stop_lat,stop_lon\n"
+                 "A,A,37.5000,127.0000\nB,B,37.5100,127.0000\nB2,B2,37.5109,127.0000\n"
+                 "C,C,37.5300,127.0000\nD,D,37.5200,127.0200\n",
+    'routes.txt': "route_id,agency_id,route_short_name,route_type\nR1,X,R1,1\nR2,X,R2,1\nR3,X,R3,1\n",
+    'trips.txt': "route_id,service_id,trip_id\nR1,S,T1\nR2,S,T2a\nR2,S,T2b\nR3,S,T3a\nR3,S,T3b\nR3,S,T3c\n",
+    'stop_times.txt': "trip_id,arrival_time,departure_time,stop_id,stop_sequence\n"
+                      "T1,08:00:00,08:00:00,A,1\nT1,08:10:00,08:10:00,B,2\n"
+                      "T2a,08:12:00,08:12:00,B,1\nT2a,08:22:00,08:22:00,C,2\n"
+                      "T2b,08:20:00,08:20:00,B,1\nT2b,08:30:00,08:30:00,C,2\n"
+                      "T3a,08:13:00,08:13:00,B2,1\nT3a,08:23:00,08:23:00,D,2\n"
+                      "T3b,08:14:30,08:14:30,B2,1\nT3b,08:24:30,08:24:30,D,2\n"
+                      "T3c,08:30:00,08:30:00,B2,1\nT3c,08:40:00,08:40:00,D,2\n",
+}
+DEPARTURE = 7 * 3600 + 55 * 60
+
+
+def build_timetable(tmp_path, transfers=None):
+    for name, content in FEED.items():
+        (tmp_path / name).write_text(content, encoding='utf-8')
+    if transfers is not None:
+        (tmp_path / 'transfers.txt').write_text(
+            "from_stop_id,to_stop_id,transfer_type,min_transfer_time\n" + transfers, encoding='utf-8')
+    loader = GTFSLoader(str(tmp_path))
+    loader.load_feed()
+    feed = loader.get_feed_data()
+    return RaptorTimetable.from_feed(feed, create_gdf(feed))
+
+
+def arrival(timetable, destination):
+    labels = Raptor(timetable).raptor_search('A', DEPARTURE, 3)[1]
+    best = int(labels[:, timetable.stop_index[destination]].min())
+    return None if best >= np.iinfo(np.int32).max else best
+
+
+def secs(hhmmss):
+    h, m, s = map(int, hhmmss.split(':'))
+    return h * 3600 + m * 60 + s
+
+
+def test_default_transfers(tmp_path):
+    # transfers.txt가 없으면 같은 정류장 환승은 transfer_wait, 도보 환승은 max(보행시간, transfer_wait)
+    timetable = build_timetable(tmp_path)
+    assert arrival(timetable, 'C') == secs('08:22:00')
+    assert arrival(timetable, 'D') == secs('08:23:00')
+
+
+def test_rule_for_boarding_stop_does_not_apply_to_transfer(tmp_path):
+    # A에서 탄 열차로 B에 도착해 B에서 갈아타므로 A -> B 규칙은 환승과 무관
+    timetable = build_timetable(tmp_path, "A,B,3,\n")
+    assert arrival(timetable, 'C') == secs('08:22:00')
+    assert arrival(timetable, 'D') == secs('08:23:00')
+
+
+def test_same_stop_min_transfer_time(tmp_path):
+    timetable = build_timetable(tmp_path, "B,B,2,300\n")
+    assert arrival(timetable, 'C') == secs('08:30:00')
+
+
+def test_pair_min_transfer_time_replaces_walk(tmp_path):
+    # B 08:10:00 도착 + 240초 = 08:14:00 탑승 가능 (보행시간을 한 번 더 더하면 08:14:30 열차를 놓침)
+    timetable = build_timetable(tmp_path, "B,B2,2,240\n")
+    assert arrival(timetable, 'D') == secs('08:24:30')
+
+
+def test_pair_not_possible_blocks_walk_transfer(tmp_path):
+    timetable = build_timetable(tmp_path, "B,B2,3,\n")
+    assert arrival(timetable, 'D') is None
+    assert arrival(timetable, 'C') == secs('08:22:00')
+
+
+def test_pair_rule_is_directional(tmp_path):
+    # B2 -> B 규칙은 B -> B2 환승에 적용되지 않음
+    timetable = build_timetable(tmp_path, "B2,B,3,\n")
+    assert arrival(timetable, 'D') == secs('08:23:00')
+
+
+@pytest.mark.parametrize('transfers, expected', [
+    (None, '08:23:00'),
+    ("B,B2,2,240\n", '08:24:30'),
+    ("B,B2,3,\n", None),
+])
+def test_arrive_by_applies_pair_in_travel_direction(tmp_path, transfers, expected):
+    # 역방향 탐색에서도 B -> B2 규칙이 같은 방향으로 적용되어야 함
+    timetable = build_timetable(tmp_path, transfers)
+    journeys = Raptor(timetable).arrive_by_search('A', 'D', secs('08:24:30'), 3)
+    if expected is None:
+        assert journeys == []
+    else:
+        assert [journey['arrival_secs'] for journey in journeys] == [secs(expected)]